@@ -0,0 +1,84 @@
+# onpremweb/community/storage.py
+import hashlib
+import mimetypes
+import os
+import tempfile
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import FileSystemStorage
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    업로드 파일을 SHA-256 기준 경로(cas/ab/cd/<해시>.<확장자>)에 저장
+    - 청크 단위로 임시파일에 쓰면서 해시 계산 (메모리에 통째로 올리지 않음)
+    - 같은 내용이면 한 번만 저장되고 같은 경로를 반환
+    - 해시 앞 2+2 글자로 디렉토리를 나눠서 한 디렉토리의 파일 수를 작게 유지
+    같은 파일을 여러 행이 공유할 수 있으므로 행 삭제 시 파일을 지우면 안 됨
+    """
+    prefix = 'cas'
+
+    def _save(self, name, content):
+        tmp_dir = os.path.join(self.location, self.prefix, 'tmp')
+        os.makedirs(tmp_dir, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    tmp.write(chunk)
+            hexdigest = digest.hexdigest()
+            ext = os.path.splitext(name)[1].lower()[:10]
+            final_name = f'{self.prefix}/{hexdigest[:2]}/{hexdigest[2:4]}/{hexdigest}{ext}'
+            final_path = self.path(final_name)
+            if os.path.exists(final_path):
+                return final_name
+            os.makedirs(os.path.dirname(final_path), exist_ok=True)
+            if self.file_permissions_mode is not None:
+                os.chmod(tmp_path, self.file_permissions_mode)
+            # 같은 파일시스템 안의 rename 이라 원자적 (동시에 같은 파일이 올라와도 깨지지 않음)
+            os.replace(tmp_path, final_path)
+            return final_name
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def get_available_name(self, name, max_length=None):
+        # 최종 경로는 _save 에서 내용 해시로 정해지므로 이름 충돌 검사가 필요 없음
+        return name
+
+
+def serve_media(request, path):
+    """
+    /media/<path> - 파일 전송은 웹서버에 맡기고 Django 는 헤더만 응답
+    MEDIA_SENDFILE_HEADER = 'X-Accel-Redirect' (nginx, MEDIA_INTERNAL_URL 의 internal location)
+                          | 'X-Sendfile' (Apache mod_xsendfile, 절대경로)
+                          | '' (개발 서버 - Django 가 직접 전송)
+    Apache vhost 에서 SetEnv MEDIA_SENDFILE_HEADER 로 준 값(WSGI environ)이 설정보다 우선
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except (ValueError, SuspiciousFileOperation):
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+
+    header = request.META.get('MEDIA_SENDFILE_HEADER', getattr(settings, 'MEDIA_SENDFILE_HEADER', ''))
+    content_type = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+    if header == 'X-Accel-Redirect':
+        response = HttpResponse(content_type=content_type)
+        response[header] = settings.MEDIA_INTERNAL_URL.rstrip('/') + '/' + path
+    elif header:
+        response = HttpResponse(content_type=content_type)
+        response[header] = full_path
+    else:
+        response = FileResponse(open(full_path, 'rb'), content_type=content_type)
+    if path.startswith(ContentAddressedStorage.prefix + '/'):
+        # 내용이 바뀌면 경로도 바뀌므로 영구 캐시
+        response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
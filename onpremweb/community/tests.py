@@ -1,3 +1,67 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+from django.core.files.base import ContentFile
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from .storage import ContentAddressedStorage, serve_media
 
-# Create your tests here.
+
+####################
+# 내용 주소 기반 미디어 저장소 (user-016)
+####################
+class ContentAddressedStorageTests(SimpleTestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.storage = ContentAddressedStorage(location=self.media_root)
+
+    def test_same_content_is_stored_once(self):
+        first = self.storage.save('boardImages/a.JPG', ContentFile(b'same bytes'))
+        second = self.storage.save('noticeImages/b.jpg', ContentFile(b'same bytes'))
+        self.assertEqual(first, second)
+        self.assertRegex(first, r'^cas/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.jpg$')
+        self.assertEqual(self.storage.open(first).read(), b'same bytes')
+        # 임시파일이 남지 않음
+        self.assertEqual(os.listdir(os.path.join(self.media_root, 'cas', 'tmp')), [])
+
+    def test_different_content_gets_different_paths(self):
+        first = self.storage.save('a.png', ContentFile(b'one'))
+        second = self.storage.save('a.png', ContentFile(b'two'))
+        self.assertNotEqual(first, second)
+
+
+class ServeMediaTests(SimpleTestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.name = ContentAddressedStorage(location=self.media_root).save('a.png', ContentFile(b'png'))
+        self.factory = RequestFactory()
+
+    def serve(self, path, **environ):
+        with override_settings(MEDIA_ROOT=self.media_root):
+            return serve_media(self.factory.get(f'/media/{path}', **environ), path)
+
+    @override_settings(MEDIA_SENDFILE_HEADER='')
+    def test_django_sends_file_by_default(self):
+        response = self.serve(self.name)
+        self.assertEqual(b''.join(response.streaming_content), b'png')
+        self.assertIn('immutable', response['Cache-Control'])
+
+    @override_settings(MEDIA_SENDFILE_HEADER='X-Accel-Redirect', MEDIA_INTERNAL_URL='/protected-media/')
+    def test_nginx_internal_redirect(self):
+        response = self.serve(self.name)
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{self.name}')
+        self.assertEqual(response.content, b'')
+
+    @override_settings(MEDIA_SENDFILE_HEADER='X-Accel-Redirect')
+    def test_apache_setenv_overrides_setting(self):
+        # vhost 의 SetEnv MEDIA_SENDFILE_HEADER X-Sendfile → WSGI environ
+        response = self.serve(self.name, MEDIA_SENDFILE_HEADER='X-Sendfile')
+        self.assertEqual(response['X-Sendfile'], os.path.join(self.media_root, self.name))
+        self.assertNotIn('X-Accel-Redirect', response)
+
+    def test_missing_and_outside_paths_are_404(self):
+        from django.http import Http404
+        for path in ('cas/00/00/missing.png', '../etc/passwd'):
+            with self.assertRaises(Http404):
+                self.serve(path)
@@ -119,6 +119,13 @@ STATICFILES_DIRS = [ BASE_DIR / 'static' ]
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# 업로드 파일을 내용 해시 경로에 저장 (같은 사진은 한 번만 저장)
+DEFAULT_FILE_STORAGE = 'community.storage.ContentAddressedStorage'
+FILE_UPLOAD_PERMISSIONS = 0o644
+# /media/ 전송을 웹서버에 위임: nginx 는 'X-Accel-Redirect', Apache(mod_xsendfile) 는 'X-Sendfile', 비우면 Django 가 직접 전송
+# 웹서버마다 다르므로 배포에서 지정 (nginx: ansible 이 .env 에 기록, Apache: vhost 의 SetEnv 가 요청마다 전달)
+MEDIA_SENDFILE_HEADER = os.getenv('MEDIA_SENDFILE_HEADER', '')
+MEDIA_INTERNAL_URL = '/protected-media/'
 
 CORS_ALLOW_ALL_ORIGINS = False
 CORS_ALLOWED_ORIGINS = [
@@ -3,9 +3,8 @@ from django.contrib import admin
 from django.urls import path, include, re_path
 from django.views.generic import TemplateView
 from community.views import current_user, token_obtain_pair_view, test_csrf_view
+from community.storage import serve_media
 from rest_framework_simplejwt.views import TokenRefreshView
-from django.conf import settings
-from django.conf.urls.static import static
 
 urlpatterns = [
     path('api/', include('community.urls')),   # 반드시 SPA 라우팅보다 위에 위치
@@ -21,8 +20,10 @@ urlpatterns = [
     path('api-auth/', include('rest_framework.urls')),
 ]
 
-# 미디어 서빙용(개발서버 한정) 추가
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# 미디어: Django 는 X-Accel-Redirect/X-Sendfile 헤더만 응답하고 파일 전송은 웹서버가 처리
+urlpatterns += [
+    re_path(r'^media/(?P<path>.+)$', serve_media, name='media'),
+]
 
 # SPA 진입점. 반드시 마지막에 위치시켜야 함!
 # 'api/'로 시작하지 않는 모든 요청에만 SPA fallback 적용
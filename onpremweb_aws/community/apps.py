@@ -1,6 +1,14 @@
 # onpremweb/community/apps.py
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 class CommunityConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'community'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .availability import create_lower_indexes
+        from .search import create_search_indexes
+        post_migrate.connect(create_lower_indexes, sender=self)
+        post_migrate.connect(create_search_indexes, sender=self)
@@ -0,0 +1,65 @@
+# onpremweb_aws/community/counters.py
+import threading
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+_deleting = threading.local()
+
+
+def _deleting_owners():
+    if not hasattr(_deleting, 'owners'):
+        _deleting.owners = set()
+    return _deleting.owners
+
+
+def mark_deleting(owner):
+    """
+    (pre_delete) 게시글/피드백/공지 삭제 중에는 CASCADE 로 지워지는 댓글/이미지의 카운터 갱신을 건너뜀
+    Collector 는 자식 행을 먼저 지우고 부모를 마지막에 지우므로 부모의 post_delete 에서 해제
+    """
+    _deleting_owners().add((type(owner), owner.pk))
+
+
+def unmark_deleting(owner):
+    _deleting_owners().discard((type(owner), owner.pk))
+
+
+def adjust(model, pk, replies=0, images=0, touch=False, changed=False, at=None):
+    """
+    reply_count / image_count 를 F() 로 증감 (UPDATE 한 번, 동시 요청에도 어긋나지 않음)
+    touch=True 이면 last_activity_at 도 지금으로 갱신
+    무언가 바뀌면 updated_at(ETag) 과 게시글 version(목록 조각 캐시) 도 같은 UPDATE 에서 갱신
+    """
+    if (model, pk) in _deleting_owners():
+        return 0
+    at = at or timezone.now()
+    values = {}
+    if replies:
+        values['reply_count'] = Greatest(F('reply_count') + replies, 0)
+    if images:
+        values['image_count'] = Greatest(F('image_count') + images, 0)
+    if touch:
+        values['last_activity_at'] = at
+    if not values and not changed:
+        return 0
+    values.update(changed_values(model, at))
+    return model.objects.filter(pk=pk).update(**values)
+
+
+def changed_values(model, at=None):
+    """
+    행을 바꾸는 UPDATE 에 같이 넣을 값 - updated_at(ETag/Last-Modified), 게시글이면 version(목록 조각 캐시)
+    카운터를 직접 고치는 관리 명령(repair_activity_counters 등)도 이걸 써야 캐시가 무효화됨
+    """
+    values = {'updated_at': at or timezone.now()}
+    if 'version' in model.maintained_fields:
+        values['version'] = F('version') + 1
+    return values
+
+
+def mark_changed(model, pk, at=None):
+    """
+    카운터 변화 없이 내용만 바뀐 경우 (원글/댓글 수정, 파생 이미지 생성)
+    """
+    return adjust(model, pk, changed=True, at=at)
@@ -0,0 +1,123 @@
+# onpremweb_aws/community/derivatives.py
+import io
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
+from PIL import Image, ImageOps
+from . import storage
+
+_DERIVATIVE_KEY = re.compile(r'^(?P<original>.+)\.w(?P<width>\d+)\.webp$')
+
+_pool_lock = threading.Lock()
+_pool = None
+_pool_pid = None
+
+
+def derivative_widths():
+    return sorted(getattr(settings, 'IMAGE_DERIVATIVE_WIDTHS', [320, 640, 1280]))
+
+
+def derivative_key(key, width):
+    """
+    원본 옆에 저장 (user_uploads/1/abc_car.jpg → user_uploads/1/abc_car.jpg.w320.webp)
+    """
+    return f'{key}.w{width}.webp'
+
+
+def original_key(key):
+    """
+    파생 이미지 key → 원본 key (파생 이미지가 아니면 None)
+    """
+    match = _DERIVATIVE_KEY.match(key)
+    return match.group('original') if match else None
+
+
+def render(data, widths, quality=80):
+    """
+    (프로세스 풀에서 실행) 원본 bytes → (원본 폭, 원본 높이, [(width, height, WebP bytes), ...])
+    EXIF 회전을 픽셀에 반영한 뒤 저장하므로 EXIF(촬영 위치 등)는 남지 않음
+    원본보다 큰 폭은 만들지 않고, 원본이 가장 작은 폭보다 작으면 원본 크기 하나만 생성
+    """
+    with Image.open(io.BytesIO(data)) as image:
+        image = ImageOps.exif_transpose(image)
+        image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+        targets = [width for width in widths if width < image.width] or [image.width]
+        results = []
+        for width in targets:
+            resized = image.copy()
+            resized.thumbnail((width, width * 10), Image.LANCZOS)
+            out = io.BytesIO()
+            resized.save(out, 'WEBP', quality=quality, method=4)
+            results.append((resized.width, resized.height, out.getvalue()))
+        return image.width, image.height, results
+
+
+def get_pool():
+    """
+    프로세스당 하나의 프로세스 풀 (fork 된 자식에서는 새로 생성)
+    """
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ProcessPoolExecutor(max_workers=getattr(settings, 'IMAGE_DERIVATIVE_WORKERS', 2))
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def _store(key, future):
+    try:
+        width, height, results = future.result()
+    except Exception as e:
+        # 이미지가 아닌 파일 등 - 다시 시도하지 않도록 오류를 기록
+        return {'error': str(e)[:200]}
+    variants = []
+    try:
+        for variant_width, variant_height, body in results:
+            variant_key = derivative_key(key, variant_width)
+            storage.put_object(variant_key, body, 'image/webp')
+            variants.append({'width': variant_width, 'height': variant_height, 'url': storage.public_url(variant_key)})
+    except Exception:
+        return None  # 업로드 실패는 다음에 다시 시도
+    return {'width': width, 'height': height, 'variants': variants}
+
+
+def build(urls):
+    """
+    원본 URL 목록 → 같은 순서의 파생 이미지 정보 목록
+    {"width", "height", "variants": [{"width", "height", "url"}, ...]} (작은 폭부터), 실패 시 {"error"}
+    None 은 일시적 실패라 저장하지 않고 다음에 다시 시도
+    원본을 내려받는 대로 프로세스 풀에 제출해서 다운로드와 변환이 겹치도록 함
+    """
+    jobs = []
+    for url in urls:
+        key = storage.key_from_url(url)
+        if not key:
+            jobs.append({'error': '버킷 밖의 URL'})
+            continue
+        try:
+            data = storage.get_object_bytes(key)
+        except Exception as e:
+            jobs.append({'error': str(e)[:200]})
+            continue
+        jobs.append((key, get_pool().submit(render, data, derivative_widths())))
+    return [job if isinstance(job, dict) else _store(*job) for job in jobs]
+
+
+def derivative_urls(derivatives):
+    return [variant['url'] for variant in (derivatives or {}).get('variants', [])]
+
+
+def thumbnail_url(original_url, derivatives, url_for=storage.signed_url):
+    """
+    가장 작은 WebP (아직 없으면 원본)
+    """
+    urls = derivative_urls(derivatives)
+    return url_for(urls[0] if urls else original_url)
+
+
+def srcset(derivatives, url_for=storage.signed_url):
+    return ', '.join(
+        f"{url_for(variant['url'])} {variant['width']}w" for variant in (derivatives or {}).get('variants', [])
+    )
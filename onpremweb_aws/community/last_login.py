@@ -0,0 +1,108 @@
+# onpremweb_aws/community/last_login.py
+import atexit
+import logging
+import os
+import threading
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import close_old_connections, connection
+from django.db.models import Case, Q, Value, When
+from django.utils import timezone
+from .authentication import invalidate_user_ids
+
+logger = logging.getLogger(__name__)
+
+
+class LastLoginBuffer:
+    """
+    프로세스당 하나 - 로그인 시각을 메모리에 모았다가 flush_interval 초마다 UPDATE 한 번으로 기록
+    같은 사용자가 여러 번 로그인하면 마지막 시각만 남음 (아침 로그인 몰림에도 auth_user 행 쓰기가 줄 서지 않음)
+    프로세스가 죽으면 아직 기록하지 않은 시각(최대 flush_interval 초)은 사라질 수 있음
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}  # user_id → last_login
+        self._pid = None
+        self._thread = None
+        self._wakeup = threading.Event()
+
+    def record(self, user, at=None):
+        at = at or timezone.now()
+        with self._lock:
+            if self._pending.get(user.pk) is None or self._pending[user.pk] < at:
+                self._pending[user.pk] = at
+        self._ensure_flusher()
+
+    def _ensure_flusher(self):
+        with self._lock:
+            # gunicorn 워커 fork 이후엔 부모의 스레드가 없으므로 pid 로 확인
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._flush_forever, name='last-login-flusher', daemon=True)
+            self._thread.start()
+
+    def _flush_forever(self):
+        interval = getattr(settings, 'LAST_LOGIN_FLUSH_INTERVAL', 5)
+        while True:
+            self._wakeup.wait(interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('last_login 기록 실패')
+            finally:
+                # 이 스레드 전용 DB 연결 정리
+                close_old_connections()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        try:
+            return write_last_logins(pending)
+        except Exception:
+            # 실패한 시각은 되돌려서 다음 주기에 다시 시도 (그 사이 더 최근 로그인이 있으면 그것을 유지)
+            with self._lock:
+                for user_id, at in pending.items():
+                    if self._pending.get(user_id) is None or self._pending[user_id] < at:
+                        self._pending[user_id] = at
+            raise
+
+
+def write_last_logins(pending):
+    """
+    {user_id: 시각} → Postgres 는 UPDATE ... FROM (VALUES ...) 한 번, 그 외 DB 는 CASE WHEN UPDATE 한 번
+    이미 더 최근 값이 기록돼 있으면(다른 워커) 덮어쓰지 않음
+    post_save 가 없으므로 인증 캐시(/api/me/ 의 last_login)는 여기서 직접 무효화
+    """
+    updated = _update_last_logins(pending)
+    invalidate_user_ids(list(pending))
+    return updated
+
+
+def _update_last_logins(pending):
+    if connection.vendor == 'postgresql':
+        qn = connection.ops.quote_name
+        rows = ', '.join(['(%s, %s::timestamptz)'] * len(pending))
+        params = [value for item in pending.items() for value in item]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {qn(User._meta.db_table)} AS u SET {qn("last_login")} = v.last_login '
+                f'FROM (VALUES {rows}) AS v(id, last_login) '
+                f'WHERE u.{qn("id")} = v.id AND (u.{qn("last_login")} IS NULL OR u.{qn("last_login")} < v.last_login)',
+                params,
+            )
+            return cursor.rowcount
+    newer = Q(last_login__isnull=True)
+    for user_id, at in pending.items():
+        newer |= Q(pk=user_id, last_login__lt=at)
+    return User.objects.filter(newer, pk__in=list(pending)).update(
+        last_login=Case(*[When(pk=user_id, then=Value(at)) for user_id, at in pending.items()])
+    )
+
+
+last_logins = LastLoginBuffer()
+# 정상 종료(gunicorn 워커 재시작 등) 시 남은 것 기록
+atexit.register(lambda: last_logins.flush())
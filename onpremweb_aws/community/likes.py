@@ -0,0 +1,76 @@
+# onpremweb_aws/community/likes.py
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import Board, Recommend
+
+
+def _insert_recommend(board_id, user_id):
+    """
+    (board, user) 추천 행을 INSERT ... ON CONFLICT DO NOTHING 한 번으로 추가, 새로 추가됐으면 True
+    """
+    qn = connection.ops.quote_name
+    table = Recommend._meta.db_table
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {qn(table)} ({qn("board_id")}, {qn("user_id")}, {qn("created_at")}) '
+            f'VALUES (%s, %s, %s) ON CONFLICT ({qn("board_id")}, {qn("user_id")}) DO NOTHING',
+            [board_id, user_id, now],
+        )
+        return cursor.rowcount == 1
+
+
+def _add_recommend_count(board_id, delta):
+    """
+    recommend_count를 F() 식으로 증감하고 새 값을 반환 (게시글이 없으면 None)
+    목록 조각 캐시/ETag 가 바뀌도록 version, updated_at 도 함께 갱신
+    """
+    if connection.vendor == 'postgresql':
+        qn = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {qn(Board._meta.db_table)} SET {qn("recommend_count")} = {qn("recommend_count")} + %s, '
+                f'{qn("version")} = {qn("version")} + 1, {qn("updated_at")} = %s '
+                f'WHERE {qn("id")} = %s RETURNING {qn("recommend_count")}',
+                [delta, connection.ops.adapt_datetimefield_value(timezone.now()), board_id],
+            )
+            row = cursor.fetchone()
+        return row[0] if row else None
+    if not Board.objects.filter(pk=board_id).update(
+        recommend_count=F('recommend_count') + delta, version=F('version') + 1, updated_at=timezone.now()
+    ):
+        return None
+    return Board.objects.filter(pk=board_id).values_list('recommend_count', flat=True).first()
+
+
+class BoardNotFound(Exception):
+    pass
+
+
+def like_board(board_id, user):
+    """
+    좋아요 - 이미 눌렀으면 (False, None), 새로 눌렀으면 (True, 새 추천수)
+    """
+    with transaction.atomic():
+        if not _insert_recommend(board_id, user.pk):
+            return False, None
+        count = _add_recommend_count(board_id, 1)
+        if count is None:
+            # 게시글 없음 → 방금 넣은 추천 행도 롤백 (FK 는 커밋 시점에 검사)
+            raise BoardNotFound(board_id)
+    return True, count
+
+
+def unlike_board(board_id, user):
+    """
+    좋아요 취소 - 누른 적 없으면 (False, None), 취소했으면 (True, 새 추천수)
+    """
+    with transaction.atomic():
+        deleted, _ = Recommend.objects.filter(board_id=board_id, user=user).delete()
+        if not deleted:
+            return False, None
+        count = _add_recommend_count(board_id, -1)
+        if count is None:
+            raise BoardNotFound(board_id)
+    return True, count
@@ -0,0 +1,58 @@
+# onpremweb_aws/community/local_cache.py
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LocalCache:
+    """
+    프로세스 메모리 LRU + TTL (Django 캐시 앞단의 1차 캐시)
+    워커마다 따로 가지므로 무효화가 필요한 값은 버전을 key 에 넣거나 TTL 을 짧게 둘 것
+    """
+    def __init__(self, max_entries, timeout):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            if entry[1] <= now:
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def get_many(self, keys):
+        found = {}
+        for key in keys:
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                found[key] = value
+        return found
+
+    def set(self, key, value, timeout=None):
+        expires_at = time.monotonic() + (self.timeout if timeout is None else timeout)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def set_many(self, values, timeout=None):
+        for key, value in values.items():
+            self.set(key, value, timeout)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
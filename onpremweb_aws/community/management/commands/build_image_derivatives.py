@@ -0,0 +1,82 @@
+# onpremweb_aws/community/management/commands/build_image_derivatives.py
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.db.models import F
+from community import counters, derivatives
+from community.models import Analysis, BoardImage, FeedbackImage, NoticeImage
+from community.signals import IMAGE_OWNERS
+
+
+class Command(BaseCommand):
+    help = '아직 썸네일/WebP 가 없는 이미지를 프로세스 풀로 변환해서 원본 옆에 저장 (--loop 으로 상주 워커 실행)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=20)
+        parser.add_argument('--loop', action='store_true', help='종료하지 않고 계속 처리')
+        parser.add_argument('--interval', type=float, default=10.0, help='처리할 이미지가 없을 때 대기 시간(초)')
+        parser.add_argument(
+            '--max-attempts', type=int, default=getattr(settings, 'IMAGE_DERIVATIVE_MAX_ATTEMPTS', 5),
+            help='일시적 실패를 이 횟수만큼 반복하면 오류로 기록',
+        )
+
+    def retry_later(self, model, pk, field, attempts):
+        """
+        일시적 실패(None) - 시도 횟수를 올려서 다음 배치부터 아직 시도하지 않은 행 뒤로 보냄
+        max_attempts 번째 실패면 저장할 오류 정보를 반환 (더 이상 고르지 않음)
+        """
+        if attempts + 1 >= self.max_attempts:
+            return {'error': f'{self.max_attempts}회 실패'}
+        model.objects.filter(pk=pk).update(**{field: F(field) + 1})
+        return None
+
+    def build_images(self, model, batch_size):
+        # 실패 횟수가 적은 것부터 - 계속 실패하는 몇 개가 매 배치 앞자리를 차지하지 않도록
+        rows = list(model.objects.filter(derivatives__isnull=True).order_by('derivative_attempts', 'pk')[:batch_size])
+        built = 0
+        for row, info in zip(rows, derivatives.build([row.image for row in rows])):
+            if info is None:
+                info = self.retry_later(model, row.pk, 'derivative_attempts', row.derivative_attempts)
+                if info is None:
+                    continue
+            model.objects.filter(pk=row.pk).update(derivatives=info)
+            # 원글의 updated_at(ETag)/게시글 version(목록 조각 캐시)을 바꿔서 썸네일이 들어간 본문을 다시 받게 함
+            owner_model, owner_field = IMAGE_OWNERS[model]
+            counters.mark_changed(owner_model, getattr(row, owner_field))
+            built += 1
+        return built
+
+    def build_analyses(self, batch_size):
+        rows = list(
+            Analysis.objects.filter(image_derivatives__isnull=True)
+            .order_by('image_derivative_attempts', 'pk')[:batch_size]
+        )
+        fields = Analysis.IMAGE_FIELDS
+        infos = derivatives.build([getattr(row, field) for row in rows for field in fields])
+        built = 0
+        for index, row in enumerate(rows):
+            info = dict(zip(fields, infos[index * len(fields):(index + 1) * len(fields)]))
+            if None in info.values():
+                error = self.retry_later(Analysis, row.pk, 'image_derivative_attempts', row.image_derivative_attempts)
+                if error is None:
+                    continue
+                info = {field: value or error for field, value in info.items()}
+            Analysis.objects.filter(pk=row.pk).update(image_derivatives=info)
+            built += 1
+        return built
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        self.max_attempts = max(options['max_attempts'], 1)
+        while True:
+            close_old_connections()
+            built = sum(self.build_images(model, batch_size) for model in (BoardImage, FeedbackImage, NoticeImage))
+            built += self.build_analyses(batch_size)
+            if built:
+                self.stdout.write(self.style.SUCCESS(f'파생 이미지 생성: {built}건'))
+                continue
+            # 일시적 실패만 있었으면(S3 장애 등) 바로 다시 돌지 않고 대기
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
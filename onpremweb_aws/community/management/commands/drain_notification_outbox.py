@@ -0,0 +1,26 @@
+# onpremweb_aws/community/management/commands/drain_notification_outbox.py
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from community.outbox import drain_outbox
+
+
+class Command(BaseCommand):
+    help = '알림 outbox 이벤트를 배치로 꺼내 Notification 생성 (--loop 으로 상주 워커 실행)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--loop', action='store_true', help='종료하지 않고 계속 처리')
+        parser.add_argument('--interval', type=float, default=2.0, help='outbox 가 비었을 때 대기 시간(초)')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        while True:
+            close_old_connections()
+            processed = drain_outbox(batch_size)
+            while processed == batch_size:
+                processed = drain_outbox(batch_size)
+            if not options['loop']:
+                break
+            # 대기하는 동안 쌓인 댓글 폭주는 다음 배치에서 한 번에 묶여 처리됨
+            time.sleep(options['interval'])
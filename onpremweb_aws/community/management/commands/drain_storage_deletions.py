@@ -0,0 +1,32 @@
+# onpremweb_aws/community/management/commands/drain_storage_deletions.py
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from community.deletion_queue import drain_deletions
+from community.storage import DELETE_OBJECTS_LIMIT
+
+
+class Command(BaseCommand):
+    help = 'S3 삭제 대기열을 DeleteObjects 로 일괄 처리 (cron 으로 주기 실행, --loop 으로 상주 실행)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DELETE_OBJECTS_LIMIT)
+        parser.add_argument('--loop', action='store_true', help='종료하지 않고 계속 처리')
+        parser.add_argument('--interval', type=float, default=30.0, help='대기열이 비었을 때 대기 시간(초)')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        while True:
+            close_old_connections()
+            deleted = failed = 0
+            while True:
+                processed, retry = drain_deletions(batch_size)
+                deleted += processed - retry
+                failed += retry
+                if processed < batch_size:
+                    break
+            if deleted or failed or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(f'S3 삭제 {deleted}건, 재시도 예정 {failed}건'))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,65 @@
+# onpremweb_aws/community/management/commands/gc_orphan_uploads.py
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from community import storage
+from community.attachments import UPLOAD_PREFIX
+from community.deletion_queue import referenced_urls
+from community.derivatives import original_key
+from community.models import PendingUpload
+
+
+class Command(BaseCommand):
+    help = 'user_uploads/ 아래에서 어디에도 연결되지 않은 채 유예기간이 지난 S3 파일을 일괄 삭제'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-hours', type=int, default=getattr(settings, 'PENDING_UPLOAD_TTL_HOURS', 24),
+            help='업로드 후 이 시간이 지난 파일만 삭제 (기본: presign 유효 시간 PENDING_UPLOAD_TTL_HOURS)',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='삭제하지 않고 대상만 집계')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        cutoff = now - timedelta(hours=options['grace_hours'])
+        scanned = orphans = deleted = failed = reclaimed = 0
+
+        for objects in storage.list_object_pages(UPLOAD_PREFIX):
+            scanned += len(objects)
+            old = {obj['Key']: obj['Size'] for obj in objects if obj['LastModified'] < cutoff}
+            if not old:
+                continue
+            # 파생 이미지(썸네일/WebP)는 원본이 참조되고 있는지로 판단
+            sources = {key: original_key(key) or key for key in old}
+            referenced = referenced_urls([storage.public_url(source) for source in set(sources.values())])
+            # 아직 만료 전인 presign (작성 중인 글) 은 남김
+            pending = set(
+                PendingUpload.objects.filter(key__in=list(set(sources.values())), expires_at__gt=now)
+                .values_list('key', flat=True)
+            )
+            targets = [
+                key for key, source in sources.items()
+                if storage.public_url(source) not in referenced and source not in pending
+            ]
+            orphans += len(targets)
+            if options['dry_run'] or not targets:
+                reclaimed += sum(old[key] for key in targets)
+                continue
+            errors = storage.delete_objects(targets)
+            done = [key for key in targets if key not in errors]
+            deleted += len(done)
+            failed += len(errors)
+            reclaimed += sum(old[key] for key in done)
+            PendingUpload.objects.filter(key__in=done).delete()
+
+        if not options['dry_run']:
+            # 만료된 presign 기록 정리 (S3 에 올라오지 않은 것 포함)
+            PendingUpload.objects.filter(expires_at__lte=cutoff).delete()
+        size = f'{reclaimed / (1024 * 1024):.1f}MB ({reclaimed} bytes)'
+        if options['dry_run']:
+            self.stdout.write(f'스캔 {scanned}건, 삭제 대상 {orphans}건, 회수 가능 용량 {size}')
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'스캔 {scanned}건, 고아 파일 {orphans}건, 삭제 {deleted}건, 실패 {failed}건, 회수 용량 {size}'
+        ))
@@ -0,0 +1,38 @@
+# onpremweb_aws/community/management/commands/rebuild_search_documents.py
+from django.core.management.base import BaseCommand
+from community.models import Board, Feedback, Notice
+from community.search import build_search_document
+
+
+class Command(BaseCommand):
+    help = '게시글/피드백/공지사항의 검색 문서(search_document)를 일괄 재생성'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--missing', action='store_true',
+            help='검색 문서가 비어 있는 행만 (배포 시 기존 데이터 채우기용, 이미 채워졌으면 거의 바로 끝남)',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        for model in (Board, Feedback, Notice):
+            author_field = model.search_author_field
+            queryset = model.objects.select_related(author_field).order_by('pk')
+            if options['missing']:
+                queryset = queryset.filter(search_document='')
+            batch = []
+            updated = 0
+            for obj in queryset.iterator(chunk_size=batch_size):
+                obj.search_document = build_search_document(
+                    obj.title, obj.content, getattr(obj, author_field).username
+                )
+                batch.append(obj)
+                if len(batch) >= batch_size:
+                    model.objects.bulk_update(batch, ['search_document'])
+                    updated += len(batch)
+                    batch = []
+            if batch:
+                model.objects.bulk_update(batch, ['search_document'])
+                updated += len(batch)
+            self.stdout.write(self.style.SUCCESS(f'{model.__name__}: {updated}건 갱신'))
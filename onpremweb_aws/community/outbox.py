@@ -0,0 +1,122 @@
+# onpremweb_aws/community/outbox.py
+from collections import OrderedDict
+from django.db import transaction
+from .models import FeedbackReply, NoticeReply, Notification, NotificationOutbox, Reply
+from .notification_stream import publish
+
+
+def enqueue_reply_event(event_type, reply):
+    """
+    댓글 저장과 같은 트랜잭션에서 호출 - 알림 생성은 워커가 나중에 처리
+    """
+    NotificationOutbox.objects.create(event_type=event_type, object_id=reply.pk)
+
+
+def _message(target, noun, actors, count):
+    # 같은 배치에 쌓인 이벤트는 하나로 묶어서 알림 (예: "kim님 외 2명이", "댓글 3개를")
+    who = f"{actors[-1]}님이" if len(actors) == 1 else f"{actors[-1]}님 외 {len(actors) - 1}명이"
+    what = f"{noun}을" if count == 1 or len(actors) > 1 else f"{noun} {count}개를"
+    return f"{who} 회원님의 {target}에 {what} 남겼습니다."
+
+
+class _Group:
+    """
+    (받는 사람, 알림 종류, 원글, 대상) 단위로 묶인 이벤트들
+    """
+    def __init__(self, to_user_id, notif_type, target, noun, fields):
+        self.to_user_id = to_user_id
+        self.notif_type = notif_type
+        self.target = target
+        self.noun = noun
+        self.fields = fields
+        self.actors = []
+        self.count = 0
+
+    def add(self, actor, fields):
+        self.count += 1
+        if actor in self.actors:
+            self.actors.remove(actor)
+        self.actors.append(actor)
+        self.fields = fields  # 가장 최근 댓글을 가리키도록
+
+    def build(self):
+        return Notification(
+            to_user_id=self.to_user_id,
+            notif_type=self.notif_type,
+            message=_message(self.target, self.noun, self.actors, self.count),
+            **self.fields,
+        )
+
+
+def build_notifications(events):
+    """
+    outbox 이벤트들 → Notification 객체 목록 (댓글/원글/부모댓글 작성자는 종류별 쿼리 1번씩 일괄 로딩)
+    """
+    ids = {event_type: [] for event_type, _ in NotificationOutbox.EVENT_CHOICES}
+    for event in events:
+        ids[event.event_type].append(event.object_id)
+
+    groups = OrderedDict()
+
+    def add(to_user_id, notif_type, owner_id, target, noun, actor, fields):
+        key = (to_user_id, notif_type, owner_id, target)
+        if key not in groups:
+            groups[key] = _Group(to_user_id, notif_type, target, noun, fields)
+        groups[key].add(actor, fields)
+
+    if ids[NotificationOutbox.EVENT_REPLY]:
+        replies = Reply.objects.filter(pk__in=ids[NotificationOutbox.EVENT_REPLY]).select_related(
+            'author', 'board', 'parent'
+        ).order_by('pk')
+        for reply in replies:
+            board = reply.board
+            fields = {'board_id': board.pk, 'reply_id': reply.pk}
+            # 1. 게시글 작성자에게 알림 (내가 아니면)
+            if board.author_id != reply.author_id:
+                add(board.author_id, Notification.NOTIFY_COMMENT, board.pk, '게시글', '댓글',
+                    reply.author.username, fields)
+            # 2. 부모 댓글 작성자(있고, 내가 아니고, 게시글 작성자와도 다르면)에게도 알림
+            parent = reply.parent
+            if parent and parent.author_id != reply.author_id and parent.author_id != board.author_id:
+                add(parent.author_id, Notification.NOTIFY_COMMENT, board.pk, '댓글', '답글',
+                    reply.author.username, fields)
+
+    if ids[NotificationOutbox.EVENT_FEEDBACK_REPLY]:
+        replies = FeedbackReply.objects.filter(
+            pk__in=ids[NotificationOutbox.EVENT_FEEDBACK_REPLY]
+        ).select_related('author', 'feedback').order_by('pk')
+        for reply in replies:
+            feedback = reply.feedback
+            if feedback.user_id != reply.author_id:
+                add(feedback.user_id, Notification.NOTIFY_FEEDBACK_REPLY, feedback.pk, '피드백', '댓글',
+                    reply.author.username, {'feedback_id': feedback.pk, 'feedback_reply_id': reply.pk})
+
+    if ids[NotificationOutbox.EVENT_NOTICE_REPLY]:
+        replies = NoticeReply.objects.filter(
+            pk__in=ids[NotificationOutbox.EVENT_NOTICE_REPLY]
+        ).select_related('author', 'notice').order_by('pk')
+        for reply in replies:
+            notice = reply.notice
+            if notice.user_id != reply.author_id:
+                add(notice.user_id, Notification.NOTIFY_NOTICE_REPLY, notice.pk, '공지사항', '댓글',
+                    reply.author.username, {'notice_id': notice.pk, 'notice_reply_id': reply.pk})
+
+    return [group.build() for group in groups.values()]
+
+
+def drain_outbox(batch_size=500):
+    """
+    outbox 이벤트를 batch_size 만큼 꺼내 알림으로 변환 (bulk_create) 후 삭제, 처리한 이벤트 수 반환
+    여러 워커가 떠 있어도 skip_locked 로 같은 이벤트를 중복 처리하지 않음
+    """
+    with transaction.atomic():
+        events = list(
+            NotificationOutbox.objects.select_for_update(skip_locked=True).order_by('pk')[:batch_size]
+        )
+        if not events:
+            return 0
+        notifications = Notification.objects.bulk_create(build_notifications(events))
+        NotificationOutbox.objects.filter(pk__in=[event.pk for event in events]).delete()
+    # 커밋 후 알림 - 구독 중인 SSE 연결이 바로 새 알림을 조회
+    publish(notification.to_user_id for notification in notifications)
+    return len(events)
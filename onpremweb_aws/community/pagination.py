@@ -0,0 +1,215 @@
+# onpremweb_aws/community/pagination.py
+import base64
+import binascii
+import datetime
+import json
+from collections import OrderedDict
+from django.core.exceptions import ValidationError
+from django.core.paginator import Page, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def approximate_count(queryset):
+    """
+    Postgres는 플래너 추정치(EXPLAIN)로 COUNT(*) 없이 대략적인 건수 반환, 그 외 DB는 정확한 count
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+    sql, params = queryset.order_by().values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class ApproximatePage(Page):
+    """
+    추정 건수와 상관없이 실제로 다음 행이 있었는지로 다음 페이지 여부 판단
+    """
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+    def start_index(self):
+        if not self.object_list:
+            return 0
+        return (self.number - 1) * self.paginator.per_page + 1
+
+    def end_index(self):
+        return self.start_index() + len(self.object_list) - 1 if self.object_list else 0
+
+
+class ApproximateCountPaginator(Paginator):
+    """
+    ?count=approx 용 Paginator - 추정치는 응답의 count 에만 쓰고, 페이지는 추정치로 자르지 않음
+    (Paginator.page() 는 끝을 count 로 잘라서 추정치가 작으면 행이 빠짐) 범위를 넘는 페이지는 빈 페이지
+    """
+    @cached_property
+    def count(self):
+        return approximate_count(self.object_list)
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            number = 0
+        if number < 1:
+            return super().validate_number(number)
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        # 1건 더 읽어서 다음 페이지 여부 확인
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        return ApproximatePage(rows[:self.per_page], number, self, len(rows) > self.per_page)
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    기본은 기존 page 번호 방식, ?cursor= 가 오면 (정렬키..., id) 복합 키셋 방식으로 동작
+    ?count=approx 이면 COUNT(*) 대신 추정치를 count로 내려줌
+    """
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    # 키셋 정렬에 쓸 수 있는 (NOT NULL + 인덱스 있는) 컬럼들
+    keyset_fields = ('id', 'post_date', 'recommend_count', 'created_at', 'last_activity_at', 'reply_count')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.keyset = None
+        self.approximate = request.query_params.get(self.count_query_param) == 'approx'
+        if self.approximate:
+            self.django_paginator_class = ApproximateCountPaginator
+        if self.cursor_query_param in request.query_params:
+            self.keyset = self.get_keyset(queryset)
+        if self.keyset is None:
+            # 키셋으로 표현할 수 없는 정렬(title 등)은 기존 page 번호 방식으로
+            return super().paginate_queryset(queryset, request, view)
+        return self.paginate_keyset(queryset, request)
+
+    def get_keyset(self, queryset):
+        """
+        현재 정렬을 [(필드, 내림차순 여부), ...] 로 변환, 마지막에 id를 붙여 유일한 순서 보장
+        """
+        ordering = list(queryset.query.order_by)
+        if not ordering and queryset.query.default_ordering:
+            ordering = list(queryset.model._meta.ordering)
+        if not ordering:
+            return None
+        keyset = []
+        for term in ordering:
+            if not isinstance(term, str):
+                return None
+            field = term.lstrip('-')
+            if field == 'pk':
+                field = 'id'
+            if field not in self.keyset_fields:
+                return None
+            keyset.append((field, term.startswith('-')))
+            if field == 'id':
+                break
+        if keyset[-1][0] != 'id':
+            keyset.append(('id', keyset[-1][1]))
+        return keyset
+
+    def paginate_keyset(self, queryset, request):
+        page_size = self.get_page_size(request)
+        values, reverse = self.decode_cursor(request.query_params[self.cursor_query_param])
+        self.has_cursor = values is not None
+        self.reverse = reverse
+        self.count = approximate_count(queryset) if self.approximate else None
+
+        queryset = queryset.order_by(*[
+            f"{'-' if descending != reverse else ''}{field}" for field, descending in self.keyset
+        ])
+        if values is not None:
+            queryset = queryset.filter(self.position_filter(queryset.model, values, reverse))
+        rows = list(queryset[:page_size + 1])
+        self.has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+        self.rows = rows
+        return rows
+
+    def position_filter(self, model, values, reverse):
+        """
+        (k1, k2, ..., id) < (v1, v2, ..., vid) 를 Q로 풀어쓴 조건 (+ 첫 키 범위 조건으로 인덱스 활용)
+        """
+        try:
+            values = [
+                model._meta.get_field(field).to_python(value)
+                for (field, _), value in zip(self.keyset, values)
+            ]
+        except (ValidationError, ValueError, TypeError):
+            raise NotFound('잘못된 cursor 입니다.')
+        if any(value is None for value in values):
+            raise NotFound('잘못된 cursor 입니다.')
+        condition = Q()
+        for index, (field, descending) in enumerate(self.keyset):
+            lookup = 'lt' if descending != reverse else 'gt'
+            step = Q(**{f'{field}__{lookup}': values[index]})
+            for (prev_field, _), prev_value in zip(self.keyset[:index], values[:index]):
+                step &= Q(**{prev_field: prev_value})
+            condition |= step
+        first_field, first_descending = self.keyset[0]
+        first_lookup = 'lte' if first_descending != reverse else 'gte'
+        return Q(**{f'{first_field}__{first_lookup}': values[0]}) & condition
+
+    def encode_cursor(self, obj, reverse):
+        values = []
+        for field, _ in self.keyset:
+            value = getattr(obj, field)
+            if isinstance(value, (datetime.datetime, datetime.date)):
+                value = value.isoformat()
+            values.append(value)
+        payload = json.dumps({'v': values, 'r': reverse}, separators=(',', ':'))
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, cursor):
+        if not cursor:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+            values, reverse = payload['v'], bool(payload.get('r'))
+        except (binascii.Error, ValueError, KeyError, TypeError, AttributeError):
+            raise NotFound('잘못된 cursor 입니다.')
+        if not isinstance(values, list) or len(values) != len(self.keyset):
+            raise NotFound('잘못된 cursor 입니다.')
+        return values, reverse
+
+    def get_keyset_links(self):
+        next_link = previous_link = None
+        if self.rows:
+            forward_more = self.has_more if not self.reverse else self.has_cursor
+            backward_more = self.has_more if self.reverse else self.has_cursor
+            if forward_more:
+                next_link = self.encode_cursor(self.rows[-1], reverse=False)
+            if backward_more:
+                previous_link = self.encode_cursor(self.rows[0], reverse=True)
+        return next_link, previous_link
+
+    def get_paginated_response(self, data):
+        if self.keyset is None:
+            return super().get_paginated_response(data)
+        next_link, previous_link = self.get_keyset_links()
+        fields = [('next', next_link), ('previous', previous_link), ('results', data)]
+        if self.count is not None:
+            fields.insert(0, ('count', self.count))
+        return Response(OrderedDict(fields))
@@ -0,0 +1,74 @@
+# onpremweb_aws/community/reply_tree.py
+from collections import defaultdict
+
+
+class ReplyTree:
+    """
+    게시글/피드백/공지 하나의 전체 댓글을 parent→children 맵으로 보관
+    """
+    def __init__(self, replies):
+        self.children = defaultdict(list)
+        for reply in replies:
+            self.children[reply.parent_id].append(reply)
+
+    def serialize(self, serializer_class, parent_id, context):
+        """
+        parent_id 아래 서브트리를 재귀 없이 직렬화 (기존 중첩 children 구조 그대로)
+        """
+        serializer = serializer_class(context=dict(context, reply_tree_building=True))
+        result = []
+        stack = [(reply, result) for reply in reversed(self.children.get(parent_id, []))]
+        while stack:
+            reply, siblings = stack.pop()
+            data = serializer.to_representation(reply)
+            data['children'] = []
+            siblings.append(data)
+            stack.extend(
+                (child, data['children']) for child in reversed(self.children.get(reply.id, []))
+            )
+        return result
+
+
+def prefetched_replies(owner, related_name='replies'):
+    """
+    prefetch_related로 이미 읽어둔 댓글 목록 (없으면 None)
+    """
+    return getattr(owner, '_prefetched_objects_cache', {}).get(related_name)
+
+
+def get_reply_tree(context, reply_model, owner_field, owner_id, replies=None):
+    """
+    직렬화 context 단위로 원글별 트리를 캐시 - 원글 하나당 댓글 쿼리는 최대 1번
+    """
+    trees = context.setdefault('reply_trees', {})
+    key = (reply_model._meta.label, owner_id)
+    tree = trees.get(key)
+    if tree is None:
+        if replies is None:
+            replies = reply_model.objects.filter(
+                **{f'{owner_field}_id': owner_id}
+            ).select_related('author')
+        tree = trees[key] = ReplyTree(replies)
+    return tree
+
+
+def serialize_reply_roots(serializer_class, owner, owner_field, context):
+    """
+    원글(게시글/피드백/공지)의 최상위 댓글부터 전체 트리를 직렬화
+    """
+    tree = get_reply_tree(
+        context, serializer_class.Meta.model, owner_field, owner.pk, prefetched_replies(owner)
+    )
+    return tree.serialize(serializer_class, None, context)
+
+
+def serialize_reply_children(serializer, reply, owner_field):
+    """
+    댓글 하나의 children 직렬화 (트리 직렬화 중이면 ReplyTree가 채우므로 빈 리스트)
+    """
+    if serializer.context.get('reply_tree_building'):
+        return []
+    tree = get_reply_tree(
+        serializer.context, type(reply), owner_field, getattr(reply, f'{owner_field}_id')
+    )
+    return tree.serialize(type(serializer), reply.id, serializer.context)
@@ -1,10 +1,14 @@
 # onpremweb_aws/community/serializers.py
 from django.contrib.auth.models import User
+from django.utils.text import Truncator
 from rest_framework import serializers
 from .models import (
     Analysis, Board, BoardImage, Recommend, Feedback, FeedbackImage, FeedbackReply, BestBoard,
     Notice, Reply, Score, ErrorLog, Notification, NoticeReply, NoticeImage
 )
+from . import derivatives, fieldsets, fragments, storage
+from .availability import exists_ignoring_case
+from .reply_tree import serialize_reply_children, serialize_reply_roots
 
 class NotificationSerializer(serializers.ModelSerializer):
     board_title = serializers.CharField(source='board.title', read_only=True)
@@ -22,12 +26,28 @@ class RegisterSerializer(serializers.ModelSerializer):
         model = User
         fields = ('username', 'password', 'email')
 
+    # 중복 확인 API(check-username/check-email)와 같은 기준 - 대소문자만 다른 아이디/이메일도 이미 사용 중
+    def validate_username(self, value):
+        if exists_ignoring_case('username', value):
+            raise serializers.ValidationError('이미 사용 중인 아이디입니다.')
+        return value
+
+    def validate_email(self, value):
+        if value and exists_ignoring_case('email', value):
+            raise serializers.ValidationError('이미 사용 중인 이메일입니다.')
+        return value
+
     def create(self, validated_data):
-        user = User.objects.create_user(
-            username=validated_data['username'],
-            password=validated_data['password'],
-            email=validated_data.get('email', '')
+        user = User(
+            username=User.normalize_username(validated_data['username']),
+            email=User.objects.normalize_email(validated_data.get('email', '')),
         )
+        # register_view 는 프로세스 풀에서 미리 계산한 해시를 넘김 (없으면 여기서 해시)
+        if 'password_hash' in validated_data:
+            user.password = validated_data['password_hash']
+        else:
+            user.set_password(validated_data['password'])
+        user.save()
         return user
 
 class UserSimpleSerializer(serializers.ModelSerializer):
@@ -40,10 +60,46 @@ class UserDetailSerializer(serializers.ModelSerializer):
         model = User
         fields = ['id', 'username', 'email', 'is_staff', 'date_joined', 'last_login']
 
+class ImageDerivativeFieldsMixin(serializers.Serializer):
+    """
+    썸네일(가장 작은 WebP, 아직 없으면 원본)과 <img srcset> 값
+    비공개 버킷(AWS_S3_PRESIGNED_GET)이면 image 포함 모든 URL 을 캐시된 presigned GET URL 로 내보냄
+    """
+    thumbnail_url = serializers.SerializerMethodField()
+    srcset = serializers.SerializerMethodField()
+
+    def get_thumbnail_url(self, obj):
+        return derivatives.thumbnail_url(obj.image, obj.derivatives)
+
+    def get_srcset(self, obj):
+        return derivatives.srcset(obj.derivatives)
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        data['image'] = storage.signed_url(data['image'])
+        return data
+
 class AnalysisSerializer(serializers.ModelSerializer):
+    thumbnail_urls = serializers.SerializerMethodField()
+    srcsets = serializers.SerializerMethodField()
+
     class Meta:
         model = Analysis
-        fields = '__all__'
+        exclude = ['image_derivatives', 'image_derivative_attempts']
+
+    def get_thumbnail_urls(self, obj):
+        info = obj.image_derivatives or {}
+        return {field: derivatives.thumbnail_url(getattr(obj, field), info.get(field)) for field in Analysis.IMAGE_FIELDS}
+
+    def get_srcsets(self, obj):
+        info = obj.image_derivatives or {}
+        return {field: derivatives.srcset(info.get(field)) for field in Analysis.IMAGE_FIELDS}
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        for field in Analysis.IMAGE_FIELDS:
+            data[field] = storage.signed_url(data[field])
+        return data
 
 class ReplySerializer(serializers.ModelSerializer):
     children = serializers.SerializerMethodField()
@@ -53,10 +109,7 @@ class ReplySerializer(serializers.ModelSerializer):
         model = Reply
         fields = ['id', 'board', 'author', 'author_username', 'comment', 'parent', 'created_at', 'children']
     def get_children(self, obj):
-        return ReplySerializer(
-            obj.children.filter(board=obj.board),
-            many=True, context=self.context
-        ).data
+        return serialize_reply_children(self, obj, 'board')
     
     def validate_comment(self, value):
         if not value.strip():
@@ -70,12 +123,73 @@ class ReplySerializer(serializers.ModelSerializer):
             validated_data['author'] = request.user
         return super().create(validated_data)
 
-class BoardImageSerializer(serializers.ModelSerializer):
+class BoardImageSerializer(ImageDerivativeFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = BoardImage
-        fields = ['id', 'image', 'uploaded_at']
-
-class BoardSerializer(serializers.ModelSerializer):
+        fields = ['id', 'image', 'uploaded_at', 'thumbnail_url', 'srcset']
+
+class PostSummaryMixin(serializers.Serializer):
+    """
+    게시글/피드백/공지 공통 - 목록(list)은 summary_fields 만 내보내고 images 는 첫 장만 (댓글 트리 없음)
+    ?fields=id,title 로 필드 선택, ?expand=replies,images 로 목록에서도 전체 댓글/이미지 포함
+    """
+    excerpt = serializers.SerializerMethodField()
+    thumbnail_url = serializers.SerializerMethodField()
+    image_serializer_class = None
+    summary_fields = ()
+    excerpt_length = 100
+
+    def _request_action(self):
+        view = self.context.get('view')
+        return self.context.get('request'), getattr(view, 'action', None)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request, action = self._request_action()
+        selected = fieldsets.selected_fields(request, action, self.summary_fields)
+        if selected is not None:
+            fields = type(fields)((name, field) for name, field in fields.items() if name in selected)
+        if 'images' in fields and not fieldsets.expanded(request, action, 'images'):
+            fields['images'] = serializers.SerializerMethodField(method_name='get_first_image')
+        return fields
+
+    def _first_image(self, obj):
+        # prefetch 된 images 를 그대로 사용 (추가 쿼리 없음)
+        images = obj.images.all()
+        return images[0] if len(images) else None
+
+    def get_first_image(self, obj):
+        image = self._first_image(obj)
+        return self.image_serializer_class([image] if image else [], many=True, context=self.context).data
+
+    def get_thumbnail_url(self, obj):
+        image = self._first_image(obj)
+        return derivatives.thumbnail_url(image.image, image.derivatives) if image else None
+
+    def get_excerpt(self, obj):
+        return Truncator(' '.join(obj.content.split())).chars(self.excerpt_length)
+
+class BoardListSerializer(serializers.ListSerializer):
+    """
+    목록 직렬화 시 현재 페이지 게시글들의 '내 추천 여부'를 한 번에 조회
+    context 에 fragment_prefetches 가 있으면 게시글별 조각 캐시를 쓰고 캐시에 없는 게시글만 prefetch + 직렬화
+    """
+    def to_representation(self, data):
+        boards = list(data.all() if hasattr(data, 'all') else data)
+        request = self.context.get('request')
+        if (request and request.user.is_authenticated and 'recommended_by_me' in self.child.fields
+                and 'recommended_board_ids' not in self.context):
+            self.context['recommended_board_ids'] = set(
+                Recommend.objects.filter(
+                    user=request.user, board_id__in=[board.id for board in boards]
+                ).values_list('board_id', flat=True)
+            )
+        prefetches = self.context.get('fragment_prefetches')
+        if prefetches is not None:
+            return fragments.render_boards(self.child, boards, prefetches)
+        return super().to_representation(boards)
+
+class BoardSerializer(PostSummaryMixin, serializers.ModelSerializer):
     images = BoardImageSerializer(many=True, read_only=True)
     cost = serializers.CharField(required=False, allow_blank=True)
     replies = serializers.SerializerMethodField()
@@ -88,9 +202,18 @@ class BoardSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'author', 'author_username', 'title', 'content', 'cost',
             'images', 'replies', 'recommend_count', 'recommended_by_me',
-            'post_date'
+            'post_date', 'reply_count', 'image_count', 'last_activity_at', 'updated_at',
+            'excerpt', 'thumbnail_url'
         ]
-        read_only_fields = ['author', 'id', 'post_date']  # author를 읽기 전용
+        read_only_fields = ['author', 'id', 'post_date', 'reply_count', 'image_count', 'last_activity_at', 'updated_at']  # author를 읽기 전용
+        list_serializer_class = BoardListSerializer
+
+    image_serializer_class = BoardImageSerializer
+    summary_fields = (
+        'id', 'author', 'author_username', 'title', 'excerpt', 'cost', 'images', 'thumbnail_url',
+        'recommend_count', 'recommended_by_me', 'post_date', 'reply_count', 'image_count', 'last_activity_at',
+        'updated_at',
+    )
 
     def create(self, validated_data):
         request = self.context.get('request')
@@ -101,37 +224,44 @@ class BoardSerializer(serializers.ModelSerializer):
     def get_recommended_by_me(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
+            recommended_ids = self.context.get('recommended_board_ids')
+            if recommended_ids is not None:
+                return obj.id in recommended_ids
             return Recommend.objects.filter(board=obj, user=request.user).exists()
         return False
 
     def get_replies(self, obj):
-        # parent가 null인(=최상위) 댓글만!
-        root_replies = obj.replies.filter(parent__isnull=True)
-        return ReplySerializer(root_replies, many=True, context=self.context).data
+        # parent가 null인(=최상위) 댓글부터 전체 트리를 한 번에 구성
+        return serialize_reply_roots(ReplySerializer, obj, 'board', self.context)
 
 class RecommendSerializer(serializers.ModelSerializer):
     class Meta:
         model = Recommend
         fields = '__all__'
 
-class FeedbackImageSerializer(serializers.ModelSerializer):
+class FeedbackImageSerializer(ImageDerivativeFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = FeedbackImage
-        fields = ['id', 'image', 'uploaded_at']
+        fields = ['id', 'image', 'uploaded_at', 'thumbnail_url', 'srcset']
 
-class FeedbackSerializer(serializers.ModelSerializer):
+class FeedbackSerializer(PostSummaryMixin, serializers.ModelSerializer):
     user_username = serializers.CharField(source='user.username', read_only=True)
     images = FeedbackImageSerializer(many=True, read_only=True)
     replies = serializers.SerializerMethodField()
 
     class Meta:
         model = Feedback
-        fields = '__all__'
-        read_only_fields = ['user']
+        exclude = ['search_document']
+        read_only_fields = ['user', 'reply_count', 'image_count', 'last_activity_at', 'updated_at']
+
+    image_serializer_class = FeedbackImageSerializer
+    summary_fields = (
+        'id', 'user', 'user_username', 'title', 'excerpt', 'images', 'thumbnail_url',
+        'created_at', 'reply_count', 'image_count', 'last_activity_at', 'updated_at',
+    )
 
     def get_replies(self, obj):
-        root_replies = obj.replies.filter(parent__isnull=True)
-        return FeedbackReplySerializer(root_replies, many=True, context=self.context).data
+        return serialize_reply_roots(FeedbackReplySerializer, obj, 'feedback', self.context)
 
     def create(self, validated_data):
         request = self.context.get('request')
@@ -151,10 +281,7 @@ class FeedbackReplySerializer(serializers.ModelSerializer):
 
     def get_children(self, obj):
         # 현재 feedback과 같은 feedback의 children만 반환
-        return FeedbackReplySerializer(
-            obj.children.filter(feedback=obj.feedback),
-            many=True, context=self.context
-        ).data
+        return serialize_reply_children(self, obj, 'feedback')
         
     def validate_comment(self, value):
         if not value.strip():
@@ -166,19 +293,22 @@ class BestBoardSerializer(serializers.ModelSerializer):
         model = BestBoard
         fields = '__all__'
 
-class NoticeImageSerializer(serializers.ModelSerializer):
+class NoticeImageSerializer(ImageDerivativeFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = NoticeImage
-        fields = ['id', 'image', 'uploaded_at']
+        fields = ['id', 'image', 'uploaded_at', 'thumbnail_url', 'srcset']
 
-class NoticeSerializer(serializers.ModelSerializer):
+class NoticeSerializer(PostSummaryMixin, serializers.ModelSerializer):
     user_username = serializers.CharField(source='user.username', read_only=True)
     images = NoticeImageSerializer(many=True, read_only=True)
     replies = serializers.SerializerMethodField()
     class Meta:
         model = Notice
-        fields = '__all__'
-        read_only_fields = ['user']
+        exclude = ['search_document']
+        read_only_fields = ['user', 'reply_count', 'image_count', 'last_activity_at', 'updated_at']
+
+    image_serializer_class = NoticeImageSerializer
+    summary_fields = FeedbackSerializer.summary_fields
 
     def create(self, validated_data):
         request = self.context.get('request')
@@ -187,8 +317,7 @@ class NoticeSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
     def get_replies(self, obj):
-        root_replies = obj.replies.filter(parent__isnull=True)
-        return NoticeReplySerializer(root_replies, many=True, context=self.context).data
+        return serialize_reply_roots(NoticeReplySerializer, obj, 'notice', self.context)
 
 
 class NoticeReplySerializer(serializers.ModelSerializer):
@@ -201,10 +330,7 @@ class NoticeReplySerializer(serializers.ModelSerializer):
         read_only_fields = ['author']
 
     def get_children(self, obj):
-        return NoticeReplySerializer(
-            obj.children.filter(notice=obj.notice),
-            many=True
-        ).data
+        return serialize_reply_children(self, obj, 'notice')
 
     def validate_comment(self, value):
         if not value.strip():
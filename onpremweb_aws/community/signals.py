@@ -0,0 +1,100 @@
+# onpremweb_aws/community/signals.py
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from . import counters
+from .authentication import invalidate_user
+from .availability import user_changed
+from .deletion_queue import enqueue_url
+from .derivatives import derivative_urls
+from .models import (
+    Board, BoardImage, Feedback, FeedbackImage, FeedbackReply, Notice, NoticeImage, NoticeReply, Reply,
+)
+
+# 댓글/이미지 모델 → (부모 모델, 부모 FK 이름)
+REPLY_OWNERS = {Reply: (Board, 'board_id'), FeedbackReply: (Feedback, 'feedback_id'), NoticeReply: (Notice, 'notice_id')}
+IMAGE_OWNERS = {BoardImage: (Board, 'board_id'), FeedbackImage: (Feedback, 'feedback_id'), NoticeImage: (Notice, 'notice_id')}
+
+
+@receiver(post_delete, sender=BoardImage)
+@receiver(post_delete, sender=FeedbackImage)
+@receiver(post_delete, sender=NoticeImage)
+def enqueue_image_deletion(sender, instance, **kwargs):
+    # 직접 삭제든 게시글/피드백/공지/회원 삭제에 따른 CASCADE 든 S3 파일(파생 이미지 포함)도 지우도록 대기열에 추가
+    enqueue_url(instance.image)
+    for url in derivative_urls(instance.derivatives):
+        enqueue_url(url)
+
+
+@receiver(pre_delete, sender=Board)
+@receiver(pre_delete, sender=Feedback)
+@receiver(pre_delete, sender=Notice)
+def mark_owner_deleting(sender, instance, **kwargs):
+    counters.mark_deleting(instance)
+
+
+@receiver(post_delete, sender=Board)
+@receiver(post_delete, sender=Feedback)
+@receiver(post_delete, sender=Notice)
+def unmark_owner_deleting(sender, instance, **kwargs):
+    counters.unmark_deleting(instance)
+
+
+@receiver(post_save, sender=Reply)
+@receiver(post_save, sender=FeedbackReply)
+@receiver(post_save, sender=NoticeReply)
+def count_reply_created(sender, instance, created, **kwargs):
+    if created:
+        owner_model, owner_field = REPLY_OWNERS[sender]
+        counters.adjust(owner_model, getattr(instance, owner_field), replies=1, touch=True)
+    else:
+        # 댓글 수정 - 원글 상세(과 ?expand=replies 목록 조각)에 댓글 트리가 들어가므로
+        owner_model, owner_field = REPLY_OWNERS[sender]
+        counters.mark_changed(owner_model, getattr(instance, owner_field))
+
+
+@receiver(post_save, sender=Board)
+@receiver(post_save, sender=Feedback)
+@receiver(post_save, sender=Notice)
+def mark_owner_changed(sender, instance, created, **kwargs):
+    if not created:
+        # 수정 응답에도 새 updated_at 이 나가도록 인스턴스에도 반영
+        instance.updated_at = timezone.now()
+        counters.mark_changed(sender, instance.pk, at=instance.updated_at)
+
+
+@receiver(post_delete, sender=Reply)
+@receiver(post_delete, sender=FeedbackReply)
+@receiver(post_delete, sender=NoticeReply)
+def count_reply_deleted(sender, instance, **kwargs):
+    # 대댓글 CASCADE, 회원 탈퇴로 다른 글의 댓글이 지워지는 경우도 여기로 옴
+    owner_model, owner_field = REPLY_OWNERS[sender]
+    counters.adjust(owner_model, getattr(instance, owner_field), replies=-1)
+
+
+@receiver(post_save, sender=BoardImage)
+@receiver(post_save, sender=FeedbackImage)
+@receiver(post_save, sender=NoticeImage)
+def count_image_created(sender, instance, created, **kwargs):
+    # attach_images 의 bulk_create 는 시그널이 없어서 거기서 직접 증가시킴
+    if created:
+        owner_model, owner_field = IMAGE_OWNERS[sender]
+        counters.adjust(owner_model, getattr(instance, owner_field), images=1, touch=True)
+
+
+@receiver(post_delete, sender=BoardImage)
+@receiver(post_delete, sender=FeedbackImage)
+@receiver(post_delete, sender=NoticeImage)
+def count_image_deleted(sender, instance, **kwargs):
+    owner_model, owner_field = IMAGE_OWNERS[sender]
+    counters.adjust(owner_model, getattr(instance, owner_field), images=-1)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    # set_password / 탈퇴(destroy) / 관리자 수정 - 다음 요청부터 DB 의 값으로 인증
+    invalidate_user(instance)
+    # 아이디/이메일 중복 확인용 Bloom filter, 최근 답 캐시
+    user_changed(instance)
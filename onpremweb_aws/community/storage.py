@@ -0,0 +1,304 @@
+# onpremweb_aws/community/storage.py
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+import boto3
+from botocore.config import Config
+from django.conf import settings
+
+_lock = threading.Lock()
+_client = None
+_client_pid = None
+
+
+class StorageMetrics:
+    """
+    프로세스별 S3 호출 통계 (클라이언트 생성 횟수, 작업별 호출 수/실패 수/지연시간)
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.clients_created = 0
+            self.client_create_seconds = 0.0
+            self.operations = {}
+            self.presign_cache_hits = 0
+            self.presign_cache_misses = 0
+
+    def record_presign_cache(self, hit):
+        with self._lock:
+            if hit:
+                self.presign_cache_hits += 1
+            else:
+                self.presign_cache_misses += 1
+
+    def record_client(self, seconds):
+        with self._lock:
+            self.clients_created += 1
+            self.client_create_seconds += seconds
+
+    def record_call(self, operation, seconds, failed):
+        with self._lock:
+            stats = self.operations.setdefault(
+                operation, {'calls': 0, 'errors': 0, 'total_seconds': 0.0, 'max_seconds': 0.0}
+            )
+            stats['calls'] += 1
+            stats['errors'] += int(failed)
+            stats['total_seconds'] += seconds
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'pid': os.getpid(),
+                'clients_created': self.clients_created,
+                'client_create_seconds': round(self.client_create_seconds, 4),
+                'presign_cache_hits': self.presign_cache_hits,
+                'presign_cache_misses': self.presign_cache_misses,
+                'operations': {
+                    operation: dict(
+                        stats,
+                        total_seconds=round(stats['total_seconds'], 4),
+                        max_seconds=round(stats['max_seconds'], 4),
+                        avg_seconds=round(stats['total_seconds'] / stats['calls'], 4),
+                    )
+                    for operation, stats in self.operations.items()
+                },
+            }
+
+
+metrics = StorageMetrics()
+
+
+def _create_client():
+    started = time.perf_counter()
+    endpoint_url = getattr(settings, 'AWS_S3_ENDPOINT_URL', None)
+    config = Config(
+        signature_version='s3v4',
+        max_pool_connections=getattr(settings, 'AWS_S3_MAX_POOL_CONNECTIONS', 20),
+        retries={'max_attempts': 3, 'mode': 'standard'},
+        # 리전 도메인(<bucket>.s3.<region>.amazonaws.com)으로 서명 - 글로벌 도메인은 리다이렉트되어 서명이 깨질 수 있음
+        # 로컬 S3 호환 서버(MinIO 등)는 가상 호스트 방식 도메인이 없으므로 path 방식
+        s3={'addressing_style': 'path' if endpoint_url else 'virtual'},
+    )
+    # boto3 기본 세션은 스레드 안전하지 않으므로 전용 세션으로 생성 (생성된 클라이언트는 스레드 간 공유 가능)
+    session = boto3.session.Session(
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        region_name=settings.AWS_REGION,
+    )
+    client = session.client('s3', endpoint_url=endpoint_url, config=config)
+    metrics.record_client(time.perf_counter() - started)
+    return client
+
+
+def get_client():
+    """
+    프로세스당 하나의 S3 클라이언트 (처음 쓸 때 생성, HTTP 커넥션 풀 재사용)
+    gunicorn 워커처럼 fork 된 프로세스에서는 부모의 커넥션을 쓰지 않도록 pid 가 바뀌면 새로 생성
+    """
+    global _client, _client_pid
+    client, pid = _client, os.getpid()
+    if client is not None and _client_pid == pid:
+        return client
+    with _lock:
+        if _client is None or _client_pid != pid:
+            _client = _create_client()
+            _client_pid = pid
+        return _client
+
+
+def reset_client():
+    """
+    설정(엔드포인트 등)을 바꾼 뒤 다시 만들도록 캐시된 클라이언트 제거
+    """
+    global _client, _client_pid
+    with _lock:
+        _client = None
+        _client_pid = None
+
+
+@contextmanager
+def timed(operation):
+    started = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except Exception:
+        failed = True
+        raise
+    finally:
+        metrics.record_call(operation, time.perf_counter() - started, failed)
+
+
+def bucket():
+    return settings.AWS_S3_BUCKET
+
+
+def public_url(key):
+    endpoint_url = getattr(settings, 'AWS_S3_ENDPOINT_URL', None)
+    if endpoint_url:
+        return f"{endpoint_url.rstrip('/')}/{bucket()}/{key}"
+    return f"https://{bucket()}.s3.{settings.AWS_REGION}.amazonaws.com/{key}"
+
+
+def key_from_url(url):
+    """
+    public_url 로 만든 URL → S3 key (우리 버킷 URL 이 아니면 None, presigned URL 이면 쿼리스트링 제거)
+    """
+    prefix = public_url('')
+    if not url or not url.startswith(prefix):
+        return None
+    return url[len(prefix):].split('?', 1)[0] or None
+
+
+class PresignedUrlCache:
+    """
+    프로세스별 presigned GET URL 캐시 (key → (url, 재서명 시각), LRU)
+    만료 refresh 초 전까지는 같은 URL 을 돌려줘서 목록을 다시 불러도 서명을 새로 하지 않고 브라우저 캐시도 그대로 쓰임
+    """
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key, now):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= now:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, url, refresh_at, now):
+        with self._lock:
+            self._entries[key] = (url, refresh_at)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                # 꽉 차면 재서명 시각이 지난 것부터 비우고, 그래도 넘치면 가장 오래 안 쓴 것부터
+                for stale in [k for k, (_, at) in self._entries.items() if at <= now]:
+                    del self._entries[stale]
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+presigned_get_cache = PresignedUrlCache(getattr(settings, 'AWS_S3_PRESIGNED_GET_CACHE_SIZE', 10000))
+
+
+def presigned_get_url(key):
+    expires_in = getattr(settings, 'AWS_S3_PRESIGNED_GET_EXPIRES', 3600)
+    refresh = getattr(settings, 'AWS_S3_PRESIGNED_GET_REFRESH', expires_in // 4)
+    now = time.time()
+    url = presigned_get_cache.get(key, now)
+    metrics.record_presign_cache(url is not None)
+    if url is None:
+        with timed('presign_get'):
+            url = get_client().generate_presigned_url(
+                ClientMethod='get_object', Params={'Bucket': bucket(), 'Key': key}, ExpiresIn=expires_in,
+            )
+        presigned_get_cache.put(key, url, now + expires_in - refresh, now)
+    return url
+
+
+def signed_url(url):
+    """
+    응답에 내보낼 이미지 URL - 비공개 버킷이면 우리 버킷 URL 을 presigned GET URL 로 바꿈
+    """
+    if not getattr(settings, 'AWS_S3_PRESIGNED_GET', False):
+        return url
+    key = key_from_url(url)
+    return presigned_get_url(key) if key else url
+
+
+def upload_key(user_id, file_name):
+    """
+    프론트가 직접 올리는 파일의 key (user_uploads/<user_id>/<uuid>_<파일명>)
+    """
+    return f"user_uploads/{user_id}/{uuid.uuid4()}_{file_name}"
+
+
+def presigned_put_url(key, content_type, expires_in=300, **params):
+    with timed('presign_put'):
+        return get_client().generate_presigned_url(
+            ClientMethod='put_object',
+            Params={'Bucket': bucket(), 'Key': key, 'ContentType': content_type, **params},
+            ExpiresIn=expires_in,
+            HttpMethod='PUT',
+        )
+
+
+def get_object_bytes(key):
+    with timed('get_object'):
+        return get_client().get_object(Bucket=bucket(), Key=key)['Body'].read()
+
+
+def put_object(key, body, content_type):
+    # 파생 이미지처럼 key 가 바뀌지 않는 파일 - 브라우저/CDN 이 오래 캐시하도록
+    with timed('put_object'):
+        get_client().put_object(
+            Bucket=bucket(), Key=key, Body=body, ContentType=content_type,
+            CacheControl='public, max-age=31536000, immutable',
+        )
+
+
+def presigned_post(key, content_type, max_bytes, expires_in=300):
+    """
+    브라우저 form 업로드용 presigned POST - PUT 과 달리 S3 가 파일 크기(content-length-range)를 검사
+    """
+    with timed('presign_post'):
+        return get_client().generate_presigned_post(
+            Bucket=bucket(),
+            Key=key,
+            Fields={'Content-Type': content_type},
+            Conditions=[{'Content-Type': content_type}, ['content-length-range', 1, max_bytes]],
+            ExpiresIn=expires_in,
+        )
+
+
+def delete_object(key):
+    with timed('delete_object'):
+        get_client().delete_object(Bucket=bucket(), Key=key)
+
+
+def list_object_pages(prefix):
+    """
+    prefix 아래 객체를 list_objects_v2 페이지(최대 1000개) 단위로 반환
+    """
+    paginator = get_client().get_paginator('list_objects_v2')
+    pages = iter(paginator.paginate(Bucket=bucket(), Prefix=prefix))
+    while True:
+        with timed('list_objects_v2'):
+            page = next(pages, None)
+        if page is None:
+            return
+        yield page.get('Contents', [])
+
+
+DELETE_OBJECTS_LIMIT = 1000  # DeleteObjects 1회 최대 key 수
+
+
+def delete_objects(keys):
+    """
+    DeleteObjects 로 최대 1000개씩 일괄 삭제, 실패한 key 는 {key: 오류메시지} 로 반환
+    (없는 key 삭제는 S3 에서 성공으로 처리됨)
+    """
+    failed = {}
+    for start in range(0, len(keys), DELETE_OBJECTS_LIMIT):
+        chunk = keys[start:start + DELETE_OBJECTS_LIMIT]
+        with timed('delete_objects'):
+            response = get_client().delete_objects(
+                Bucket=bucket(),
+                Delete={'Objects': [{'Key': key} for key in chunk], 'Quiet': True},
+            )
+        for error in response.get('Errors', []):
+            failed[error['Key']] = f"{error.get('Code', '')}: {error.get('Message', '')}"
+    return failed
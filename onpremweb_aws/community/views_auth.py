@@ -0,0 +1,177 @@
+# onpremweb_aws/community/views_auth.py
+import json
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.http import JsonResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from . import password_pool
+from .authentication import CachedJWTAuthentication
+from .last_login import last_logins
+from .password_pool import PoolSaturated
+from .serializers import RegisterSerializer, SetPasswordSerializer
+
+# 로그인/회원가입/비밀번호 변경 - PBKDF2 해시/검증을 프로세스 풀(password_pool.py)에서 실행하는 async 뷰
+# 배포에서는 nginx 가 이 경로들을 ASGI 서비스(asgi-onpremweb, uvicorn)로 보내서 해시를 기다리는 동안 이벤트 루프가 다른 요청을 처리
+# WSGI(gthread)로 받으면 해시 계산은 워커 프로세스 밖에서 돌지만 요청 스레드는 끝날 때까지 묶여 있음
+# DRF 뷰처럼 JWT 로만 인증하므로 CSRF 검사 제외
+
+
+def csrf_exempt(view):
+    # django.views.decorators.csrf.csrf_exempt 는 (Django 3.2 에서) async 뷰를 sync 로 감싸버림
+    view.csrf_exempt = True
+    return view
+
+
+def _data(request):
+    if request.content_type == 'application/json':
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+    return request.POST.dict()
+
+
+def _saturated(e):
+    response = JsonResponse({'detail': '요청이 많습니다. 잠시 후 다시 시도하세요.'}, status=429)
+    response['Retry-After'] = str(e.retry_after)
+    return response
+
+
+def _method_not_allowed(request):
+    return JsonResponse({'detail': f'Method "{request.method}" not allowed.'}, status=405)
+
+
+@sync_to_async
+def _find_active_user(username):
+    user = User.objects.filter(**{User.USERNAME_FIELD: username}).first()
+    return user if user is not None and user.is_active else None
+
+
+@sync_to_async
+def _save_password(user, encoded):
+    user.password = encoded
+    user.save(update_fields=['password'])  # post_save 에서 인증 캐시도 무효화
+
+
+@csrf_exempt
+async def login_token_view(request):
+    """
+    POST /api/token/ - simplejwt TokenObtainPairView 와 같은 요청/응답 {"access", "refresh"}
+    user 조회 1번 + 풀에서 비밀번호 검증, last_login 은 모아서 기록
+    """
+    if request.method != 'POST':
+        return _method_not_allowed(request)
+    data = _data(request)
+    if data is None:
+        return JsonResponse({'detail': 'JSON parse error'}, status=400)
+    errors = {name: ['This field is required.'] for name in ('username', 'password') if not data.get(name)}
+    if errors:
+        return JsonResponse(errors, status=400)
+
+    try:
+        user = await _find_active_user(data['username'])
+        if user is None:
+            # 없는 사용자도 해시 한 번 (ModelBackend 와 같이 응답 시간으로 존재 여부가 드러나지 않도록)
+            await password_pool.make_password(data['password'])
+            valid = False
+        else:
+            valid, must_update = await password_pool.verify_password(data['password'], user.password)
+            if valid and must_update:
+                await _save_password(user, await password_pool.make_password(data['password']))
+    except PoolSaturated as e:
+        return _saturated(e)
+    if not valid or not jwt_settings.USER_AUTHENTICATION_RULE(user):
+        return JsonResponse({'detail': 'No active account found with the given credentials'}, status=401)
+
+    refresh = RefreshToken.for_user(user)
+    last_logins.record(user)
+    return JsonResponse({'refresh': str(refresh), 'access': str(refresh.access_token)})
+
+
+@csrf_exempt
+async def register_view(request):
+    """
+    POST /api/register/ - 검증은 RegisterSerializer 그대로, 비밀번호 해시만 풀에서
+    """
+    if request.method != 'POST':
+        return _method_not_allowed(request)
+    data = _data(request)
+    if data is None:
+        return JsonResponse({'detail': 'JSON parse error'}, status=400)
+    serializer = RegisterSerializer(data=data)
+    if not await sync_to_async(serializer.is_valid)():
+        return JsonResponse(serializer.errors, status=400)
+    try:
+        password_hash = await password_pool.make_password(serializer.validated_data['password'])
+    except PoolSaturated as e:
+        return _saturated(e)
+    await sync_to_async(serializer.save)(password_hash=password_hash)
+    return JsonResponse(serializer.data, status=201)
+
+
+@sync_to_async
+def _authenticate(request):
+    try:
+        result = CachedJWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return None
+    return result[0] if result else None
+
+
+@sync_to_async
+def _get_user(pk):
+    return User.objects.filter(pk=pk).first()
+
+
+@sync_to_async
+def _password_hash(pk):
+    # 인증 캐시의 사용자에는 비밀번호 해시가 없으므로 검증 직전에 DB 에서 읽음
+    return User.objects.filter(pk=pk).values_list('password', flat=True).first()
+
+
+@csrf_exempt
+async def set_password_view(request, pk):
+    """
+    POST /api/users/<pk>/set_password/ {"old_password", "new_password"} - 관리자 또는 본인만
+    """
+    if request.method != 'POST':
+        return _method_not_allowed(request)
+    actor = await _authenticate(request)
+    if actor is None:
+        return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=401)
+    user = actor if actor.pk == pk else await _get_user(pk)
+    if user is None:
+        return JsonResponse({'detail': 'Not found.'}, status=404)
+    if not (actor.is_staff or actor.pk == user.pk):
+        return JsonResponse({'detail': 'You do not have permission to perform this action.'}, status=403)
+    serializer = SetPasswordSerializer(data=_data(request) or {})
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=400)
+
+    current_hash = await _password_hash(user.pk)
+    if current_hash is None:
+        return JsonResponse({'detail': 'Not found.'}, status=404)
+    try:
+        valid, _ = await password_pool.verify_password(serializer.validated_data['old_password'], current_hash)
+        if not valid:
+            return JsonResponse({'detail': '현재 비밀번호가 올바르지 않습니다.'}, status=400)
+        password_hash = await password_pool.make_password(serializer.validated_data['new_password'])
+    except PoolSaturated as e:
+        return _saturated(e)
+    await _save_password(user, password_hash)
+    return JsonResponse({'detail': '비밀번호가 변경되었습니다.'})
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def auth_hash_metrics(request):
+    """
+    이 워커 프로세스의 비밀번호 해시 풀 대기열/처리 통계
+    """
+    return Response(password_pool.metrics.snapshot())
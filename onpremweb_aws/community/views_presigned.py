@@ -3,30 +3,55 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.conf import settings
-import boto3
-import uuid
+from . import storage
+from .attachments import record_pending_uploads
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def s3_presigned_upload(request):
     file_name = request.data['file_name']
     file_type = request.data['file_type']
-    s3_key = f"user_uploads/{request.user.id}/{uuid.uuid4()}_{file_name}"
-    s3 = boto3.client(
-        's3',
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        region_name=settings.AWS_REGION
-    )
-    url = s3.generate_presigned_url(
-        ClientMethod='put_object',
-        Params={
-            'Bucket': settings.AWS_S3_BUCKET,
-            'Key': s3_key,
-            'ContentType': file_type,
-            #'ACL': 'public-read'
-        },
-        ExpiresIn=300,
-        HttpMethod='PUT'
-    )
-    return Response({'url': url, 's3_url': f"https://{settings.AWS_S3_BUCKET}.s3.{settings.AWS_REGION}.amazonaws.com/{s3_key}"})
+    s3_key = storage.upload_key(request.user.id, file_name)
+    url = storage.presigned_put_url(s3_key, file_type)  # ACL 없이 (버킷 정책으로 공개)
+    record_pending_uploads(request.user, [s3_key])
+    return Response({'url': url, 's3_url': storage.public_url(s3_key)})
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def s3_presigned_upload_batch(request):
+    """
+    여러 파일의 presigned 업로드 URL 을 한 번에 발급 (파일마다 요청하지 않도록)
+    {"files": [{"file_name": ..., "file_type": ..., "size": ...}], "method": "put" | "post"}
+    method=post 면 S3 가 크기 제한(content-length-range)을 검사하는 presigned POST 폼 정보를 반환
+    """
+    files = request.data.get('files')
+    method = request.data.get('method', 'put')
+    max_files = getattr(settings, 'S3_PRESIGN_MAX_FILES', 20)
+    max_bytes = getattr(settings, 'S3_UPLOAD_MAX_BYTES', 20 * 1024 * 1024)
+    if method not in ('put', 'post'):
+        return Response({'error': 'method는 put 또는 post여야 합니다.'}, status=400)
+    if not isinstance(files, list) or not files:
+        return Response({'error': 'files는 비어있지 않은 리스트여야 합니다.'}, status=400)
+    if len(files) > max_files:
+        return Response({'error': f'한 번에 최대 {max_files}개까지 업로드할 수 있습니다.'}, status=400)
+
+    for index, file in enumerate(files):
+        if not isinstance(file, dict) or not file.get('file_name') or not file.get('file_type'):
+            return Response({'error': f'files[{index}]에 file_name, file_type이 필요합니다.'}, status=400)
+        size = file.get('size')
+        if size is not None and (not isinstance(size, int) or isinstance(size, bool) or not 0 < size <= max_bytes):
+            return Response({'error': f'files[{index}]의 size는 1~{max_bytes} 바이트여야 합니다.'}, status=400)
+
+    uploads = []
+    for file in files:
+        s3_key = storage.upload_key(request.user.id, file['file_name'])
+        upload = {'file_name': file['file_name'], 's3_url': storage.public_url(s3_key)}
+        if method == 'post':
+            post = storage.presigned_post(s3_key, file['file_type'], file.get('size') or max_bytes)
+            upload.update(url=post['url'], fields=post['fields'])
+        else:
+            upload['url'] = storage.presigned_put_url(s3_key, file['file_type'])
+        uploads.append(upload)
+    record_pending_uploads(request.user, [storage.key_from_url(upload['s3_url']) for upload in uploads])
+    return Response({'method': method, 'uploads': uploads})
@@ -93,7 +93,8 @@ DATABASES = {
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # simplejwt JWTAuthentication + 사용자 조회 캐시 (community/authentication.py)
+        'community.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,    
@@ -125,6 +126,57 @@ AWS_ACCESS_KEY_ID = os.getenv('AWS_ACCESS_KEY_ID')
 AWS_SECRET_ACCESS_KEY = os.getenv('AWS_SECRET_ACCESS_KEY')
 AWS_S3_BUCKET = os.getenv('AWS_S3_BUCKET')
 AWS_REGION = os.getenv('AWS_REGION')
+# 로컬 S3 호환 서버(MinIO 등)로 테스트할 때만 지정 (예: http://localhost:9000)
+AWS_S3_ENDPOINT_URL = os.getenv('AWS_S3_ENDPOINT_URL') or None
+AWS_S3_MAX_POOL_CONNECTIONS = int(os.getenv('AWS_S3_MAX_POOL_CONNECTIONS', '20'))
+# 비공개 버킷이면 True: 응답의 이미지 URL 을 presigned GET URL 로 (프로세스별 캐시, 만료 REFRESH 초 전에 재서명)
+# 기본은 기존처럼 저장된 URL 그대로 (공개 버킷), AWS 배포는 ansible 이 .env 에 True 를 넣음
+AWS_S3_PRESIGNED_GET = os.getenv('AWS_S3_PRESIGNED_GET', 'False') == 'True'
+AWS_S3_PRESIGNED_GET_EXPIRES = int(os.getenv('AWS_S3_PRESIGNED_GET_EXPIRES', '3600'))
+AWS_S3_PRESIGNED_GET_REFRESH = int(os.getenv('AWS_S3_PRESIGNED_GET_REFRESH', '900'))
+AWS_S3_PRESIGNED_GET_CACHE_SIZE = int(os.getenv('AWS_S3_PRESIGNED_GET_CACHE_SIZE', '10000'))
+# 일괄 presign 제한 (파일 수, 파일당 최대 크기 - nginx client_max_body_size 와 맞춤)
+S3_PRESIGN_MAX_FILES = int(os.getenv('S3_PRESIGN_MAX_FILES', '20'))
+S3_UPLOAD_MAX_BYTES = int(os.getenv('S3_UPLOAD_MAX_BYTES', str(20 * 1024 * 1024)))
+# presign 후 이미지로 연결되지 않은 업로드를 보관하는 시간 (gc_orphan_uploads)
+PENDING_UPLOAD_TTL_HOURS = int(os.getenv('PENDING_UPLOAD_TTL_HOURS', '24'))
+# 썸네일/WebP 파생 이미지 (build_image_derivatives)
+IMAGE_DERIVATIVE_WIDTHS = [int(w) for w in os.getenv('IMAGE_DERIVATIVE_WIDTHS', '320,640,1280').split(',')]
+IMAGE_DERIVATIVE_WORKERS = int(os.getenv('IMAGE_DERIVATIVE_WORKERS', '2'))
+# 일시적 실패(S3 업로드 등)를 이 횟수만큼 반복하면 오류로 기록하고 더 이상 시도하지 않음
+IMAGE_DERIVATIVE_MAX_ATTEMPTS = int(os.getenv('IMAGE_DERIVATIVE_MAX_ATTEMPTS', '5'))
+
+# 베스트 게시판 랭킹 (rebuild_best_boards)
+BEST_BOARD_SIZE = int(os.getenv('BEST_BOARD_SIZE', '100'))
+TRENDING_HALF_LIFE_HOURS = float(os.getenv('TRENDING_HALF_LIFE_HOURS', '24'))
+TRENDING_WINDOW_DAYS = int(os.getenv('TRENDING_WINDOW_DAYS', '7'))
+
+# 알림 long-poll/SSE (초) - LISTEN 불가 시 DB 재확인 간격, SSE heartbeat, long-poll 최대 대기, SSE ticket 유효 시간
+NOTIFICATION_POLL_INTERVAL = int(os.getenv('NOTIFICATION_POLL_INTERVAL', '5'))
+NOTIFICATION_SSE_HEARTBEAT = int(os.getenv('NOTIFICATION_SSE_HEARTBEAT', '15'))
+NOTIFICATION_LONGPOLL_TIMEOUT = int(os.getenv('NOTIFICATION_LONGPOLL_TIMEOUT', '25'))
+NOTIFICATION_STREAM_TICKET_TTL = int(os.getenv('NOTIFICATION_STREAM_TICKET_TTL', '30'))
+
+# 게시글 목록 조각 캐시 (프로세스 메모리 + Django 캐시, 게시글 version 으로 무효화)
+BOARD_FRAGMENT_CACHE = os.getenv('BOARD_FRAGMENT_CACHE', 'True') == 'True'
+BOARD_FRAGMENT_CACHE_TIMEOUT = int(os.getenv('BOARD_FRAGMENT_CACHE_TIMEOUT', '300'))
+BOARD_FRAGMENT_LOCAL_SIZE = int(os.getenv('BOARD_FRAGMENT_LOCAL_SIZE', '2000'))
+
+# JWT 인증 사용자 캐시 (초) - 공유 캐시(CACHES)가 없으면(기본 LocMem) 워커별 LOCAL_TIMEOUT 만 적용
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv('AUTH_USER_CACHE_TIMEOUT', '300'))
+AUTH_USER_CACHE_LOCAL_TIMEOUT = int(os.getenv('AUTH_USER_CACHE_LOCAL_TIMEOUT', '10'))
+AUTH_USER_CACHE_LOCAL_SIZE = int(os.getenv('AUTH_USER_CACHE_LOCAL_SIZE', '5000'))
+# 로그인 시각(last_login)을 모아서 기록하는 주기 (초)
+LAST_LOGIN_FLUSH_INTERVAL = float(os.getenv('LAST_LOGIN_FLUSH_INTERVAL', '5'))
+# 비밀번호 해시/검증 프로세스 풀 (워커 프로세스당) - 실행 중 + 대기가 WORKERS + MAX_QUEUE 를 넘으면 429
+AUTH_HASH_WORKERS = int(os.getenv('AUTH_HASH_WORKERS', '2'))
+AUTH_HASH_MAX_QUEUE = int(os.getenv('AUTH_HASH_MAX_QUEUE', '8'))
+AUTH_HASH_RETRY_AFTER = int(os.getenv('AUTH_HASH_RETRY_AFTER', '2'))
+# 아이디/이메일 중복 확인 (초) - Bloom filter 전체 재생성/신규 가입자 반영 주기, 최근 답 캐시
+AVAILABILITY_REBUILD_INTERVAL = int(os.getenv('AVAILABILITY_REBUILD_INTERVAL', '600'))
+AVAILABILITY_SYNC_INTERVAL = int(os.getenv('AVAILABILITY_SYNC_INTERVAL', '5'))
+AVAILABILITY_TAKEN_TTL = int(os.getenv('AVAILABILITY_TAKEN_TTL', '60'))
+AVAILABILITY_FREE_TTL = int(os.getenv('AVAILABILITY_FREE_TTL', '10'))
 
 
 CORS_ALLOW_ALL_ORIGINS = False
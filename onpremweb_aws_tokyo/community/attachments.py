@@ -0,0 +1,66 @@
+# onpremweb_aws/community/attachments.py
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from . import counters, storage
+from .models import PendingUpload
+
+UPLOAD_PREFIX = 'user_uploads/'
+
+
+class AttachmentError(Exception):
+    pass
+
+
+def record_pending_uploads(user, keys):
+    """
+    presigned URL 발급 시 호출 - 연결되지 않은 채 만료되면 gc_orphan_uploads 가 S3 에서 지움
+    """
+    expires_at = timezone.now() + timedelta(hours=getattr(settings, 'PENDING_UPLOAD_TTL_HOURS', 24))
+    PendingUpload.objects.bulk_create(
+        [PendingUpload(key=key, user=user, expires_at=expires_at) for key in keys], ignore_conflicts=True
+    )
+
+
+def user_prefix(user):
+    return f'{UPLOAD_PREFIX}{user.id}/'
+
+
+def validate_urls(user, urls):
+    """
+    우리 버킷의 user_uploads/<본인 id>/ 아래 URL 만 허용 (남이 올린 파일을 붙이거나 gc 대상에서 빼돌리지 못하게)
+    요청 안 중복은 순서 유지하며 제거 (서명 없는 URL 로 정규화)
+    """
+    if not isinstance(urls, list):
+        raise AttachmentError('s3_urls는 리스트여야 합니다.')
+    prefix = user_prefix(user)
+    unique = []
+    for url in urls:
+        key = storage.key_from_url(url) if isinstance(url, str) else None
+        if not key or not key.startswith(prefix) or '/../' in key:
+            raise AttachmentError(f'허용되지 않은 이미지 URL입니다: {url}')
+        # presigned GET URL 로 넘어와도 서명 없는 URL 로 저장
+        url = storage.public_url(key)
+        if url not in unique:
+            unique.append(url)
+    return unique
+
+
+def attach_images(user, owner, image_model, owner_field, urls):
+    """
+    owner(게시글/피드백/공지)에 이미지 URL 들을 붙임 - 이미 붙어 있는 URL 은 건너뛰고 INSERT 한 번
+    검증에 실패하면 아무것도 저장하지 않음
+    """
+    urls = validate_urls(user, urls)
+    with transaction.atomic():
+        existing = set(
+            image_model.objects.filter(**{owner_field: owner}, image__in=urls).values_list('image', flat=True)
+        )
+        rows = [image_model(**{owner_field: owner}, image=url) for url in urls if url not in existing]
+        created = image_model.objects.bulk_create(rows)
+        if created:
+            # bulk_create 는 post_save 를 보내지 않으므로 카운터를 직접 갱신
+            counters.adjust(type(owner), owner.pk, images=len(created), touch=True)
+        PendingUpload.objects.filter(key__in=[storage.key_from_url(url) for url in urls]).delete()
+        return created
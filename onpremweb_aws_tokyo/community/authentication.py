@@ -0,0 +1,115 @@
+# onpremweb_aws/community/authentication.py
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from .local_cache import LocalCache
+
+# v2: 비밀번호 해시를 빼고 저장 (v1 행은 읽지 않고 만료되게 둠)
+KEY_PREFIX = 'auth-user:v2'
+
+# 워커별 1차 캐시 - 다른 워커에서 바뀐 값은 이 시간 안에 반영 (짧게 유지)
+local_users = LocalCache(
+    getattr(settings, 'AUTH_USER_CACHE_LOCAL_SIZE', 5000),
+    getattr(settings, 'AUTH_USER_CACHE_LOCAL_TIMEOUT', 10),
+)
+
+
+def _cache_key(user_id):
+    return f'{KEY_PREFIX}:{user_id}'
+
+
+def _shared_cache():
+    """
+    여러 워커가 같이 쓰는 캐시일 때만 2차 캐시로 사용
+    LocMem(CACHES 미설정 기본값)은 워커별이라 invalidate_user 가 현재 워커만 지우므로 건너뜀 → 로컬 TTL 만 적용
+    """
+    cache = caches['default']
+    return None if isinstance(cache, LocMemCache) else cache
+
+
+def _cached_fields(user):
+    """
+    캐시에 담을 컬럼 - 비밀번호 해시는 토큰 폐기 검사(CHECK_REVOKE_TOKEN)를 켠 경우에만
+    빠진 컬럼은 deferred 로 남아서 접근하면 DB 에서 읽음
+    """
+    keep_password = getattr(api_settings, 'CHECK_REVOKE_TOKEN', False)
+    return [
+        field for field in user._meta.concrete_fields
+        if keep_password or field.attname != 'password'
+    ]
+
+
+def _row(user):
+    return {field.attname: getattr(user, field.attname) for field in _cached_fields(user)}
+
+
+def _from_row(row):
+    # 요청마다 새 인스턴스 - 뷰에서 request.user 를 바꿔도 캐시나 다른 요청에 영향 없음
+    user_model = get_user_model()
+    return user_model.from_db('default', list(row), list(row.values()))
+
+
+def get_cached_user(user_id):
+    """
+    토큰의 user id → User (프로세스 LRU → 공유 Django 캐시 → DB 순), 없으면 None
+    """
+    key = _cache_key(user_id)
+    row = local_users.get(key)
+    if row is None:
+        shared = _shared_cache()
+        row = shared.get(key) if shared is not None else None
+        if row is None:
+            user_model = get_user_model()
+            user = user_model.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+            if user is None:
+                return None
+            row = _row(user)
+            if shared is not None:
+                shared.set(key, row, getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 300))
+        local_users.set(key, row)
+    return _from_row(row)
+
+
+def invalidate_user(user):
+    """
+    비밀번호 변경/탈퇴/관리자 수정(is_staff, is_active 등) 시 signals.py 에서 호출
+    """
+    invalidate_user_ids([getattr(user, api_settings.USER_ID_FIELD)])
+
+
+def invalidate_user_ids(user_ids):
+    """
+    post_save 없이 UPDATE 로 바꾼 사용자들 (last_login 일괄 기록 등)
+    """
+    keys = [_cache_key(user_id) for user_id in user_ids]
+    for key in keys:
+        local_users.delete(key)
+    shared = _shared_cache()
+    if shared is not None and keys:
+        shared.delete_many(keys)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication 과 같지만 매 요청의 User 조회를 캐시에서
+    """
+    def get_user(self, validated_token):
+        if getattr(api_settings, 'CHECK_REVOKE_TOKEN', False):
+            # 토큰의 비밀번호 해시 비교는 simplejwt 구현을 그대로 사용
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        user = get_cached_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        return user
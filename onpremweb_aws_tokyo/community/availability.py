@@ -0,0 +1,190 @@
+# onpremweb_aws/community/availability.py
+import hashlib
+import math
+import threading
+import time
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.models.functions import Lower
+from .local_cache import LocalCache
+
+KEY_PREFIX = 'availability:v1'
+FIELDS = ('username', 'email')
+
+# auth_user 는 contrib 모델이라 Meta.indexes 를 줄 수 없어서 post_migrate 에서 직접 생성
+LOWER_INDEXES = {
+    'username': 'auth_user_username_lower_idx',
+    'email': 'auth_user_email_lower_idx',
+}
+
+
+def normalize(value):
+    return (value or '').strip().lower()
+
+
+class BloomFilter:
+    """
+    "확실히 없음" 만 믿을 수 있는 집합 - 있다고 나오면 (오탐 false_positive_rate) DB 로 확인
+    """
+    def __init__(self, capacity, false_positive_rate=0.01):
+        capacity = max(capacity, 1)
+        self.size = max(int(-capacity * math.log(false_positive_rate) / (math.log(2) ** 2)), 8)
+        self.hash_count = max(int(round(self.size / capacity * math.log(2))), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'big'), int.from_bytes(digest[8:], 'big')
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class TakenIndex:
+    """
+    프로세스당 하나 - 사용 중인 아이디/이메일(소문자)의 Bloom filter
+    - 처음 사용할 때 전체를 읽어서 만들고, rebuild_interval 마다 다시 만듦 (이메일 변경/탈퇴 반영)
+    - 그 사이에는 sync_interval 마다 마지막으로 본 id 이후 가입자만 추가 (다른 워커에서 가입한 사용자)
+    - 이 워커에서 가입/수정한 사용자는 signals.py 에서 바로 추가
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._filters = None
+        self._max_pk = 0
+        self._built_at = 0.0
+        self._synced_at = 0.0
+        self._rebuilding = False
+
+    def rebuild(self):
+        count = User.objects.count()
+        filters = {field: BloomFilter(count * 2 + 1000) for field in FIELDS}
+        max_pk = 0
+        for pk, *values in User.objects.values_list('pk', *FIELDS).order_by().iterator(chunk_size=5000):
+            max_pk = max(max_pk, pk)
+            for field, value in zip(FIELDS, values):
+                if value:
+                    filters[field].add(normalize(value))
+        with self._lock:
+            self._filters = filters
+            self._max_pk = max(self._max_pk, max_pk)
+            self._built_at = self._synced_at = time.monotonic()
+
+    def _rebuild_in_background(self):
+        try:
+            self.rebuild()
+        finally:
+            connection.close()  # 이 스레드 전용 DB 연결 정리
+            with self._lock:
+                self._rebuilding = False
+
+    def sync(self):
+        with self._lock:
+            since = self._max_pk
+            self._synced_at = time.monotonic()
+        for pk, *values in User.objects.filter(pk__gt=since).values_list('pk', *FIELDS).order_by('pk'):
+            self.add(**dict(zip(FIELDS, values)), pk=pk)
+
+    def ensure_ready(self):
+        if self._filters is None:
+            self.rebuild()
+            return
+        now = time.monotonic()
+        if now - self._built_at > getattr(settings, 'AVAILABILITY_REBUILD_INTERVAL', 600):
+            with self._lock:
+                start = not self._rebuilding
+                self._rebuilding = True
+            if start:
+                # 다시 만드는 동안에는 기존 필터로 응답
+                threading.Thread(target=self._rebuild_in_background, name='availability-rebuild', daemon=True).start()
+        if now - self._synced_at > getattr(settings, 'AVAILABILITY_SYNC_INTERVAL', 5):
+            self.sync()
+
+    def add(self, username=None, email=None, pk=None):
+        with self._lock:
+            if self._filters is None:
+                return
+            for field, value in (('username', username), ('email', email)):
+                if value:
+                    self._filters[field].add(normalize(value))
+            if pk is not None:
+                self._max_pk = max(self._max_pk, pk)
+
+    def might_be_taken(self, field, value):
+        return value in self._filters[field]
+
+
+taken_index = TakenIndex()
+
+# 최근 답 (폼 입력마다 같은 값을 다시 묻는 경우) - 사용 가능 답은 곧 바뀔 수 있으므로 더 짧게
+recent_answers = LocalCache(getattr(settings, 'AVAILABILITY_CACHE_SIZE', 10000), 60)
+
+
+def _cache_key(field, value):
+    return f'{KEY_PREFIX}:{field}:{hashlib.md5(value.encode()).hexdigest()}'
+
+
+def _answer_timeout(taken):
+    return getattr(settings, 'AVAILABILITY_TAKEN_TTL' if taken else 'AVAILABILITY_FREE_TTL', 60 if taken else 10)
+
+
+def exists_ignoring_case(field, value):
+    """
+    lower() 인덱스로 DB 를 직접 확인 - 캐시를 거치지 않으므로 가입 검증(RegisterSerializer)에 사용
+    """
+    return User.objects.alias(lowered=Lower(field)).filter(lowered=normalize(value)).exists()
+
+
+def is_taken(field, value):
+    """
+    아이디/이메일 사용 여부 (대소문자 무시) - Bloom filter → 최근 답 캐시 → lower() 인덱스 조회 순
+    """
+    value = normalize(value)
+    if not value:
+        return False
+    taken_index.ensure_ready()
+    if not taken_index.might_be_taken(field, value):
+        return False
+    key = _cache_key(field, value)
+    taken = recent_answers.get(key)
+    if taken is None:
+        taken = cache.get(key)
+    if taken is None:
+        taken = exists_ignoring_case(field, value)
+        cache.set(key, taken, _answer_timeout(taken))
+    recent_answers.set(key, taken, _answer_timeout(taken))
+    return taken
+
+
+def user_changed(user):
+    """
+    (signals.py) 가입/수정/탈퇴 - Bloom filter 에 추가하고 캐시된 답을 지움
+    """
+    taken_index.add(user.username, user.email, user.pk)
+    for field in FIELDS:
+        value = normalize(getattr(user, field))
+        if value:
+            key = _cache_key(field, value)
+            recent_answers.delete(key)
+            cache.delete(key)
+
+
+def create_lower_indexes(using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    post_migrate - auth_user 의 lower(username), lower(email) 함수 인덱스 (이미 있으면 건너뜀)
+    """
+    db = connections[using]
+    if db.vendor not in ('postgresql', 'sqlite'):
+        return
+    qn = db.ops.quote_name
+    with db.cursor() as cursor:
+        for field, name in LOWER_INDEXES.items():
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {qn(name)} ON {qn(User._meta.db_table)} (lower({qn(field)}))'
+            )
@@ -0,0 +1,111 @@
+# onpremweb_aws/community/conditional.py
+import hashlib
+import json
+import time
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import prefetch_related_objects
+from django.http import Http404
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.response import Response
+from .models import Recommend
+
+
+def presign_epoch():
+    """
+    비공개 버킷이면 응답 안의 presigned URL 이 만료되기 전에 ETag 가 바뀌도록 재서명 주기 단위 번호를 섞음
+    """
+    if not getattr(settings, 'AWS_S3_PRESIGNED_GET', False):
+        return ''
+    return str(int(time.time() // max(getattr(settings, 'AWS_S3_PRESIGNED_GET_REFRESH', 900), 1)))
+
+
+class ConditionalGetMixin:
+    """
+    목록/상세 GET 에 ETag(+ Last-Modified) - 직렬화 전에 If-None-Match / If-Modified-Since 를 비교해서 304
+    - 상세: updated_at 한 컬럼만 먼저 조회
+    - 목록: prefetch 없이 현재 페이지 행만 읽어서 (pk, updated_at) + 페이지 정보로 계산, 바뀌었을 때만 prefetch/직렬화
+    updated_at 은 수정/댓글/이미지/좋아요 때마다 갱신됨 (counters.py, likes.py)
+    """
+    liked_validator = False  # 게시글 - recommended_by_me 가 사용자마다 다름
+
+    def _liked_ids(self, ids):
+        user = self.request.user
+        if not self.liked_validator or not user.is_authenticated:
+            return []
+        liked = set(Recommend.objects.filter(user=user, board_id__in=ids).values_list('board_id', flat=True))
+        # 목록 직렬화(BoardListSerializer)에서 같은 조회를 다시 하지 않도록
+        self.recommended_board_ids = liked
+        return sorted(liked)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if getattr(self, 'recommended_board_ids', None) is not None:
+            context['recommended_board_ids'] = self.recommended_board_ids
+        return context
+
+    def _not_modified(self, request, parts, last_modified):
+        etag = '"%s"' % hashlib.md5(json.dumps(parts, default=str).encode()).hexdigest()
+        last_modified = int(last_modified.timestamp()) if last_modified else None
+        if presign_epoch():
+            # 오래된 본문을 If-Modified-Since 로 재사용하면 서명이 만료될 수 있으므로 ETag 만 사용
+            last_modified = None
+        self._validators = (etag, last_modified)
+        return get_conditional_response(request._request, etag=etag, last_modified=last_modified)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validators = getattr(self, '_validators', None)
+        if validators and response.status_code in (200, 304):
+            etag, last_modified = validators
+            response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified)
+            # 사용자마다 다른 응답 (recommended_by_me, ?my=) - 공유 캐시에는 저장하지 않고 매번 재검증
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ['Authorization'])
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            updated_at = (
+                self.filter_queryset(self.get_queryset()).order_by()
+                .filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+                .values_list('updated_at', flat=True).first()
+            )
+        except (TypeError, ValueError, ValidationError):
+            # 숫자가 아닌 pk 등 - get_object_or_404 와 같이 404
+            raise Http404
+        if updated_at is not None:
+            pk = kwargs[lookup_url_kwarg]
+            parts = [self.basename, pk, updated_at, self._liked_ids([pk]), request.get_full_path(), presign_epoch()]
+            not_modified = self._not_modified(request, parts, updated_at)
+            if not_modified is not None:
+                return not_modified
+        return super().retrieve(request, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookups = queryset._prefetch_related_lookups
+        queryset = queryset.prefetch_related(None)
+        page = self.paginate_queryset(queryset)
+        rows = list(page if page is not None else queryset)
+
+        ids = [row.pk for row in rows]
+        meta = self.get_paginated_response([]).data if page is not None else None
+        parts = [
+            self.basename, [(row.pk, row.updated_at) for row in rows], meta,
+            self._liked_ids(ids), request.get_full_path(), presign_epoch(),
+        ]
+        last_modified = max((row.updated_at for row in rows), default=None)
+        not_modified = self._not_modified(request, parts, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        prefetch_related_objects(rows, *lookups)
+        serializer = self.get_serializer(rows, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
@@ -0,0 +1,94 @@
+# onpremweb_aws/community/deletion_queue.py
+import hashlib
+from datetime import timedelta
+from django.db import transaction
+from django.db.models.functions import MD5
+from django.utils import timezone
+from . import storage
+from .derivatives import original_key
+from .models import Analysis, BoardImage, FeedbackImage, NoticeImage, StorageDeletion
+
+LEASE = timedelta(minutes=5)  # 워커가 처리 중인 행을 다른 워커가 다시 가져가지 않도록 미뤄두는 시간
+MAX_BACKOFF = timedelta(hours=6)
+ANALYSIS_IMAGE_FIELDS = ['original_img', 'scratch_img', 'crushed_img', 'natural_img']
+
+
+def referenced_urls(urls):
+    """
+    urls 중 이미지 행/분석 결과가 참조하는 것 (모델/필드당 인덱스를 타는 IN 쿼리 1번)
+    이미지 행은 md5(image) 식 인덱스로 찾은 뒤 원래 값으로 다시 비교
+    """
+    urls = list(urls)
+    hashes = [hashlib.md5(url.encode()).hexdigest() for url in urls]
+    referenced = set()
+    for model in (BoardImage, FeedbackImage, NoticeImage):
+        referenced.update(
+            model.objects.alias(image_md5=MD5('image')).filter(image_md5__in=hashes, image__in=urls)
+            .values_list('image', flat=True)
+        )
+    for field in ANALYSIS_IMAGE_FIELDS:
+        referenced.update(Analysis.objects.filter(**{f'{field}__in': urls}).values_list(field, flat=True))
+    return referenced
+
+
+def unreferenced_keys(keys):
+    """
+    keys 중 아무 데서도 참조하지 않는 것 - 파생 이미지(썸네일/WebP)는 원본이 참조되고 있는지로 판단
+    """
+    sources = {key: original_key(key) or key for key in keys}
+    referenced = referenced_urls([storage.public_url(source) for source in set(sources.values())])
+    return [key for key, source in sources.items() if storage.public_url(source) not in referenced]
+
+
+def enqueue_url(url):
+    """
+    이미지 행 삭제와 같은 트랜잭션에서 호출 - 우리 버킷 URL 이면 삭제 대기열에 추가
+    """
+    key = storage.key_from_url(url)
+    if key:
+        StorageDeletion.objects.create(key=key)
+
+
+def _backoff(attempts):
+    return min(timedelta(seconds=30 * 2 ** (attempts - 1)), MAX_BACKOFF)
+
+
+def _claim(batch_size):
+    """
+    처리할 행을 잠깐 잠가 가져오면서 next_attempt_at 을 LEASE 만큼 미룸 (S3 호출 중엔 트랜잭션을 잡지 않음)
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            StorageDeletion.objects.select_for_update(skip_locked=True)
+            .filter(next_attempt_at__lte=now).order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        StorageDeletion.objects.filter(pk__in=[row.pk for row in rows]).update(next_attempt_at=now + LEASE)
+    return rows
+
+
+def drain_deletions(batch_size=storage.DELETE_OBJECTS_LIMIT):
+    """
+    대기열에서 batch_size 개를 꺼내 DeleteObjects 로 삭제 후 (처리한 수, 실패한 수) 반환
+    같은 URL 을 다른 이미지 행/분석 결과가 아직 참조하면 S3 에서 지우지 않고 대기열에서만 뺌
+    실패한 key 는 지수 백오프로 다음 시도 시각을 미룸
+    """
+    rows = _claim(batch_size)
+    if not rows:
+        return 0, 0
+    keys = sorted(unreferenced_keys({row.key for row in rows}))
+    try:
+        failed = storage.delete_objects(keys) if keys else {}
+    except Exception as e:
+        failed = {key: str(e) for key in keys}
+
+    now = timezone.now()
+    retry = [row for row in rows if row.key in failed]
+    for row in retry:
+        row.attempts += 1
+        row.next_attempt_at = now + _backoff(row.attempts)
+        row.last_error = failed[row.key][:1000]
+    with transaction.atomic():
+        StorageDeletion.objects.filter(pk__in=[row.pk for row in rows if row.key not in failed]).delete()
+        StorageDeletion.objects.bulk_update(retry, ['attempts', 'next_attempt_at', 'last_error'])
+    return len(rows), len(retry)
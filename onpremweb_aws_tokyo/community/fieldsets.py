@@ -0,0 +1,49 @@
+# onpremweb_aws/community/fieldsets.py
+from rest_framework.permissions import SAFE_METHODS
+
+# 목록에서 기본으로 빠지거나 축약되는 무거운 필드 (?expand= 로 포함)
+EXPANDABLE_FIELDS = ('replies', 'images')
+
+
+def query_names(request, param):
+    """
+    ?fields=id,title / ?expand=replies,images → 이름 집합
+    """
+    value = request.query_params.get(param, '') if request is not None else ''
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def _reading(request):
+    return request is not None and request.method in SAFE_METHODS
+
+
+def expanded(request, action, name):
+    """
+    목록이 아니면 항상 전체, 목록이면 ?expand= 에 있을 때만 전체 (댓글 트리 / 모든 이미지)
+    """
+    if action != 'list' or not _reading(request):
+        return True
+    return name in query_names(request, 'expand')
+
+
+def selected_fields(request, action, summary_fields):
+    """
+    응답에 남길 필드 이름 집합 (None 이면 전부)
+    - ?fields= 가 있으면 그 필드만 (목록/상세 공통)
+    - 없으면 목록은 요약 필드만
+    ?expand= 에 있는 필드는 항상 포함, 쓰기 요청(POST/PUT/PATCH)의 응답은 건드리지 않음
+    """
+    if not _reading(request):
+        return None
+    expand = query_names(request, 'expand') & set(EXPANDABLE_FIELDS)
+    fields = query_names(request, 'fields')
+    if fields:
+        return fields | expand
+    if action == 'list':
+        return set(summary_fields) | expand
+    return None
+
+
+def includes(request, action, summary_fields, name):
+    selected = selected_fields(request, action, summary_fields)
+    return selected is None or name in selected
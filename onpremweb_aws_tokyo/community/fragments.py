@@ -0,0 +1,90 @@
+# onpremweb_aws/community/fragments.py
+import hashlib
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import prefetch_related_objects
+from . import counters
+from .local_cache import LocalCache
+from .models import Board
+
+KEY_PREFIX = 'board-fragment:v1'
+
+# 사용자마다 달라지는 필드 - 캐시에는 자리만 두고 요청마다 덮어씀
+USER_FIELDS = ('recommended_by_me',)
+
+
+def enabled():
+    return getattr(settings, 'BOARD_FRAGMENT_CACHE', True)
+
+
+def timeout():
+    """
+    비공개 버킷이면 조각 안의 presigned URL 이 만료되기 전에 조각이 먼저 만료되도록 재서명 주기의 절반 이하로
+    """
+    seconds = getattr(settings, 'BOARD_FRAGMENT_CACHE_TIMEOUT', 300)
+    if getattr(settings, 'AWS_S3_PRESIGNED_GET', False):
+        seconds = min(seconds, getattr(settings, 'AWS_S3_PRESIGNED_GET_REFRESH', 900) // 2)
+    return seconds
+
+
+local_fragments = LocalCache(getattr(settings, 'BOARD_FRAGMENT_LOCAL_SIZE', 2000), timeout())
+
+
+def bump(board_id):
+    """
+    게시글 수정/댓글/이미지/좋아요 - version 이 바뀌면 이전 조각 key 는 더 이상 조회되지 않음 (TTL 로 소멸)
+    """
+    counters.mark_changed(Board, board_id)
+
+
+def variant(serializer):
+    """
+    같은 게시글이라도 ?fields= / ?expand= 에 따라 모양이 다르므로 필드 구성별로 따로 저장
+    """
+    shape = ','.join(f'{name}:{type(field).__name__}' for name, field in serializer.fields.items())
+    return hashlib.md5(shape.encode()).hexdigest()[:12]
+
+
+def fragment_key(board, shape):
+    return f'{KEY_PREFIX}:{board.pk}:{board.version}:{shape}'
+
+
+def get_many(keys):
+    found = local_fragments.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        shared = cache.get_many(missing)
+        local_fragments.set_many(shared)
+        found.update(shared)
+    return found
+
+
+def set_many(values):
+    local_fragments.set_many(values)
+    cache.set_many(values, timeout())
+
+
+def render_boards(serializer, boards, prefetches):
+    """
+    게시글 목록 직렬화 - 캐시에 없는 게시글만 prefetch + 직렬화하고, recommended_by_me 는 요청마다 덮어씀
+    serializer: 게시글 하나를 직렬화하는 (ListSerializer 의 child) 시리얼라이저
+    """
+    shape = variant(serializer)
+    keys = {board.pk: fragment_key(board, shape) for board in boards}
+    found = get_many(list(keys.values()))
+    misses = [board for board in boards if keys[board.pk] not in found]
+    if misses:
+        prefetch_related_objects(misses, *prefetches)
+        fresh = {keys[board.pk]: serializer.to_representation(board) for board in misses}
+        set_many(fresh)
+        found.update(fresh)
+
+    recommended_ids = serializer.context.get('recommended_board_ids') or set()
+    overlay = [name for name in USER_FIELDS if name in serializer.fields]
+    results = []
+    for board in boards:
+        data = dict(found[keys[board.pk]])
+        if overlay:
+            data['recommended_by_me'] = board.pk in recommended_ids
+        results.append(data)
+    return results
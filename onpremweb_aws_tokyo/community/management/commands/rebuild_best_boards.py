@@ -0,0 +1,23 @@
+# onpremweb_aws/community/management/commands/rebuild_best_boards.py
+from django.core.management.base import BaseCommand
+from community.models import BestBoard
+from community.ranking import rebuild_best_boards, rebuild_trending_boards
+
+
+class Command(BaseCommand):
+    help = '베스트 게시판 랭킹(추천순/급상승)을 다시 계산해서 BestBoard 테이블에 저장 (cron 으로 주기 실행)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--ranking', choices=[BestBoard.RANKING_BEST, BestBoard.RANKING_TRENDING, 'all'], default='all'
+        )
+        parser.add_argument('--size', type=int, default=None, help='랭킹에 저장할 게시글 수 (기본 BEST_BOARD_SIZE)')
+
+    def handle(self, *args, **options):
+        ranking, size = options['ranking'], options['size']
+        if ranking in (BestBoard.RANKING_BEST, 'all'):
+            count = rebuild_best_boards(size)
+            self.stdout.write(self.style.SUCCESS(f'추천순 랭킹 {count}건 갱신'))
+        if ranking in (BestBoard.RANKING_TRENDING, 'all'):
+            count = rebuild_trending_boards(size)
+            self.stdout.write(self.style.SUCCESS(f'급상승 랭킹 {count}건 갱신'))
@@ -0,0 +1,41 @@
+# onpremweb_aws/community/management/commands/reconcile_recommend_counts.py
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from community import counters
+from community.models import Board, Recommend
+
+
+class Command(BaseCommand):
+    help = 'Board.recommend_count 를 실제 Recommend 행 수와 맞춤 (어긋난 게시글만 일괄 UPDATE)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help='수정하지 않고 어긋난 건수만 출력')
+
+    def handle(self, *args, **options):
+        actual_count = Coalesce(
+            Subquery(
+                Recommend.objects.filter(board=OuterRef('pk'))
+                .order_by().values('board').annotate(c=Count('pk')).values('c')
+            ),
+            0,
+        )
+        drifted_ids = list(
+            Board.objects.alias(actual=actual_count)
+            .exclude(recommend_count=F('actual'))
+            .values_list('pk', flat=True)
+        )
+        if options['dry_run']:
+            self.stdout.write(f'추천수가 어긋난 게시글: {len(drifted_ids)}건')
+            return
+
+        batch_size = options['batch_size']
+        fixed = 0
+        for start in range(0, len(drifted_ids), batch_size):
+            batch = drifted_ids[start:start + batch_size]
+            # version(목록 조각 캐시)과 updated_at(ETag)도 같은 UPDATE 에서 갱신
+            fixed += Board.objects.filter(pk__in=batch).update(
+                recommend_count=actual_count, **counters.changed_values(Board)
+            )
+        self.stdout.write(self.style.SUCCESS(f'추천수 보정 완료: {fixed}건'))
@@ -0,0 +1,88 @@
+# onpremweb_aws/community/management/commands/repair_activity_counters.py
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from community import counters
+from community.models import (
+    Board, BoardImage, Feedback, FeedbackImage, FeedbackReply, Notice, NoticeImage, NoticeReply, Reply,
+)
+
+# 부모 모델 → (생성일 필드, 댓글 모델, 이미지 모델, 부모 FK 이름)
+TARGETS = [
+    (Board, 'post_date', Reply, BoardImage, 'board'),
+    (Feedback, 'created_at', FeedbackReply, FeedbackImage, 'feedback'),
+    (Notice, 'created_at', NoticeReply, NoticeImage, 'notice'),
+]
+
+
+def child_count(model, owner_field):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(**{owner_field: OuterRef('pk')})
+            .order_by().values(owner_field).annotate(c=Count('pk')).values('c')
+        ),
+        0,
+    )
+
+
+def latest_reply(model, owner_field):
+    return Subquery(
+        model.objects.filter(**{owner_field: OuterRef('pk')})
+        .order_by().values(owner_field).annotate(m=Max('created_at')).values('m')
+    )
+
+
+class Command(BaseCommand):
+    help = '게시글/피드백/공지의 reply_count/image_count/last_activity_at 을 실제 댓글/이미지와 맞춤 (어긋난 행만 일괄 UPDATE)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help='수정하지 않고 어긋난 건수만 출력')
+        parser.add_argument(
+            '--recompute-activity', action='store_true',
+            help='last_activity_at 을 작성일/마지막 댓글 기준으로 다시 계산 (필드 추가 직후 1회, 이미지 첨부 시각은 사라짐)',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        recompute = options['recompute_activity']
+        for owner_model, created_field, reply_model, image_model, owner_field in TARGETS:
+            # 이미지에는 생성 시각이 없으므로 last_activity_at 은 작성일/마지막 댓글 기준으로만 당겨옴
+            values = {
+                'reply_count': child_count(reply_model, owner_field),
+                'image_count': child_count(image_model, owner_field),
+                'last_activity_at': Greatest(
+                    F(created_field), Coalesce(latest_reply(reply_model, owner_field), F(created_field))
+                ),
+            }
+            drifted_ids = list(
+                owner_model.objects.alias(**{f'actual_{name}': value for name, value in values.items()})
+                .filter(
+                    ~Q(reply_count=F('actual_reply_count'))
+                    | ~Q(image_count=F('actual_image_count'))
+                    | (
+                        ~Q(last_activity_at=F('actual_last_activity_at')) if recompute
+                        else Q(last_activity_at__lt=F('actual_last_activity_at'))
+                    )
+                )
+                .values_list('pk', flat=True)
+            )
+            name = owner_model._meta.model_name
+            if options['dry_run']:
+                self.stdout.write(f'{name}: 카운터가 어긋난 행 {len(drifted_ids)}건')
+                continue
+
+            fixed = 0
+            for start in range(0, len(drifted_ids), batch_size):
+                batch = drifted_ids[start:start + batch_size]
+                fixed += owner_model.objects.filter(pk__in=batch).update(
+                    reply_count=values['reply_count'],
+                    image_count=values['image_count'],
+                    last_activity_at=(
+                        values['last_activity_at'] if recompute
+                        else Greatest(F('last_activity_at'), values['last_activity_at'])
+                    ),
+                    # 목록 조각 캐시(version)와 ETag(updated_at)도 무효화
+                    **counters.changed_values(owner_model),
+                )
+            self.stdout.write(self.style.SUCCESS(f'{name}: 카운터 보정 완료 {fixed}건'))
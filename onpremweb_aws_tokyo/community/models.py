@@ -1,7 +1,59 @@
 # onpremweb_aws/community/models.py
 from django.conf import settings
 from django.db import models
+from django.db.models.functions import MD5
+from django.utils import timezone
 from django.contrib.auth.models import User
+from . import search
+
+
+class SearchableMixin(models.Model):
+    """
+    제목/본문/작성자로 만든 검색 문서(search_document)를 저장 시마다 갱신
+    Postgres GIN 인덱스는 search.create_search_indexes (post_migrate) 에서 생성
+    """
+    search_document = models.TextField(blank=True, default='', editable=False)
+    search_author_field = 'author'
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'title', 'content'} & set(update_fields):
+            author = getattr(self, self.search_author_field)
+            self.search_document = search.build_search_document(self.title, self.content, author.username)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'search_document'}
+        super().save(*args, **kwargs)
+        search.index_saved(self)
+
+    def delete(self, *args, **kwargs):
+        search.index_deleted(self)
+        return super().delete(*args, **kwargs)
+
+class ActivityCountersMixin(models.Model):
+    """
+    댓글 수/이미지 수/마지막 활동 시각 - counters.py 의 시그널이 F() UPDATE 로만 갱신
+    기존 행을 save() 할 때는 이 필드들을 빼고 저장해서 (오래 전에 읽은 값으로) 덮어쓰지 않음
+    updated_at 은 응답 내용이 바뀌는 모든 경우(수정/댓글/이미지/좋아요)에 갱신 - ETag/Last-Modified 계산용
+    """
+    reply_count = models.PositiveIntegerField(default=0, editable=False)
+    image_count = models.PositiveIntegerField(default=0, editable=False)
+    last_activity_at = models.DateTimeField(default=timezone.now, editable=False)
+    updated_at = models.DateTimeField(default=timezone.now, editable=False)
+    maintained_fields = ('reply_count', 'image_count', 'last_activity_at', 'updated_at')
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.maintained_fields
+            ]
+        super().save(*args, **kwargs)
 
 class Notification(models.Model):
     NOTIFY_COMMENT = 'comment'
@@ -24,6 +76,30 @@ class Notification(models.Model):
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # 키셋 페이지네이션용 (to_user, created_at, id)
+            models.Index(fields=['to_user', '-created_at', '-id'], name='notif_user_created_id_idx'),
+            # 안읽은 알림 수(배지) 조회용 부분 인덱스 - 읽은 알림은 인덱스에 들어가지 않음
+            models.Index(fields=['to_user'], condition=models.Q(is_read=False), name='notif_unread_user_idx'),
+        ]
+
+class NotificationOutbox(models.Model):
+    """
+    댓글 작성과 같은 트랜잭션에 쌓는 알림 이벤트 (drain_notification_outbox 워커가 Notification 으로 변환)
+    """
+    EVENT_REPLY = 'reply'
+    EVENT_FEEDBACK_REPLY = 'feedback_reply'
+    EVENT_NOTICE_REPLY = 'notice_reply'
+    EVENT_CHOICES = [
+        (EVENT_REPLY, '게시글 댓글'),
+        (EVENT_FEEDBACK_REPLY, '피드백 댓글'),
+        (EVENT_NOTICE_REPLY, '공지 댓글'),
+    ]
+    event_type = models.CharField(max_length=20, choices=EVENT_CHOICES)
+    object_id = models.BigIntegerField()  # 작성된 댓글 id
+    created_at = models.DateTimeField(auto_now_add=True)
+
 class Analysis(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -36,11 +112,25 @@ class Analysis(models.Model):
     natural_img = models.CharField(max_length=255)
     analyze_date = models.DateField()
     analyze_datetime = models.DateTimeField()
+    # 이미지 필드명 → 썸네일/WebP 정보 (build_image_derivatives)
+    image_derivatives = models.JSONField(null=True, blank=True, editable=False)
+    image_derivative_attempts = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    IMAGE_FIELDS = ['original_img', 'scratch_img', 'crushed_img', 'natural_img']
+
+    class Meta:
+        # 삭제 대기열/고아 파일 GC 의 URL 조회용 (deletion_queue.referenced_urls)
+        indexes = [
+            models.Index(fields=['original_img'], name='analysis_original_img_idx'),
+            models.Index(fields=['scratch_img'], name='analysis_scratch_img_idx'),
+            models.Index(fields=['crushed_img'], name='analysis_crushed_img_idx'),
+            models.Index(fields=['natural_img'], name='analysis_natural_img_idx'),
+        ]
 
     def __str__(self):
         return f"Analysis {self.id} by {self.user}"
 
-class Board(models.Model):
+class Board(SearchableMixin, ActivityCountersMixin):
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE
@@ -50,6 +140,19 @@ class Board(models.Model):
     cost = models.CharField(max_length=255, blank=True, null=True)  
     recommend_count = models.IntegerField(default=0)
     post_date = models.DateTimeField(auto_now_add=True)
+    # 목록 조각 캐시(fragments.py) 무효화용 - 수정/댓글/이미지/좋아요 때마다 F() 로 +1
+    version = models.PositiveIntegerField(default=1, editable=False)
+    # 추천수도 like_board/unlike_board 의 F() UPDATE 로만 갱신
+    maintained_fields = ActivityCountersMixin.maintained_fields + ('recommend_count', 'version')
+
+    class Meta:
+        indexes = [
+            # 키셋 페이지네이션용 복합 키 (최신순 / 추천순 / 최근 활동순 / 댓글순)
+            models.Index(fields=['-post_date', '-id'], name='board_post_date_id_idx'),
+            models.Index(fields=['-recommend_count', '-id'], name='board_recommend_id_idx'),
+            models.Index(fields=['-last_activity_at', '-id'], name='board_activity_id_idx'),
+            models.Index(fields=['-reply_count', '-id'], name='board_reply_count_id_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -58,6 +161,12 @@ class BoardImage(models.Model):
     board = models.ForeignKey(Board, related_name='images', on_delete=models.CASCADE)
     image = models.CharField(max_length=2048)  # presigned URL 저장용
     uploaded_at = models.DateTimeField(auto_now_add=True)
+    derivatives = models.JSONField(null=True, blank=True, editable=False)  # 썸네일/WebP (build_image_derivatives)
+    derivative_attempts = models.PositiveSmallIntegerField(default=0, editable=False)  # 파생 이미지 일시적 실패 횟수
+
+    class Meta:
+        # 삭제 대기열/고아 파일 GC 의 URL 조회용 (deletion_queue.referenced_urls) - 2048자 btree 키 대신 md5 식 인덱스
+        indexes = [models.Index(MD5('image'), name='boardimage_image_md5_idx')]
 
 class Recommend(models.Model):
     board = models.ForeignKey(Board, on_delete=models.CASCADE)
@@ -66,16 +175,29 @@ class Recommend(models.Model):
     class Meta:
         unique_together = ('board', 'user')  # 유저는 같은 글 좋아요 한 번만!
 
-class Feedback(models.Model):
+class Feedback(SearchableMixin, ActivityCountersMixin):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='feedbacks')
+    search_author_field = 'user'
     title = models.CharField(max_length=200)
     content = models.TextField()      
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='feedback_created_id_idx'),
+            models.Index(fields=['-last_activity_at', '-id'], name='feedback_activity_id_idx'),
+            models.Index(fields=['-reply_count', '-id'], name='feedback_reply_count_id_idx'),
+        ]
+
 class FeedbackImage(models.Model):
     feedback = models.ForeignKey(Feedback, related_name='images', on_delete=models.CASCADE)
     image = models.CharField(max_length=2048)  # presigned url로 저장
     uploaded_at = models.DateTimeField(auto_now_add=True)
+    derivatives = models.JSONField(null=True, blank=True, editable=False)
+    derivative_attempts = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [models.Index(MD5('image'), name='feedbackimage_image_md5_idx')]  # BoardImage 와 같음
 
 class FeedbackReply(models.Model):
     feedback = models.ForeignKey(Feedback, on_delete=models.CASCADE, related_name='replies')
@@ -89,22 +211,53 @@ class FeedbackReply(models.Model):
 
 
 class BestBoard(models.Model):
+    """
+    베스트 게시판 랭킹 (rebuild_best_boards 명령 + 좋아요 시 증분 갱신)
+    """
+    RANKING_BEST = 'best'
+    RANKING_TRENDING = 'trending'
+    RANKING_CHOICES = [
+        (RANKING_BEST, '추천순'),
+        (RANKING_TRENDING, '급상승'),
+    ]
     board = models.ForeignKey(Board, on_delete=models.CASCADE)
+    ranking = models.CharField(max_length=10, choices=RANKING_CHOICES, default=RANKING_BEST)
+    rank = models.PositiveIntegerField(default=0)
+    score = models.FloatField(default=0)
     update_date = models.DateTimeField(auto_now=True)
 
-class Notice(models.Model):
+    class Meta:
+        unique_together = ('ranking', 'board')
+        indexes = [
+            models.Index(fields=['ranking', 'rank'], name='bestboard_ranking_rank_idx'),
+        ]
+
+class Notice(SearchableMixin, ActivityCountersMixin):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE
     )
+    search_author_field = 'user'
     title = models.CharField(max_length=200)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='notice_created_id_idx'),
+            models.Index(fields=['-last_activity_at', '-id'], name='notice_activity_id_idx'),
+            models.Index(fields=['-reply_count', '-id'], name='notice_reply_count_id_idx'),
+        ]
+
 class NoticeImage(models.Model):
     notice = models.ForeignKey(Notice, related_name='images', on_delete=models.CASCADE)
     image = models.CharField(max_length=2048)  # presigned url로 저장
     uploaded_at = models.DateTimeField(auto_now_add=True)
+    derivatives = models.JSONField(null=True, blank=True, editable=False)
+    derivative_attempts = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [models.Index(MD5('image'), name='noticeimage_image_md5_idx')]  # BoardImage 와 같음
 
 class NoticeReply(models.Model):
     notice = models.ForeignKey('Notice', related_name='replies', on_delete=models.CASCADE)
@@ -140,3 +293,32 @@ class ErrorLog(models.Model):
     message = models.TextField()
     timestamp = models.DateTimeField(auto_now_add=True)
     
+
+class StorageDeletion(models.Model):
+    """
+    S3 에서 지울 key 대기열 - 이미지 행이 지워지는 트랜잭션 안에서 쌓고 drain_storage_deletions 가 일괄 삭제
+    """
+    key = models.CharField(max_length=1024)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['next_attempt_at', 'id'], name='storage_deletion_due_idx'),
+        ]
+
+class PendingUpload(models.Model):
+    """
+    presigned URL 을 발급했지만 아직 이미지 행으로 연결되지 않은 key (gc_orphan_uploads 가 만료 후 정리)
+    """
+    key = models.CharField(max_length=1024, unique=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['expires_at'], name='pending_upload_expires_idx'),
+        ]
@@ -0,0 +1,177 @@
+# onpremweb_aws/community/notification_stream.py
+import os
+import secrets
+import select
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db import connection, connections
+from .models import Notification
+
+CHANNEL = 'community_notification'
+TICKET_SALT = 'community.notification_stream.ticket'
+_PAYLOAD_LIMIT = 7000  # pg_notify payload 최대 8000 bytes
+
+
+def _is_postgres():
+    return connection.vendor == 'postgresql'
+
+
+class NotificationBroker:
+    """
+    프로세스당 하나 - 알림이 생긴 사용자 id 를 구독 중인 SSE 연결에게 전달
+    Postgres 면 백그라운드 스레드가 LISTEN 으로 다른 프로세스(outbox 워커)의 NOTIFY 를 받고,
+    아니면(또는 LISTEN 연결이 끊겼으면) 구독자가 poll_interval 마다 DB 를 직접 확인
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)  # user_id → {callback}
+        self._pid = None
+        self._thread = None
+        self.listening = False
+
+    @contextmanager
+    def subscribed(self, user_id, callback):
+        self._ensure_listener()
+        with self._lock:
+            self._subscribers[user_id].add(callback)
+        try:
+            yield
+        finally:
+            with self._lock:
+                callbacks = self._subscribers.get(user_id)
+                if callbacks is not None:
+                    callbacks.discard(callback)
+                    if not callbacks:
+                        del self._subscribers[user_id]
+
+    def deliver(self, user_ids):
+        with self._lock:
+            callbacks = [cb for user_id in user_ids for cb in self._subscribers.get(user_id, ())]
+        for callback in callbacks:
+            callback()
+
+    def _ensure_listener(self):
+        if not _is_postgres():
+            return
+        with self._lock:
+            # gunicorn 워커 fork 이후엔 부모의 스레드가 없으므로 pid 로 확인
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self.listening = False
+            self._thread = threading.Thread(target=self._listen_forever, name='notification-listener', daemon=True)
+            self._thread.start()
+
+    def _listen_forever(self):
+        import psycopg2
+
+        backoff = 1
+        params = connections['default'].get_connection_params()
+        while True:
+            conn = None
+            try:
+                conn = psycopg2.connect(**params)
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f'LISTEN {CHANNEL}')
+                self.listening = True
+                backoff = 1
+                while True:
+                    if select.select([conn], [], [], 30) == ([], [], []):
+                        continue
+                    conn.poll()
+                    user_ids = set()
+                    while conn.notifies:
+                        payload = conn.notifies.pop(0).payload
+                        user_ids.update(int(user_id) for user_id in payload.split(',') if user_id)
+                    self.deliver(user_ids)
+            except Exception:
+                # 끊긴 동안은 구독자들이 DB 폴링으로 동작 (대기 중인 구독자도 깨워서 폴링으로 전환), 점점 길게 재접속 시도
+                self.listening = False
+                with self._lock:
+                    user_ids = list(self._subscribers)
+                self.deliver(user_ids)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 60)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+
+broker = NotificationBroker()
+
+
+def publish(user_ids):
+    """
+    새 알림이 생긴 사용자들을 알림 (Postgres: pg_notify 로 모든 프로세스에, 그 외: 같은 프로세스에만)
+    """
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return
+    if not _is_postgres():
+        broker.deliver(user_ids)
+        return
+    payloads, current = [], ''
+    for user_id in map(str, user_ids):
+        if current and len(current) + len(user_id) + 1 > _PAYLOAD_LIMIT:
+            payloads.append(current)
+            current = ''
+        current = f'{current},{user_id}' if current else user_id
+    payloads.append(current)
+    with connection.cursor() as cursor:
+        for payload in payloads:
+            cursor.execute('SELECT pg_notify(%s, %s)', [CHANNEL, payload])
+
+
+def poll_interval():
+    """
+    LISTEN 을 못 쓰는 동안 구독자가 DB 를 다시 확인하는 간격(초)
+    """
+    return getattr(settings, 'NOTIFICATION_POLL_INTERVAL', 5)
+
+
+def longpoll_timeout():
+    return getattr(settings, 'NOTIFICATION_LONGPOLL_TIMEOUT', 25)
+
+
+def stream_ticket_ttl():
+    return getattr(settings, 'NOTIFICATION_STREAM_TICKET_TTL', 30)
+
+
+def issue_stream_ticket(user_id):
+    """
+    SSE 연결용 일회용 ticket - EventSource 는 헤더를 못 붙여서 URL 에 들어가므로 JWT 대신 사용
+    (access log 에 남아도 stream_ticket_ttl 초 뒤엔 쓸 수 없음)
+    """
+    return signing.dumps({'user': user_id, 'nonce': secrets.token_urlsafe(12)}, salt=TICKET_SALT)
+
+
+def redeem_stream_ticket(ticket):
+    """
+    ticket → user_id (만료/위조/이미 사용한 ticket 이면 None)
+    한 번만 사용 - 공유 캐시(CACHES)가 있으면 모든 워커에서, 없으면(LocMem) 같은 워커 안에서만 보장
+    """
+    ttl = stream_ticket_ttl()
+    try:
+        payload = signing.loads(ticket, salt=TICKET_SALT, max_age=ttl)
+    except signing.BadSignature:
+        return None
+    if not cache.add(f'notification-ticket:{payload["nonce"]}', 1, ttl + 1):
+        return None
+    return payload['user']
+
+
+def new_notifications(user_id, since_id, limit=50):
+    return Notification.objects.filter(to_user_id=user_id, pk__gt=since_id).select_related(
+        'board', 'reply'
+    ).order_by('pk')[:limit]
+
+
+def latest_notification_id(user_id):
+    return Notification.objects.filter(to_user_id=user_id).order_by('-pk').values_list('pk', flat=True).first() or 0
+
@@ -0,0 +1,152 @@
+# onpremweb_aws/community/password_pool.py
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+
+_pool_lock = threading.Lock()
+_pool = None
+_pool_pid = None
+
+
+class PoolSaturated(Exception):
+    """
+    대기열이 꽉 참 - 호출한 뷰가 429 + Retry-After 로 응답
+    """
+    def __init__(self, retry_after):
+        super().__init__('password hashing pool saturated')
+        self.retry_after = retry_after
+
+
+def _init_worker():
+    # spawn 으로 뜬 자식 프로세스 - PASSWORD_HASHERS 등 설정을 읽을 수 있도록
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'onprem_project_config.settings')
+    import django
+    django.setup()
+
+
+def _verify(password, encoded):
+    """
+    (프로세스 풀에서 실행) → (일치 여부, 해시 알고리즘/반복 횟수 갱신 필요 여부)
+    """
+    from django.contrib.auth.hashers import check_password, identify_hasher
+    if not check_password(password, encoded):
+        return False, False
+    return True, identify_hasher(encoded).must_update(encoded)
+
+
+def _make(password):
+    from django.contrib.auth.hashers import make_password
+    return make_password(password)
+
+
+class PoolMetrics:
+    """
+    이 워커 프로세스의 해시 풀 상태 (/api/auth-metrics/)
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+
+    def acquire(self, limit):
+        with self._lock:
+            if self.in_flight >= limit:
+                self.rejected += 1
+                return False
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            return True
+
+    def release(self, seconds):
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+            self.total_seconds += seconds
+
+    def snapshot(self):
+        workers = pool_size()
+        with self._lock:
+            return {
+                'workers': workers,
+                'max_queue': max_queue(),
+                'in_flight': self.in_flight,
+                'queue_depth': max(self.in_flight - workers, 0),
+                'peak_in_flight': self.peak_in_flight,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'avg_ms': round(self.total_seconds * 1000 / self.completed, 1) if self.completed else None,
+            }
+
+
+metrics = PoolMetrics()
+
+
+def pool_size():
+    return getattr(settings, 'AUTH_HASH_WORKERS', 2)
+
+
+def max_queue():
+    return getattr(settings, 'AUTH_HASH_MAX_QUEUE', 8)
+
+
+def get_pool():
+    """
+    프로세스당 하나의 프로세스 풀 (fork 된 gunicorn 워커에서는 새로 생성)
+    스레드가 도는 프로세스에서 fork 하지 않도록 spawn 사용
+    """
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ProcessPoolExecutor(
+                max_workers=pool_size(),
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+            )
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def _discard_pool(broken):
+    """
+    자식 프로세스가 죽으면(OOM kill 등) 풀 전체가 BrokenProcessPool 로 멈추므로 버리고 다음 호출에서 새로 생성
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False)
+
+
+async def _run(fn, *args):
+    """
+    워커 수 + 대기열 길이를 넘으면 기다리지 않고 바로 PoolSaturated
+    풀이 깨져 있으면 새 풀로 한 번 재시도 (해시/검증은 부작용이 없어서 다시 실행해도 됨)
+    """
+    if not metrics.acquire(pool_size() + max_queue()):
+        raise PoolSaturated(getattr(settings, 'AUTH_HASH_RETRY_AFTER', 2))
+    started = time.monotonic()
+    try:
+        pool = get_pool()
+        try:
+            return await asyncio.wrap_future(pool.submit(fn, *args))
+        except BrokenProcessPool:
+            _discard_pool(pool)
+            return await asyncio.wrap_future(get_pool().submit(fn, *args))
+    finally:
+        metrics.release(time.monotonic() - started)
+
+
+async def verify_password(password, encoded):
+    return await _run(_verify, password, encoded)
+
+
+async def make_password(password):
+    return await _run(_make, password)
@@ -0,0 +1,149 @@
+# onpremweb_aws/community/ranking.py
+import heapq
+import logging
+import math
+from collections import defaultdict
+from datetime import timedelta
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+from .models import BestBoard, Board, Recommend
+
+logger = logging.getLogger(__name__)
+
+# pg_advisory_xact_lock 키 (랭킹 종류별)
+_LOCK_KEYS = {BestBoard.RANKING_BEST: 0x62657374, BestBoard.RANKING_TRENDING: 0x74726e64}
+
+
+def best_board_size():
+    return getattr(settings, 'BEST_BOARD_SIZE', 100)
+
+
+def _lock_ranking(ranking):
+    """
+    트랜잭션 안에서 호출 - 같은 랭킹을 고치는 요청/재계산을 순서대로 (커밋/롤백 시 자동 해제)
+    랭킹 행이 하나도 없을 때는 select_for_update 로 잠글 행이 없으므로 advisory lock 사용
+    SQLite 등은 쓰기 자체가 DB 단위로 직렬화되어 생략
+    """
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(%s)', [_LOCK_KEYS[ranking]])
+
+
+def _replace_ranking(ranking, entries):
+    """
+    entries: 점수 내림차순 [(board_id, score), ...] - 해당 랭킹 테이블을 통째로 교체
+    """
+    rows = [
+        BestBoard(board_id=board_id, ranking=ranking, rank=index, score=score)
+        for index, (board_id, score) in enumerate(entries, start=1)
+    ]
+    with transaction.atomic():
+        _lock_ranking(ranking)
+        BestBoard.objects.filter(ranking=ranking).delete()
+        BestBoard.objects.bulk_create(rows)
+    return len(rows)
+
+
+def rebuild_best_boards(size=None):
+    """
+    추천수 상위 N개 (recommend_count, id 인덱스로 N행만 읽음) - 추천이 없는 글은 넣지 않음
+    """
+    size = size or best_board_size()
+    top = (
+        Board.objects.filter(recommend_count__gt=0).order_by('-recommend_count', '-id')
+        .values_list('id', 'recommend_count')[:size]
+    )
+    return _replace_ranking(BestBoard.RANKING_BEST, [(board_id, float(count)) for board_id, count in top])
+
+
+def rebuild_trending_boards(size=None, half_life_hours=None, window_days=None, now=None):
+    """
+    최근 window_days 일 동안의 추천을 반감기 half_life_hours 로 감쇠 합산한 점수 상위 N개
+    """
+    size = size or best_board_size()
+    half_life_hours = half_life_hours or getattr(settings, 'TRENDING_HALF_LIFE_HOURS', 24)
+    window_days = window_days or getattr(settings, 'TRENDING_WINDOW_DAYS', 7)
+    now = now or timezone.now()
+    decay = math.log(2) / (half_life_hours * 3600)
+
+    scores = defaultdict(float)
+    recent = Recommend.objects.filter(created_at__gte=now - timedelta(days=window_days))
+    for board_id, created_at in recent.values_list('board_id', 'created_at').iterator():
+        scores[board_id] += math.exp(-decay * (now - created_at).total_seconds())
+    top = heapq.nlargest(size, scores.items(), key=lambda item: (item[1], item[0]))
+    return _replace_ranking(BestBoard.RANKING_TRENDING, top)
+
+
+def update_best_board(board_id, recommend_count):
+    """
+    좋아요/취소 직후 추천순 랭킹을 증분 갱신
+    - 순위권 밖이고 컷라인 이하(또는 추천 0)면 조회 1번으로 끝
+    - 순위권 안에서 추천이 0 이 되면 랭킹에서 빠짐
+    - 순위권 안에서 앞뒤 순서가 그대로면 점수만 UPDATE
+    - 순서가 바뀔 때만 랭킹 행(N개)을 잠그고 재정렬
+    순위권 게시글의 추천수가 줄어 밖의 게시글보다 낮아지는 경우는 주기적 재계산이 바로잡음
+    좋아요는 이미 커밋된 뒤라 랭킹 갱신 실패는 로그만 남김 (주기적 재계산이 바로잡음)
+    """
+    try:
+        # 실패해도 바깥 트랜잭션을 깨뜨리지 않도록 savepoint 안에서
+        with transaction.atomic():
+            _update_best_board(board_id, recommend_count)
+    except DatabaseError:
+        logger.exception('베스트 게시판 증분 갱신 실패 (board_id=%s)', board_id)
+
+
+def _update_best_board(board_id, recommend_count):
+    size = best_board_size()
+    score = float(recommend_count)
+    rankings = BestBoard.objects.filter(ranking=BestBoard.RANKING_BEST)
+    entry = rankings.filter(board_id=board_id).first()
+    if entry is None:
+        if score <= 0:
+            return
+        cutoff = rankings.filter(rank=size).values_list('score', 'board_id').first()
+        if cutoff is not None and (score, board_id) <= cutoff:
+            return
+    else:
+        neighbours = dict(
+            (rank, (neighbour_score, neighbour_id))
+            for rank, neighbour_score, neighbour_id in rankings.filter(
+                rank__in=[entry.rank - 1, entry.rank + 1]
+            ).values_list('rank', 'score', 'board_id')
+        )
+        previous = neighbours.get(entry.rank - 1, (math.inf, math.inf))
+        following = neighbours.get(entry.rank + 1, (-math.inf, -math.inf))
+        if score > 0 and previous > (score, board_id) > following:
+            # 그 사이 재계산으로 행이 지워졌으면 0건 - 다음 재계산이 반영
+            BestBoard.objects.filter(pk=entry.pk).update(score=score, update_date=timezone.now())
+            return
+    _rerank_best_boards(board_id, score, size)
+
+
+def _rerank_best_boards(board_id, score, size):
+    with transaction.atomic():
+        _lock_ranking(BestBoard.RANKING_BEST)
+        rows = {
+            row.board_id: row
+            for row in BestBoard.objects.select_for_update().filter(ranking=BestBoard.RANKING_BEST)
+        }
+        if board_id not in rows:
+            rows[board_id] = BestBoard(board_id=board_id, ranking=BestBoard.RANKING_BEST, rank=0)
+        rows[board_id].score = score
+
+        ordered = sorted(rows.values(), key=lambda row: (row.score, row.board_id), reverse=True)
+        # 점수 내림차순이므로 점수 > 0 인 앞쪽에서 size 개만 남김 (자리가 남아도 0점 글은 넣지 않음)
+        kept = [row for row in ordered if row.score > 0][:size]
+        dropped = ordered[len(kept):]
+        changed, created = [], []
+        for rank, row in enumerate(kept, start=1):
+            if row.pk is None:
+                row.rank = rank
+                created.append(row)
+            elif row.rank != rank or row.board_id == board_id:
+                row.rank = rank
+                row.update_date = timezone.now()
+                changed.append(row)
+        BestBoard.objects.filter(pk__in=[row.pk for row in dropped if row.pk is not None]).delete()
+        BestBoard.objects.bulk_update(changed, ['rank', 'score', 'update_date'])
+        BestBoard.objects.bulk_create(created)
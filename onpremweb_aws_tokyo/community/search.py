@@ -0,0 +1,222 @@
+# onpremweb_aws/community/search.py
+import re
+import threading
+from collections import defaultdict
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Case, FloatField, Value, When
+from rest_framework import filters
+
+# 한글 음절 / 그 외 단어(영문·숫자) 구분
+HANGUL_RUN = re.compile(r'[가-힣]+')
+WORD_RUN = re.compile(r'[0-9a-zÀ-ɏ]+')
+TOKEN_SPLIT = re.compile(r'([가-힣]+)')
+
+SEARCH_CONFIG = 'simple'
+
+
+# post_migrate 로 만드는 search_document GIN 인덱스 (Postgres 전용) - 모델 Meta 에 두면
+# 마이그레이션 생성 시점의 DB 엔진에 따라 인덱스가 생기거나 빠지므로 DB 종류를 보고 직접 생성
+SEARCH_INDEXES = {
+    'Board': 'board_search_gin',
+    'Feedback': 'feedback_search_gin',
+    'Notice': 'notice_search_gin',
+}
+
+
+def create_search_indexes(app_config, using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    post_migrate - search_queryset 의 SearchVector 와 같은 식의 GIN 인덱스 (이미 있으면 건너뜀)
+    """
+    db = connections[using]
+    if db.vendor != 'postgresql':
+        return
+    qn = db.ops.quote_name
+    with db.cursor() as cursor:
+        for model_name, name in SEARCH_INDEXES.items():
+            table = app_config.get_model(model_name)._meta.db_table
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {qn(name)} ON {qn(table)} USING gin "
+                f"(to_tsvector('{SEARCH_CONFIG}'::regconfig, COALESCE({qn('search_document')}, '')))"
+            )
+
+
+def hangul_grams(run, sizes):
+    if len(run) == 1:
+        return [run]
+    return [run[i:i + size] for size in sizes for i in range(len(run) - size + 1)]
+
+
+def tokenize(text):
+    """
+    문서용 토큰: 한글은 음절 1/2/3-gram (형태소 분석 없이 부분 일치), 영문·숫자는 단어 단위
+    """
+    tokens = []
+    for chunk in TOKEN_SPLIT.split((text or '').lower()):
+        if HANGUL_RUN.fullmatch(chunk):
+            tokens.extend(chunk)
+            if len(chunk) > 1:
+                tokens.extend(hangul_grams(chunk, (2, 3)))
+        else:
+            tokens.extend(WORD_RUN.findall(chunk))
+    return tokens
+
+
+def build_search_document(title, content, author_username):
+    # 제목은 두 번 넣어 본문보다 높은 점수
+    return ' '.join(tokenize(f'{title} {title} {content} {author_username}'))
+
+
+def parse_query(text):
+    """
+    검색어 → [(토큰, prefix 여부)] (모두 AND)
+    한글은 3글자 이상이면 trigram, 2글자는 bigram, 1글자는 음절 그대로
+    마지막 영문 단어는 입력 중일 수 있으므로 prefix 검색
+    """
+    terms = []
+    chunks = [c for c in TOKEN_SPLIT.split((text or '').lower()) if c.strip()]
+    for index, chunk in enumerate(chunks):
+        if HANGUL_RUN.fullmatch(chunk):
+            size = 3 if len(chunk) >= 3 else 2
+            terms.extend((gram, False) for gram in hangul_grams(chunk, (size,)))
+        else:
+            words = WORD_RUN.findall(chunk)
+            for word_index, word in enumerate(words):
+                is_last = index == len(chunks) - 1 and word_index == len(words) - 1
+                terms.append((word, is_last))
+    # 중복 제거 (순서 유지)
+    return list(dict.fromkeys(terms))
+
+
+class PythonSearchIndex:
+    """
+    SQLite 개발환경용 역색인 {token: {id: 빈도}} - 프로세스 단위, 저장 시 증분 갱신
+    """
+    def __init__(self, model):
+        self.model = model
+        self.lock = threading.Lock()
+        self.postings = None
+        self.documents = {}
+
+    def ensure_loaded(self):
+        if self.postings is not None:
+            return
+        with self.lock:
+            if self.postings is not None:
+                return
+            self.postings = defaultdict(dict)
+            for pk, document in self.model.objects.values_list('pk', 'search_document').iterator():
+                self._add(pk, document)
+
+    def _add(self, pk, document):
+        counts = defaultdict(int)
+        for token in document.split():
+            counts[token] += 1
+        for token, count in counts.items():
+            self.postings[token][pk] = count
+        self.documents[pk] = tuple(counts)
+
+    def _remove(self, pk):
+        for token in self.documents.pop(pk, ()):
+            self.postings[token].pop(pk, None)
+
+    def update(self, pk, document):
+        if self.postings is None:
+            return
+        with self.lock:
+            self._remove(pk)
+            self._add(pk, document)
+
+    def remove(self, pk):
+        if self.postings is None:
+            return
+        with self.lock:
+            self._remove(pk)
+
+    def search(self, terms):
+        """
+        {id: 점수} - 모든 검색어를 포함하는 문서만
+        """
+        self.ensure_loaded()
+        scores = None
+        with self.lock:
+            for token, prefix in terms:
+                if prefix:
+                    matched = defaultdict(int)
+                    for key, posting in self.postings.items():
+                        if key.startswith(token):
+                            for pk, count in posting.items():
+                                matched[pk] += count
+                else:
+                    matched = dict(self.postings.get(token, {}))
+                if scores is None:
+                    scores = dict(matched)
+                else:
+                    scores = {pk: score + matched[pk] for pk, score in scores.items() if pk in matched}
+                if not scores:
+                    return {}
+        return scores or {}
+
+
+_python_indexes = {}
+_python_indexes_lock = threading.Lock()
+
+
+def python_index_for(model):
+    with _python_indexes_lock:
+        index = _python_indexes.get(model)
+        if index is None:
+            index = _python_indexes[model] = PythonSearchIndex(model)
+        return index
+
+
+def index_saved(instance):
+    if connections[instance._state.db].vendor != 'postgresql':
+        python_index_for(type(instance)).update(instance.pk, instance.search_document)
+
+
+def index_deleted(instance):
+    if connections[instance._state.db].vendor != 'postgresql':
+        python_index_for(type(instance)).remove(instance.pk)
+
+
+def search_queryset(queryset, terms):
+    """
+    검색어 조건 + search_rank 주석이 붙은 queryset 반환
+    """
+    if connections[queryset.db].vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+        raw = ' & '.join(f"'{token}'{':*' if prefix else ''}" for token, prefix in terms)
+        vector = SearchVector('search_document', config=SEARCH_CONFIG)
+        query = SearchQuery(raw, search_type='raw', config=SEARCH_CONFIG)
+        return queryset.alias(search=vector).filter(search=query).annotate(
+            search_rank=SearchRank(vector, query)
+        )
+    scores = python_index_for(queryset.model).search(terms)
+    if not scores:
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField())).none()
+    return queryset.filter(pk__in=list(scores)).annotate(
+        search_rank=Case(
+            *[When(pk=pk, then=Value(float(score))) for pk, score in scores.items()],
+            default=Value(0.0), output_field=FloatField(),
+        )
+    )
+
+
+class KoreanSearchFilter(filters.SearchFilter):
+    """
+    ?search= 를 search_document 색인으로 처리 (icontains 풀스캔 대신)
+    ?ordering= 을 따로 주지 않으면 검색 점수순 정렬
+    색인 토큰이 없는 검색어(특수문자 등)만 기존 search_fields icontains 로 처리
+    """
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '')
+        if not text.strip():
+            return queryset
+        terms = parse_query(text)
+        if not terms:
+            return super().filter_queryset(request, queryset, view)
+        ordering = list(queryset.query.order_by)
+        queryset = search_queryset(queryset, terms)
+        if not request.query_params.get('ordering'):
+            queryset = queryset.order_by('-search_rank', *ordering)
+        return queryset
@@ -0,0 +1,210 @@
+# onpremweb_aws/community/sse.py
+import asyncio
+import json
+from urllib.parse import parse_qs
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from .authentication import get_cached_user
+from .models import Notification
+from .notification_stream import (
+    broker, latest_notification_id, longpoll_timeout, new_notifications, poll_interval, redeem_stream_ticket,
+)
+from .serializers import NotificationSerializer
+
+STREAM_PATH = '/api/notifications/stream/'
+POLL_PATH = '/api/notifications/poll/'
+NEW_NOTIFICATION_LIMIT = 50
+
+
+def _bearer_token(scope):
+    for name, value in scope.get('headers', []):
+        if name == b'authorization':
+            parts = value.decode('latin-1').split()
+            if len(parts) == 2 and parts[0] == 'Bearer':
+                return parts[1]
+    return None
+
+
+def _query(scope, name):
+    values = parse_qs(scope.get('query_string', b'').decode()).get(name)
+    return values[0] if values else None
+
+
+@sync_to_async
+def _authenticate(raw_token=None, ticket=None):
+    """
+    Authorization: Bearer <JWT> 또는 (SSE 만) ?ticket=<stream_ticket> → 활성 사용자 id
+    """
+    if raw_token:
+        try:
+            user_id = AccessToken(raw_token)[jwt_settings.USER_ID_CLAIM]
+        except (TokenError, KeyError):
+            return None
+    else:
+        user_id = redeem_stream_ticket(ticket)
+        if user_id is None:
+            return None
+    user = get_cached_user(user_id)
+    return user.pk if user is not None and user.is_active else None
+
+
+@sync_to_async
+def _initial_state(user_id, since_id):
+    if since_id is None:
+        since_id = latest_notification_id(user_id)
+    unread = Notification.objects.filter(to_user_id=user_id, is_read=False).count()
+    return since_id, unread
+
+
+@sync_to_async
+def _fetch_new(user_id, since_id):
+    notifications = list(new_notifications(user_id, since_id, NEW_NOTIFICATION_LIMIT))
+    return NotificationSerializer(notifications, many=True).data
+
+
+def _event(name, data, event_id=None):
+    lines = [f'event: {name}']
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'data: {json.dumps(data, ensure_ascii=False, default=str)}')
+    return ('\n'.join(lines) + '\n\n').encode()
+
+
+async def _respond(send, status, data=None):
+    await send({'type': 'http.response.start', 'status': status, 'headers': [
+        (b'content-type', b'application/json'),
+        (b'cache-control', b'no-store'),
+    ]})
+    body = json.dumps(data, ensure_ascii=False, default=str).encode() if data is not None else b''
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def _unauthorized(send):
+    await _respond(send, 401, {'detail': '인증이 필요합니다.'})
+
+
+async def _watch_disconnect(receive, disconnected, wakeup):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+    disconnected.set()
+    wakeup.set()
+
+
+async def notification_poll(scope, receive, send):
+    """
+    GET /api/notifications/poll/?since=<마지막으로 받은 알림 id>&timeout=<초> - long-poll (asgi.py 로 띄웠을 때만)
+    since 이후 알림이 있으면 바로, 없으면 새 알림 신호가 오거나 timeout(최대 NOTIFICATION_LONGPOLL_TIMEOUT) 까지 대기
+    since 가 없으면 기다리지 않고 현재 마지막 id 만 응답
+    """
+    if scope['method'] != 'GET':
+        await _respond(send, 405)
+        return
+    raw_token = _bearer_token(scope)
+    user_id = await _authenticate(raw_token) if raw_token else None
+    if user_id is None:
+        await _unauthorized(send)
+        return
+    try:
+        since_id = _query(scope, 'since')
+        since_id = int(since_id) if since_id is not None else None
+        timeout = float(_query(scope, 'timeout') or longpoll_timeout())
+        if not 0 <= timeout:  # 음수, nan
+            raise ValueError(timeout)
+        timeout = min(timeout, longpoll_timeout())
+    except ValueError:
+        await _respond(send, 400, {'error': 'since, timeout 은 0 이상의 숫자여야 합니다.'})
+        return
+    if since_id is None:
+        last_id, _ = await _initial_state(user_id, None)
+        await _respond(send, 200, {'notifications': [], 'last_id': last_id})
+        return
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    wakeup = asyncio.Event()
+    disconnected = asyncio.Event()
+    watcher = asyncio.ensure_future(_watch_disconnect(receive, disconnected, wakeup))
+    try:
+        with broker.subscribed(user_id, lambda: loop.call_soon_threadsafe(wakeup.set)):
+            # 구독한 뒤에 확인해야 조회~구독 사이에 생긴 알림을 놓치지 않음
+            batch = await _fetch_new(user_id, since_id)
+            while not batch and not disconnected.is_set():
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                wait = remaining if broker.listening else min(remaining, poll_interval())
+                try:
+                    await asyncio.wait_for(wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    # LISTEN 이 살아 있으면 신호 없이 DB 를 볼 필요 없음
+                    if broker.listening:
+                        continue
+                wakeup.clear()
+                batch = await _fetch_new(user_id, since_id)
+    finally:
+        watcher.cancel()
+    if disconnected.is_set():
+        return
+    await _respond(send, 200, {'notifications': batch, 'last_id': batch[-1]['id'] if batch else since_id})
+
+
+async def notification_stream(scope, receive, send):
+    """
+    GET /api/notifications/stream/?ticket=<stream_ticket> - 새 알림을 SSE 로 밀어줌 (asgi.py 로 띄웠을 때만)
+    EventSource 는 헤더를 못 붙이므로 POST /api/notifications/stream_ticket/ 로 받은 일회용 ticket 사용
+    (JWT 를 URL 에 넣으면 nginx/uvicorn access log 에 남음)
+    연결당 DB 조회는 알림이 왔다는 신호를 받았을 때(또는 LISTEN 불가 시 poll_interval 마다)만 발생
+    """
+    if scope['method'] != 'GET':
+        await _respond(send, 405)
+        return
+    raw_token, ticket = _bearer_token(scope), _query(scope, 'ticket')
+    user_id = await _authenticate(raw_token, ticket) if raw_token or ticket else None
+    if user_id is None:
+        await _unauthorized(send)
+        return
+
+    # 브라우저 자동 재연결은 Last-Event-ID 헤더, ticket 을 새로 받아 다시 연결할 때는 ?since= 이후부터 이어서 전송
+    last_event_id = dict(scope.get('headers', [])).get(b'last-event-id', b'').decode() or _query(scope, 'since') or ''
+    since_id, unread = await _initial_state(user_id, int(last_event_id) if last_event_id.isdigit() else None)
+
+    loop = asyncio.get_running_loop()
+    wakeup = asyncio.Event()
+    disconnected = asyncio.Event()
+    heartbeat = getattr(settings, 'NOTIFICATION_SSE_HEARTBEAT', 15)
+
+    await send({'type': 'http.response.start', 'status': 200, 'headers': [
+        (b'content-type', b'text/event-stream; charset=utf-8'),
+        (b'cache-control', b'no-cache'),
+        (b'x-accel-buffering', b'no'),  # nginx 프록시 버퍼링 끄기
+    ]})
+    await send({'type': 'http.response.body', 'body': _event('unread_count', {'unread_count': unread}),
+                'more_body': True})
+
+    watcher = asyncio.ensure_future(_watch_disconnect(receive, disconnected, wakeup))
+    try:
+        with broker.subscribed(user_id, lambda: loop.call_soon_threadsafe(wakeup.set)):
+            # 구독 직후 한 번 확인해서 초기 조회~구독 사이에 생긴 알림도 전송
+            check = True
+            while not disconnected.is_set():
+                while check:
+                    batch = await _fetch_new(user_id, since_id)
+                    for data in batch:
+                        since_id = data['id']
+                        await send({'type': 'http.response.body', 'more_body': True,
+                                    'body': _event('notification', data, event_id=since_id)})
+                    check = len(batch) == NEW_NOTIFICATION_LIMIT
+                timeout = heartbeat if broker.listening else min(heartbeat, poll_interval())
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout)
+                    check = True
+                except asyncio.TimeoutError:
+                    # LISTEN 이 살아 있으면 신호 없이 DB 를 볼 필요 없음
+                    check = not broker.listening
+                    await send({'type': 'http.response.body', 'body': b': ping\n\n', 'more_body': True})
+                wakeup.clear()
+    finally:
+        watcher.cancel()
@@ -1,4 +1,1733 @@
-# onpremweb/community/tests.py
-from django.test import TestCase
+# onpremweb_aws/community/tests.py
+import asyncio
+import base64
+import json
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from .models import Board, Notification
 
-# Create your tests here.
+
+S3_SETTINGS = {
+    'AWS_S3_BUCKET': 'test-bucket', 'AWS_REGION': 'ap-northeast-2',
+    'AWS_ACCESS_KEY_ID': 'test', 'AWS_SECRET_ACCESS_KEY': 'test', 'AWS_S3_PRESIGNED_GET': False,
+}
+
+
+def s3_url(key):
+    return f'https://test-bucket.s3.ap-northeast-2.amazonaws.com/{key}'
+
+
+def make_user(username='tester', **kwargs):
+    kwargs.setdefault('email', f'{username}@example.com')
+    return User.objects.create_user(username=username, password='pass1234!', **kwargs)
+
+
+def reset_caches():
+    # 테스트마다 DB 가 롤백되어 같은 pk/version 이 다시 나오므로 프로세스 캐시도 비움
+    from django.core.cache import cache
+    from .authentication import local_users
+    from .fragments import local_fragments
+    cache.clear()
+    local_fragments.clear()
+    local_users.clear()
+
+
+def client_for(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+####################
+# 게시글 목록/상세 쿼리 수 (user-001)
+####################
+class BoardQueryCountTests(TestCase):
+    def setUp(self):
+        reset_caches()
+        self.user = make_user()
+        self.other = make_user('other')
+        self.client = client_for(self.user)
+
+    def add_boards(self, count):
+        from .models import BoardImage, Recommend, Reply
+        boards = []
+        for index in range(count):
+            board = Board.objects.create(author=self.other, title=f'제목 {index}', content='본문')
+            for name in ('a.png', 'b.png'):
+                BoardImage.objects.create(board=board, image=f'https://example.com/{index}/{name}')
+            parent = None
+            for depth in range(3):
+                parent = Reply.objects.create(board=board, author=self.other, comment=f'댓글 {depth}', parent=parent)
+            Recommend.objects.create(user=self.user, board=board)
+            boards.append(board)
+        return boards
+
+    def list_queries(self, query=''):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        reset_caches()
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(f'/api/boards/{query}')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(all(row['recommended_by_me'] for row in response.data['results']))
+        return len(captured)
+
+    def test_list_query_count_is_fixed(self):
+        self.add_boards(2)
+        # 개수, 게시글+작성자, 내 추천, 이미지, 댓글+작성자
+        self.assertEqual(self.list_queries('?expand=replies,images'), 5)
+        # 요약 목록은 댓글 트리를 읽지 않음
+        self.assertEqual(self.list_queries(), 4)
+
+    def test_list_does_not_grow_with_page_size(self):
+        self.add_boards(2)
+        few, few_expanded = self.list_queries(), self.list_queries('?expand=replies,images')
+        self.add_boards(6)
+        self.assertEqual(self.list_queries(), few)
+        self.assertEqual(self.list_queries('?expand=replies,images'), few_expanded)
+
+    def test_detail_query_count_is_fixed(self):
+        board, = self.add_boards(1)
+        reset_caches()
+        # updated_at(ETag), 내 추천, 게시글+작성자, 이미지, 댓글+작성자 - 3단 대댓글도 댓글 쿼리 1번
+        with self.assertNumQueries(5):
+            response = self.client.get(f'/api/boards/{board.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['recommended_by_me'])
+        self.assertEqual(response.data['replies'][0]['children'][0]['children'][0]['comment'], '댓글 2')
+
+
+####################
+# 댓글 트리 한 번에 구성 (user-002)
+####################
+def recursive_reply_serializer(base):
+    """
+    트리 구성 이전 방식 - 노드마다 children 을 다시 조회하는 재귀 직렬화 (비교 기준)
+    """
+    class RecursiveReplySerializer(base):
+        def get_children(self, obj):
+            return RecursiveReplySerializer(obj.children.all(), many=True, context=self.context).data
+    return RecursiveReplySerializer
+
+
+class ReplyTreeTests(TestCase):
+    def setUp(self):
+        from .models import Feedback, Notice
+        reset_caches()
+        self.user = make_user(is_staff=True)
+        self.other = make_user('other')
+        self.client = client_for(self.user)
+        self.board = Board.objects.create(author=self.user, title='게시글', content='본문')
+        self.feedback = Feedback.objects.create(user=self.user, title='피드백', content='본문')
+        self.notice = Notice.objects.create(user=self.user, title='공지', content='본문')
+
+    def add_tree(self, model, **owner):
+        """
+        A ─ A1 ─ A1a
+          │    └ A1b
+          └ A2
+        B
+        """
+        def add(comment, parent=None, author=self.user):
+            return model.objects.create(author=author, comment=comment, parent=parent, **owner)
+        a = add('A')
+        a1 = add('A1', a, self.other)
+        add('A1a', a1)
+        add('A1b', a1, self.other)
+        add('A2', a)
+        add('B')
+
+    def expected(self, serializer_class, model, **owner):
+        from rest_framework.test import APIRequestFactory
+        request = APIRequestFactory().get('/')
+        request.user = self.user
+        roots = model.objects.filter(parent__isnull=True, **owner)
+        return recursive_reply_serializer(serializer_class)(roots, many=True, context={'request': request}).data
+
+    def test_detail_trees_match_recursive_output(self):
+        from .models import FeedbackReply, NoticeReply, Reply
+        from .serializers import FeedbackReplySerializer, NoticeReplySerializer, ReplySerializer
+        cases = [
+            (Reply, ReplySerializer, 'board', f'/api/boards/{self.board.pk}/'),
+            (FeedbackReply, FeedbackReplySerializer, 'feedback', f'/api/feedbacks/{self.feedback.pk}/'),
+            (NoticeReply, NoticeReplySerializer, 'notice', f'/api/notices/{self.notice.pk}/'),
+        ]
+        for model, serializer_class, owner_field, url in cases:
+            with self.subTest(model=model.__name__):
+                owner = {owner_field: getattr(self, owner_field)}
+                self.add_tree(model, **owner)
+                expected = self.expected(serializer_class, model, **owner)
+                self.assertEqual([reply['comment'] for reply in expected], ['A', 'B'])
+                self.assertEqual(expected[0]['children'][0]['children'][1]['comment'], 'A1b')
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(json.loads(json.dumps(response.data['replies'])), json.loads(json.dumps(expected)))
+
+    def test_flat_reply_list_matches_and_reads_once(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .models import Reply
+        from .serializers import ReplySerializer
+        self.add_tree(Reply, board=self.board)
+        expected = recursive_reply_serializer(ReplySerializer)(
+            Reply.objects.filter(board=self.board), many=True, context={'request': None},
+        ).data
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(f'/api/replies/?board={self.board.pk}')
+        self.assertEqual(response.status_code, 200)
+        rows = response.data['results'] if isinstance(response.data, dict) else response.data
+        self.assertEqual(json.loads(json.dumps(rows)), json.loads(json.dumps(expected)))
+        # 개수 + 목록 + 트리용 댓글 쿼리 1번 (노드 수와 무관)
+        reply_queries = [query for query in captured.captured_queries if 'community_reply' in query['sql']]
+        self.assertEqual(len(reply_queries), 3)
+
+
+####################
+# 알림 long-poll / SSE (user-009)
+####################
+class AsgiCall:
+    """
+    ASGI 앱을 직접 호출 - 보낸 메시지는 queue 로 받고, disconnect() 전까지 receive 는 대기
+    """
+    def __init__(self, app, path, query='', headers=()):
+        self.app = app
+        self.scope = {
+            'type': 'http', 'method': 'GET', 'path': path,
+            'query_string': query.encode(), 'headers': list(headers),
+        }
+        self.sent = asyncio.Queue()
+        self._disconnected = asyncio.Event()
+        self.task = None
+
+    async def receive(self):
+        await self._disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        await self.sent.put(message)
+
+    def start(self):
+        self.task = asyncio.ensure_future(self.app(self.scope, self.receive, self.send))
+        return self
+
+    async def next(self, timeout=5):
+        return await asyncio.wait_for(self.sent.get(), timeout)
+
+    async def response(self, timeout=5):
+        start = await self.next(timeout)
+        body = await self.next(timeout)
+        return start['status'], json.loads(body['body']) if body['body'] else None
+
+    async def disconnect(self):
+        self._disconnected.set()
+        await asyncio.wait_for(self.task, 5)
+
+
+class NotificationPushTests(TestCase):
+    def setUp(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+        reset_caches()
+        self.user = make_user()
+        self.board = Board.objects.create(author=self.user, title='제목', content='본문')
+        self.bearer = [(b'authorization', f'Bearer {AccessToken.for_user(self.user)}'.encode())]
+
+    def notify(self):
+        return Notification.objects.create(
+            to_user=self.user, board=self.board, notif_type=Notification.NOTIFY_COMMENT, message='댓글'
+        )
+
+    async def notify_and_publish(self):
+        from asgiref.sync import sync_to_async
+        from .notification_stream import publish
+        notification = await sync_to_async(self.notify)()
+        publish([self.user.pk])
+        return notification
+
+    def poll(self, query='', headers=None):
+        from asgiref.sync import async_to_sync
+        from .sse import POLL_PATH, notification_poll
+        headers = self.bearer if headers is None else headers
+
+        async def call():
+            return await AsgiCall(notification_poll, POLL_PATH, query, headers).start().response()
+        return async_to_sync(call)()
+
+    def test_poll_requires_bearer_token(self):
+        self.assertEqual(self.poll(headers=[])[0], 401)
+
+    def test_poll_without_since_returns_latest_id(self):
+        first = self.notify()
+        self.assertEqual(self.poll(), (200, {'notifications': [], 'last_id': first.pk}))
+
+    def test_poll_returns_pending_notifications_at_once(self):
+        first = self.notify()
+        second = self.notify()
+        status, data = self.poll(f'since={first.pk}')
+        self.assertEqual([n['id'] for n in data['notifications']], [second.pk])
+        self.assertEqual(data['last_id'], second.pk)
+
+    def test_poll_times_out_without_new_rows(self):
+        first = self.notify()
+        self.assertEqual(self.poll(f'since={first.pk}&timeout=0.2'), (200, {'notifications': [], 'last_id': first.pk}))
+
+    def test_poll_invalid_params(self):
+        for query in ('since=abc', 'since=1&timeout=x', 'since=1&timeout=-1', 'since=1&timeout=nan'):
+            self.assertEqual(self.poll(query)[0], 400, query)
+
+    def test_poll_wakes_up_on_publish(self):
+        from asgiref.sync import async_to_sync
+        from .sse import POLL_PATH, notification_poll
+        first = self.notify()
+
+        async def scenario():
+            call = AsgiCall(notification_poll, POLL_PATH, f'since={first.pk}&timeout=20', self.bearer).start()
+            await asyncio.sleep(0.1)
+            self.assertTrue(call.sent.empty())  # 새 알림이 없으므로 대기 중
+            notification = await self.notify_and_publish()
+            status, data = await call.response()
+            return notification, data
+
+        notification, data = async_to_sync(scenario)()
+        self.assertEqual([n['id'] for n in data['notifications']], [notification.pk])
+
+    def stream(self, query='', headers=()):
+        from .sse import STREAM_PATH, notification_stream
+        return AsgiCall(notification_stream, STREAM_PATH, query, headers).start()
+
+    def ticket(self):
+        response = client_for(self.user).post('/api/notifications/stream_ticket/')
+        self.assertEqual(response.status_code, 200)
+        return response.data['ticket']
+
+    def test_stream_pushes_new_notifications(self):
+        from asgiref.sync import async_to_sync
+        ticket = self.ticket()
+
+        async def scenario():
+            call = self.stream(f'ticket={ticket}')
+            start = await call.next()
+            unread = await call.next()
+            notification = await self.notify_and_publish()
+            pushed = await call.next()
+            await call.disconnect()
+            return start, unread['body'].decode(), pushed['body'].decode(), notification
+
+        start, unread, pushed, notification = async_to_sync(scenario)()
+        self.assertEqual(start['status'], 200)
+        self.assertIn((b'content-type', b'text/event-stream; charset=utf-8'), start['headers'])
+        self.assertIn('event: unread_count', unread)
+        self.assertIn('event: notification', pushed)
+        self.assertIn(f'id: {notification.pk}', pushed)
+
+    def test_stream_resumes_after_since(self):
+        from asgiref.sync import async_to_sync
+        first = self.notify()
+        second = self.notify()
+        ticket = self.ticket()
+
+        async def scenario():
+            call = self.stream(f'ticket={ticket}&since={first.pk}')
+            await call.next()
+            await call.next()
+            resumed = await call.next()
+            await call.disconnect()
+            return resumed['body'].decode()
+
+        self.assertIn(f'id: {second.pk}', async_to_sync(scenario)())
+
+    def test_stream_ticket_is_single_use_and_jwt_query_is_rejected(self):
+        from asgiref.sync import async_to_sync
+        from rest_framework_simplejwt.tokens import AccessToken
+        ticket = self.ticket()
+
+        async def status(query):
+            call = self.stream(query)
+            start = await call.next()
+            if start['status'] == 200:
+                await call.disconnect()
+            else:
+                await call.next()
+            return start['status']
+
+        self.assertEqual(async_to_sync(status)(f'ticket={ticket}'), 200)
+        self.assertEqual(async_to_sync(status)(f'ticket={ticket}'), 401)
+        self.assertEqual(async_to_sync(status)(f'ticket={ticket[:-2]}xx'), 401)
+        self.assertEqual(async_to_sync(status)(f'token={AccessToken.for_user(self.user)}'), 401)
+
+
+####################
+# 알림 읽음 처리 / 안 읽은 수 (user-008)
+####################
+class NotificationReadTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.other = make_user('other')
+        self.board = Board.objects.create(author=self.user, title='제목', content='본문')
+        self.mine = [self.notify(self.user) for _ in range(3)]
+        self.theirs = self.notify(self.other)
+        self.client = client_for(self.user)
+
+    def notify(self, user):
+        return Notification.objects.create(
+            to_user=user, board=self.board, notif_type=Notification.NOTIFY_COMMENT, message='댓글'
+        )
+
+    def unread(self):
+        return self.client.get('/api/notifications/unread_count/').data['unread_count']
+
+    def read_ids(self):
+        return set(Notification.objects.filter(is_read=True).values_list('pk', flat=True))
+
+    def test_unread_count(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.unread(), 3)
+
+    def test_mark_read_single_row(self):
+        first = self.mine[0]
+        with self.assertNumQueries(1):
+            response = self.client.post(f'/api/notifications/{first.pk}/mark_read/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.read_ids(), {first.pk})
+        # 남의 알림, 없는 알림, 숫자가 아닌 pk
+        for pk in (self.theirs.pk, 999999, 'abc'):
+            self.assertEqual(self.client.post(f'/api/notifications/{pk}/mark_read/').status_code, 404, pk)
+        self.assertEqual(self.read_ids(), {first.pk})
+
+    def test_mark_many_read_only_touches_own_rows(self):
+        ids = [self.mine[0].pk, self.mine[1].pk, self.theirs.pk]
+        response = self.client.post('/api/notifications/mark_read/', {'ids': ids}, format='json')
+        self.assertEqual(response.data, {'updated': 2})
+        self.assertEqual(self.read_ids(), {self.mine[0].pk, self.mine[1].pk})
+        self.assertEqual(self.unread(), 1)
+        for body in ({'ids': '1,2'}, {'ids': [1, 'a']}, {'ids': [True]}, {}):
+            response = self.client.post('/api/notifications/mark_read/', body, format='json')
+            self.assertEqual(response.status_code, 400, body)
+
+    def test_mark_all_read(self):
+        response = self.client.post('/api/notifications/mark_all_read/')
+        self.assertEqual(response.data, {'updated': 3})
+        self.assertEqual(self.unread(), 0)
+        self.assertFalse(Notification.objects.get(pk=self.theirs.pk).is_read)
+
+
+####################
+# 알림 outbox (user-007)
+####################
+class NotificationOutboxTests(TestCase):
+    def setUp(self):
+        self.owner = make_user()
+        self.board = Board.objects.create(author=self.owner, title='제목', content='본문')
+
+    def reply(self, user, parent=None):
+        response = client_for(user).post('/api/replies/', {
+            'board': self.board.pk, 'comment': '댓글', 'parent': parent,
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.data['id']
+
+    def drain(self, *args):
+        from io import StringIO
+        from django.core.management import call_command
+        call_command('drain_notification_outbox', *args, stdout=StringIO())
+
+    def test_reply_enqueues_event_instead_of_notification(self):
+        from .models import NotificationOutbox
+        self.reply(make_user('kim'))
+        self.assertEqual(NotificationOutbox.objects.count(), 1)
+        self.assertFalse(Notification.objects.exists())
+        self.drain()
+        self.assertFalse(NotificationOutbox.objects.exists())
+        notification = Notification.objects.get()
+        self.assertEqual((notification.to_user, notification.board_id), (self.owner, self.board.pk))
+        self.assertEqual(notification.message, 'kim님이 회원님의 게시글에 댓글을 남겼습니다.')
+
+    def test_burst_is_coalesced(self):
+        kim, lee = make_user('kim'), make_user('lee')
+        self.reply(kim)
+        self.reply(lee)
+        last = self.reply(kim)
+        self.drain()
+        notification = Notification.objects.get()
+        self.assertEqual(notification.message, 'kim님 외 1명이 회원님의 게시글에 댓글을 남겼습니다.')
+        self.assertEqual(notification.reply_id, last)  # 가장 최근 댓글을 가리킴
+
+    def test_batches_are_coalesced_separately(self):
+        kim, lee = make_user('kim'), make_user('lee')
+        self.reply(kim)
+        self.reply(kim)
+        self.reply(lee)
+        self.drain('--batch-size', '2')  # 배치가 나뉘어도 모두 처리
+        self.assertEqual(list(Notification.objects.order_by('pk').values_list('message', flat=True)), [
+            'kim님이 회원님의 게시글에 댓글 2개를 남겼습니다.',
+            'lee님이 회원님의 게시글에 댓글을 남겼습니다.',
+        ])
+
+    def test_parent_author_and_self_replies(self):
+        kim, lee = make_user('kim'), make_user('lee')
+        parent = self.reply(kim)
+        self.reply(self.owner)  # 내 글에 내가 단 댓글 → 알림 없음
+        self.drain()
+        Notification.objects.all().delete()
+        self.reply(lee, parent=parent)
+        self.drain()
+        self.assertEqual(
+            sorted(Notification.objects.values_list('to_user__username', 'message')),
+            [('kim', 'lee님이 회원님의 댓글에 답글을 남겼습니다.'),
+             ('tester', 'lee님이 회원님의 게시글에 댓글을 남겼습니다.')],
+        )
+
+
+####################
+# JWT 인증 사용자 캐시 (user-022)
+####################
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        reset_caches()
+        self.user = make_user()
+
+    def test_lookup_is_cached_locally(self):
+        from .authentication import get_cached_user
+        self.assertEqual(get_cached_user(self.user.pk).username, 'tester')
+        with self.assertNumQueries(0):
+            self.assertEqual(get_cached_user(self.user.pk).pk, self.user.pk)
+
+    def test_missing_user(self):
+        from .authentication import get_cached_user
+        self.assertIsNone(get_cached_user(self.user.pk + 100))
+
+    def test_deactivation_invalidates(self):
+        from .authentication import get_cached_user
+        self.assertTrue(get_cached_user(self.user.pk).is_active)
+        self.user.is_active = False
+        self.user.save()
+        self.assertFalse(get_cached_user(self.user.pk).is_active)
+
+    def test_locmem_backend_skips_shared_tier(self):
+        from django.core.cache import cache
+        from .authentication import _cache_key, get_cached_user
+        get_cached_user(self.user.pk)
+        # 기본 LocMem 은 워커별이라 2차 캐시로 쓰지 않음
+        self.assertIsNone(cache.get(_cache_key(self.user.pk)))
+
+    def test_inactive_user_rejected_by_token(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+        token = AccessToken.for_user(self.user)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(client.get('/api/me/').status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(client.get('/api/me/').status_code, 401)
+
+    def test_password_hash_is_not_cached(self):
+        from .authentication import _cache_key, get_cached_user, local_users
+        user = get_cached_user(self.user.pk)
+        self.assertNotIn('password', local_users.get(_cache_key(self.user.pk)))
+        # 필요하면 deferred 컬럼으로 DB 에서 읽음
+        with self.assertNumQueries(1):
+            self.assertTrue(user.check_password('pass1234!'))
+
+    def test_password_hash_cached_for_revoke_check(self):
+        from . import authentication
+        from .authentication import _cache_key, get_cached_user, local_users
+        with mock.patch.object(authentication.api_settings, 'CHECK_REVOKE_TOKEN', True, create=True):
+            get_cached_user(self.user.pk)
+        self.assertEqual(local_users.get(_cache_key(self.user.pk))['password'], self.user.password)
+
+    def test_set_password_reads_current_hash(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from rest_framework_simplejwt.tokens import AccessToken
+        from . import password_pool
+        from .authentication import get_cached_user
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        get_cached_user(self.user.pk)  # 캐시된 본인(해시 없음)으로 인증
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(self.user)}'}
+        url = f'/api/users/{self.user.pk}/set_password/'
+        with mock.patch.object(password_pool, 'get_pool', return_value=executor):
+            wrong = self.client.post(url, {'old_password': 'nope', 'new_password': 'newpass123!'},
+                                     content_type='application/json', **headers)
+            self.assertEqual(wrong.status_code, 400)
+            response = self.client.post(url, {'old_password': 'pass1234!', 'new_password': 'newpass123!'},
+                                        content_type='application/json', **headers)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('newpass123!'))
+
+    def test_last_login_flush_invalidates(self):
+        from django.utils import timezone
+        from .authentication import get_cached_user
+        from .last_login import write_last_logins
+        self.assertIsNone(get_cached_user(self.user.pk).last_login)
+        now = timezone.now()
+        write_last_logins({self.user.pk: now})
+        self.assertEqual(get_cached_user(self.user.pk).last_login, now)
+
+
+####################
+# 키셋/추정 count 페이지네이션 (user-003)
+####################
+def encode_cursor(values, reverse=False):
+    payload = json.dumps({'v': values, 'r': reverse})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        reset_caches()
+        self.user = make_user()
+        self.boards = [
+            Board.objects.create(author=self.user, title=f'글 {i}', content='본문') for i in range(15)
+        ]
+        self.client = client_for(self.user)
+
+    def test_cursor_pages_cover_every_row_once(self):
+        seen = []
+        url = '/api/boards/?cursor='
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(row['id'] for row in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(seen, [board.pk for board in reversed(self.boards)])
+
+    def test_previous_link_goes_back(self):
+        first = self.client.get('/api/boards/?cursor=')
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(
+            [row['id'] for row in back.data['results']], [row['id'] for row in first.data['results']]
+        )
+
+    def test_reply_count_ordering_pages_by_cursor(self):
+        for count, board in enumerate(self.boards):
+            Board.objects.filter(pk=board.pk).update(reply_count=count % 4)
+        seen = []
+        url = '/api/boards/?ordering=-reply_count&cursor='
+        while url:
+            response = self.client.get(url)
+            seen.extend(row['id'] for row in response.data['results'])
+            url = response.data['next']
+        expected = Board.objects.order_by('-reply_count', '-id').values_list('pk', flat=True)
+        self.assertEqual(seen, list(expected))
+
+    def test_keyset_orderings_have_indexes(self):
+        # 키셋으로 정렬 가능한 필드마다 (필드, id) 복합 인덱스가 있어야 페이지마다 전체 정렬을 하지 않음
+        from .pagination import KeysetPagination
+        from .views import BoardViewSet, FeedbackViewSet, NoticeViewSet
+        for viewset in (BoardViewSet, FeedbackViewSet, NoticeViewSet):
+            model = viewset.queryset.model
+            indexed = {index.fields[0].lstrip('-') for index in model._meta.indexes if index.fields}
+            for field in viewset.ordering_fields:
+                if field in KeysetPagination.keyset_fields and field != 'id':
+                    self.assertIn(field, indexed, f'{model.__name__}.{field}')
+
+    def test_malformed_cursor_is_404(self):
+        for cursor in ('%%%not-base64', encode_cursor(['not-a-date', 1]), encode_cursor([None, 1]),
+                       encode_cursor([{'a': 1}, 'x']), encode_cursor([1])):
+            response = self.client.get('/api/boards/', {'cursor': cursor})
+            self.assertEqual(response.status_code, 404, cursor)
+
+
+class ApproximateCountTests(TestCase):
+    def setUp(self):
+        reset_caches()
+        self.user = make_user()
+        for i in range(15):
+            Board.objects.create(author=self.user, title=f'글 {i}', content='본문')
+        self.client = client_for(self.user)
+
+    def test_low_estimate_does_not_truncate_pages(self):
+        with mock.patch('community.pagination.approximate_count', return_value=3):
+            first = self.client.get('/api/boards/?count=approx')
+            self.assertEqual(first.data['count'], 3)
+            self.assertEqual(len(first.data['results']), 10)
+            self.assertIsNotNone(first.data['next'])
+            second = self.client.get('/api/boards/?count=approx&page=2')
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(len(second.data['results']), 5)
+        self.assertIsNone(second.data['next'])
+
+    def test_page_past_the_end_is_empty(self):
+        with mock.patch('community.pagination.approximate_count', return_value=100):
+            response = self.client.get('/api/boards/?count=approx&page=5')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'], [])
+
+
+####################
+# 좋아요/좋아요 취소 (user-005)
+####################
+class BoardLikeTests(TestCase):
+    def setUp(self):
+        self.board = Board.objects.create(author=make_user(), title='제목', content='본문')
+        self.liker = make_user('liker')
+        self.client = client_for(self.liker)
+        self.url = f'/api/boards/{self.board.pk}/like/'
+
+    def count(self):
+        self.board.refresh_from_db()
+        return self.board.recommend_count
+
+    def test_like_and_unlike(self):
+        from .models import Recommend
+        response = self.client.post(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['recommend_count'], response.data['recommended_by_me']), (1, True))
+        self.assertTrue(Recommend.objects.filter(board=self.board, user=self.liker).exists())
+        response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['recommend_count'], response.data['recommended_by_me']), (0, False))
+        self.assertFalse(Recommend.objects.exists())
+
+    def test_double_like_and_unlike_are_rejected(self):
+        self.client.post(self.url)
+        self.assertEqual(self.client.post(self.url).status_code, 400)
+        self.assertEqual(self.count(), 1)
+        self.client.delete(self.url)
+        self.assertEqual(self.client.delete(self.url).status_code, 400)
+        self.assertEqual(self.count(), 0)
+
+    def test_concurrent_first_like_counts_once(self):
+        # 동시에 들어온 다른 요청이 먼저 추천 행을 넣은 경우 - INSERT 가 충돌해 추천수를 올리지 않음
+        from .likes import like_board
+        from .models import Recommend
+        Recommend.objects.create(board=self.board, user=self.liker)
+        Board.objects.filter(pk=self.board.pk).update(recommend_count=1)
+        self.assertEqual(like_board(self.board.pk, self.liker), (False, None))
+        self.assertEqual(self.count(), 1)
+        self.assertEqual(Recommend.objects.count(), 1)
+
+    def test_like_bumps_version(self):
+        version = self.board.version
+        self.client.post(self.url)
+        self.board.refresh_from_db()
+        self.assertEqual(self.board.version, version + 1)
+
+    def test_missing_board_is_404(self):
+        from .models import Recommend
+        self.assertEqual(self.client.post('/api/boards/999999/like/').status_code, 404)
+        self.assertEqual(self.client.delete('/api/boards/999999/like/').status_code, 400)
+        self.assertFalse(Recommend.objects.exists())
+
+
+####################
+# 베스트 게시판 증분 갱신 (user-006)
+####################
+class BestBoardRankingTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.boards = [
+            Board.objects.create(author=self.user, title=f'글 {i}', content='본문') for i in range(3)
+        ]
+
+    def ranked(self):
+        from .models import BestBoard
+        return list(BestBoard.objects.filter(ranking=BestBoard.RANKING_BEST).order_by('rank').values_list(
+            'board_id', 'rank', 'score'
+        ))
+
+    def test_like_enters_and_reorders_ranking(self):
+        from .ranking import update_best_board
+        first, second, _ = self.boards
+        update_best_board(first.pk, 1)
+        update_best_board(second.pk, 2)
+        self.assertEqual(self.ranked(), [(second.pk, 1, 2.0), (first.pk, 2, 1.0)])
+        update_best_board(first.pk, 3)
+        self.assertEqual(self.ranked(), [(first.pk, 1, 3.0), (second.pk, 2, 2.0)])
+
+    def test_ranking_is_capped(self):
+        from .ranking import update_best_board
+        with self.settings(BEST_BOARD_SIZE=2):
+            for count, board in enumerate(self.boards, start=1):
+                update_best_board(board.pk, count)
+        self.assertEqual([row[0] for row in self.ranked()], [self.boards[2].pk, self.boards[1].pk])
+
+    def test_rerank_with_existing_row_does_not_duplicate(self):
+        # 다른 요청이 먼저 같은 게시글을 넣은 경우 (조회 때는 없었지만 잠근 뒤엔 있음)
+        from .ranking import _rerank_best_boards, update_best_board
+        board = self.boards[0]
+        update_best_board(board.pk, 1)
+        _rerank_best_boards(board.pk, 2.0, 100)
+        self.assertEqual(self.ranked(), [(board.pk, 1, 2.0)])
+
+    def test_zero_score_never_enters_ranking(self):
+        # 자리가 남아 있어도 추천 0 인 글은 넣지 않고, 0 이 되면 빠짐
+        from .ranking import rebuild_best_boards, update_best_board
+        first, second, _ = self.boards
+        update_best_board(first.pk, 0)
+        self.assertEqual(self.ranked(), [])
+        update_best_board(first.pk, 2)
+        update_best_board(second.pk, 1)
+        update_best_board(first.pk, 0)
+        self.assertEqual(self.ranked(), [(second.pk, 1, 1.0)])
+        Board.objects.filter(pk=second.pk).update(recommend_count=1)
+        rebuild_best_boards()
+        self.assertEqual(self.ranked(), [(second.pk, 1, 1.0)])
+
+    def test_list_is_in_rank_order_with_page_numbers(self):
+        from .ranking import update_best_board
+        for count, board in enumerate(self.boards, start=1):
+            update_best_board(board.pk, count)
+        client = client_for(self.user)
+        for url in ('/api/bestboards/', '/api/bestboards/?cursor='):
+            response = client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['count'], 3)
+            self.assertEqual([row['id'] for row in response.data['results']], [b.pk for b in reversed(self.boards)])
+
+    def test_ranking_failure_does_not_fail_like(self):
+        from django.db import IntegrityError
+        board = self.boards[0]
+        liker = make_user('liker')
+        with mock.patch('community.ranking._rerank_best_boards', side_effect=IntegrityError('duplicate')), \
+                self.assertLogs('community.ranking', level='ERROR'):
+            response = client_for(liker).post(f'/api/boards/{board.pk}/like/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['recommend_count'], 1)
+        board.refresh_from_db()
+        self.assertEqual(board.recommend_count, 1)
+
+
+####################
+# 한글 검색 (user-004)
+####################
+class KoreanSearchTests(TestCase):
+    def setUp(self):
+        from .search import _python_indexes
+        _python_indexes.clear()
+        reset_caches()
+        self.user = make_user('writer')
+        self.client = client_for(self.user)
+        self.hit = Board.objects.create(author=self.user, title='범퍼 교체 비용', content='앞 범퍼가 찌그러졌어요')
+        self.miss = Board.objects.create(author=self.user, title='타이어 문의', content='겨울용 타이어')
+
+    def search(self, text):
+        response = self.client.get('/api/boards/', {'search': text})
+        self.assertEqual(response.status_code, 200)
+        return [row['id'] for row in response.data['results']]
+
+    def test_partial_hangul_match(self):
+        self.assertEqual(self.search('범퍼'), [self.hit.pk])
+        self.assertEqual(self.search('찌그러'), [self.hit.pk])
+        self.assertEqual(self.search('교체 비용'), [self.hit.pk])
+        self.assertEqual(self.search('엔진'), [])
+
+    def test_document_follows_edits(self):
+        self.miss.title = '범퍼 문의'
+        self.miss.save()
+        self.assertCountEqual(self.search('범퍼'), [self.hit.pk, self.miss.pk])
+
+    def test_backfill_missing_documents(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from .search import _python_indexes
+        # 마이그레이션으로 컬럼만 추가된 기존 행
+        Board.objects.filter(pk=self.hit.pk).update(search_document='')
+        _python_indexes.clear()
+        self.assertEqual(self.search('범퍼'), [])
+        call_command('rebuild_search_documents', '--missing', stdout=StringIO())
+        _python_indexes.clear()
+        self.assertEqual(self.search('범퍼'), [self.hit.pk])
+        self.assertTrue(Board.objects.get(pk=self.miss.pk).search_document)
+
+
+####################
+# 이미지 첨부 검증 (user-012)
+####################
+@override_settings(**S3_SETTINGS)
+class ImageAttachmentTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.other = make_user('other')
+        self.board = Board.objects.create(author=self.user, title='제목', content='본문')
+        self.client = client_for(self.user)
+
+    def upload(self, urls):
+        return self.client.post('/api/boards/upload/', {'board_id': self.board.pk, 's3_urls': urls}, format='json')
+
+    def test_attaches_own_uploads_once(self):
+        from .attachments import record_pending_uploads
+        key = f'user_uploads/{self.user.id}/a.png'
+        record_pending_uploads(self.user, [key])
+        response = self.upload([s3_url(key), s3_url(key) + '?X-Amz-Signature=abc'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(self.board.images.values_list('image', flat=True)), [s3_url(key)])
+        self.board.refresh_from_db()
+        self.assertEqual(self.board.image_count, 1)
+        from .models import PendingUpload
+        self.assertFalse(PendingUpload.objects.filter(key=key).exists())
+        # 이미 붙은 URL 은 다시 넣지 않음
+        self.assertEqual(self.upload([s3_url(key)]).data, [])
+
+    def test_rejects_foreign_upload_key(self):
+        own = s3_url(f'user_uploads/{self.user.id}/a.png')
+        for url in (s3_url(f'user_uploads/{self.other.id}/b.png'),
+                    s3_url(f'user_uploads/{self.user.id}/../{self.other.id}/b.png'),
+                    s3_url('static/logo.png'),
+                    'https://example.com/user_uploads/1/a.png'):
+            response = self.upload([own, url])
+            self.assertEqual(response.status_code, 400, url)
+        # 하나라도 실패하면 아무것도 저장하지 않음
+        self.assertFalse(self.board.images.exists())
+
+    def test_rejects_non_list(self):
+        self.assertEqual(self.upload('not-a-list').status_code, 400)
+
+
+####################
+# S3 삭제 대기열 (user-013)
+####################
+@override_settings(**S3_SETTINGS)
+class DeletionQueueTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.board = Board.objects.create(author=self.user, title='제목', content='본문')
+        self.key = f'user_uploads/{self.user.id}/a.png'
+
+    def add_image(self, board=None):
+        from .models import BoardImage
+        return BoardImage.objects.create(board=board or self.board, image=s3_url(self.key))
+
+    def drain(self, failed=None):
+        from .deletion_queue import drain_deletions
+        with mock.patch('community.storage.delete_objects', return_value=failed or {}) as delete_objects:
+            result = drain_deletions()
+        deleted = delete_objects.call_args[0][0] if delete_objects.called else []
+        return result, deleted
+
+    def test_image_delete_is_queued_and_drained(self):
+        from .models import StorageDeletion
+        self.add_image().delete()
+        self.assertEqual(list(StorageDeletion.objects.values_list('key', flat=True)), [self.key])
+        result, deleted = self.drain()
+        self.assertEqual(result, (1, 0))
+        self.assertEqual(deleted, [self.key])
+        self.assertFalse(StorageDeletion.objects.exists())
+
+    def test_shared_url_is_not_deleted(self):
+        from .models import StorageDeletion
+        other_board = Board.objects.create(author=self.user, title='다른 글', content='본문')
+        self.add_image(other_board)
+        self.add_image().delete()
+        from .deletion_queue import enqueue_url
+        enqueue_url(s3_url(self.key + '.w320.webp'))
+        result, deleted = self.drain()
+        # 원본도 파생 이미지도 아직 참조 중 → S3 삭제 없이 대기열에서만 제거
+        self.assertEqual(deleted, [])
+        self.assertEqual(result, (2, 0))
+        self.assertFalse(StorageDeletion.objects.exists())
+
+    def test_reference_lookup_uses_md5_index(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .deletion_queue import referenced_urls
+        self.add_image()
+        with CaptureQueriesContext(connection) as queries:
+            referenced = referenced_urls([s3_url(self.key), s3_url('user_uploads/1/other.png')])
+        self.assertEqual(referenced, {s3_url(self.key)})
+        # 이미지 모델 3개는 md5(image) 식 인덱스, Analysis 이미지 필드 4개는 각 필드 인덱스
+        self.assertEqual(len(queries), 7)
+        self.assertTrue(all('MD5(' in query['sql'] for query in queries.captured_queries[:3]))
+
+    def test_failed_keys_are_retried_later(self):
+        from django.utils import timezone
+        from .models import StorageDeletion
+        self.add_image().delete()
+        result, _ = self.drain(failed={self.key: 'SlowDown: 잠시 후 재시도'})
+        self.assertEqual(result, (1, 1))
+        row = StorageDeletion.objects.get()
+        self.assertEqual(row.attempts, 1)
+        self.assertGreater(row.next_attempt_at, timezone.now())
+        # 백오프 전에는 다시 가져가지 않음
+        self.assertEqual(self.drain()[0], (0, 0))
+
+    def test_board_delete_queues_its_images(self):
+        from .models import StorageDeletion
+        self.add_image()
+        self.board.delete()
+        self.assertEqual(list(StorageDeletion.objects.values_list('key', flat=True)), [self.key])
+
+
+####################
+# 고아 업로드 GC (user-014)
+####################
+@override_settings(**S3_SETTINGS, PENDING_UPLOAD_TTL_HOURS=6)
+class OrphanUploadGcTests(TestCase):
+    def setUp(self):
+        from django.utils import timezone
+        self.user = make_user()
+        self.now = timezone.now()
+        self.objects = []
+
+    def put(self, name, hours_ago):
+        from django.utils import timezone
+        key = f'user_uploads/{self.user.id}/{name}'
+        self.objects.append({'Key': key, 'Size': 100, 'LastModified': self.now - timezone.timedelta(hours=hours_ago)})
+        return key
+
+    def pending(self, key, expires_in_hours):
+        from django.utils import timezone
+        from .models import PendingUpload
+        return PendingUpload.objects.create(
+            key=key, user=self.user, expires_at=self.now + timezone.timedelta(hours=expires_in_hours)
+        )
+
+    def gc(self, *args):
+        from io import StringIO
+        from django.core.management import call_command
+        with mock.patch('community.storage.list_object_pages', return_value=[self.objects]), \
+                mock.patch('community.storage.delete_objects', return_value={}) as delete_objects:
+            call_command('gc_orphan_uploads', *args, stdout=StringIO())
+        return sorted(delete_objects.call_args[0][0]) if delete_objects.called else []
+
+    def test_deletes_only_expired_unreferenced_uploads(self):
+        from .models import BoardImage, PendingUpload
+        board = Board.objects.create(author=self.user, title='제목', content='본문')
+        orphan = self.put('orphan.png', hours_ago=8)
+        self.pending(orphan, expires_in_hours=-2)
+        referenced = self.put('used.png', hours_ago=8)
+        BoardImage.objects.create(board=board, image=s3_url(referenced))
+        derived = self.put('used.png.w320.webp', hours_ago=8)
+        recent = self.put('recent.png', hours_ago=1)
+        writing = self.put('writing.png', hours_ago=8)
+        self.pending(writing, expires_in_hours=1)
+
+        self.assertEqual(self.gc(), [orphan])
+        self.assertFalse(PendingUpload.objects.filter(key=orphan).exists())
+        self.assertTrue(PendingUpload.objects.filter(key=writing).exists())
+        self.assertNotIn(derived, self.gc())
+        self.assertNotIn(recent, self.gc())
+
+    def test_grace_defaults_to_pending_upload_ttl(self):
+        orphan = self.put('orphan.png', hours_ago=7)
+        # 기본 grace = PENDING_UPLOAD_TTL_HOURS(6) → 7시간 전 파일은 삭제 대상
+        self.assertEqual(self.gc(), [orphan])
+        self.assertEqual(self.gc('--grace-hours', '24'), [])
+        with self.settings(PENDING_UPLOAD_TTL_HOURS=24):
+            self.assertEqual(self.gc(), [])
+
+    def test_dry_run_deletes_nothing(self):
+        self.put('orphan.png', hours_ago=8)
+        self.assertEqual(self.gc('--dry-run'), [])
+
+
+####################
+# 썸네일/WebP 파생 이미지 (user-015)
+####################
+def png_bytes(width, height):
+    import io
+    from PIL import Image
+    out = io.BytesIO()
+    Image.new('RGB', (width, height), 'red').save(out, 'PNG')
+    return out.getvalue()
+
+
+@override_settings(**S3_SETTINGS, IMAGE_DERIVATIVE_WIDTHS=[320, 640])
+class ImageDerivativeTests(TestCase):
+    def setUp(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from . import derivatives
+        # 테스트에서는 프로세스 풀 대신 스레드 풀 (같은 render 를 실행), S3 는 dict 로
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(self.executor.shutdown)
+        self.objects = {}
+        for target, kwargs in (
+            (derivatives, {'get_pool': mock.Mock(return_value=self.executor)}),
+            (derivatives.storage, {
+                'get_object_bytes': mock.Mock(side_effect=lambda key: self.objects[key]),
+                'put_object': mock.Mock(side_effect=lambda key, body, content_type: self.objects.__setitem__(key, body)),
+            }),
+        ):
+            patcher = mock.patch.multiple(target, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.user = make_user()
+        self.board = Board.objects.create(author=self.user, title='제목', content='본문')
+
+    def add_image(self, name, data):
+        from .models import BoardImage
+        key = f'user_uploads/{self.user.id}/{name}'
+        if data is not None:
+            self.objects[key] = data
+        return BoardImage.objects.create(board=self.board, image=s3_url(key))
+
+    def run_command(self, *args):
+        from io import StringIO
+        from django.core.management import call_command
+        call_command('build_image_derivatives', *args, stdout=StringIO())
+
+    def test_build_renders_webp_variants(self):
+        from .derivatives import build
+        key = f'user_uploads/{self.user.id}/wide.png'
+        self.objects[key] = png_bytes(1000, 500)
+        [info] = build([s3_url(key)])
+        self.assertEqual((info['width'], info['height']), (1000, 500))
+        self.assertEqual([(v['width'], v['height']) for v in info['variants']], [(320, 160), (640, 320)])
+        self.assertEqual(info['variants'][0]['url'], s3_url(key + '.w320.webp'))
+        self.assertEqual(self.objects[key + '.w320.webp'][8:12], b'WEBP')
+
+    def test_small_and_broken_images(self):
+        from .derivatives import build
+        small, broken = (f'user_uploads/{self.user.id}/{name}' for name in ('small.png', 'broken.png'))
+        self.objects.update({small: png_bytes(100, 80), broken: b'not an image'})
+        small_info, broken_info, outside = build([s3_url(small), s3_url(broken), 'https://example.com/a.png'])
+        # 가장 작은 폭보다 작으면 원본 크기 하나만
+        self.assertEqual([v['width'] for v in small_info['variants']], [100])
+        self.assertIn('error', broken_info)
+        self.assertIn('error', outside)
+
+    def test_serializer_thumbnail_and_srcset(self):
+        from .serializers import BoardImageSerializer
+        image = self.add_image('a.png', png_bytes(1000, 1000))
+        data = BoardImageSerializer(image).data
+        # 아직 없으면 원본
+        self.assertEqual((data['thumbnail_url'], data['srcset']), (image.image, ''))
+        self.run_command()
+        image.refresh_from_db()
+        data = BoardImageSerializer(image).data
+        self.assertEqual(data['thumbnail_url'], image.image + '.w320.webp')
+        self.assertEqual(data['srcset'], f'{image.image}.w320.webp 320w, {image.image}.w640.webp 640w')
+
+    def test_command_processes_every_batch(self):
+        from .models import BoardImage
+        for i in range(5):
+            self.add_image(f'{i}.png', png_bytes(400, 400))
+        self.run_command('--batch-size', '2')
+        self.assertFalse(BoardImage.objects.filter(derivatives__isnull=True).exists())
+
+    def test_transient_failures_do_not_starve_the_queue(self):
+        from .models import BoardImage
+        # 파생 이미지 업로드가 매번 실패하는(일시적 실패 = None) 이미지가 앞쪽 pk 를 차지
+        stuck = [self.add_image(f'stuck{i}.png', png_bytes(400, 400)).pk for i in range(2)]
+        fresh = self.add_image('fresh.png', png_bytes(400, 400))
+
+        def put_object(key, body, content_type):
+            if 'stuck' in key:
+                raise OSError('S3 down')
+            self.objects[key] = body
+
+        def attempts():
+            return list(BoardImage.objects.filter(pk__in=stuck).values_list('derivative_attempts', flat=True))
+
+        with mock.patch('community.derivatives.storage.put_object', side_effect=put_object):
+            self.run_command('--batch-size', '2', '--max-attempts', '3')
+            # 성공한 것이 없으면 멈춤 (S3 장애 중에 바로 다시 돌지 않음)
+            self.assertEqual(attempts(), [1, 1])
+            fresh.refresh_from_db()
+            self.assertIsNone(fresh.derivatives)
+            # 실패한 행이 뒤로 밀려서 다음 실행에서 fresh 가 처리됨
+            self.run_command('--batch-size', '2', '--max-attempts', '3')
+            fresh.refresh_from_db()
+            self.assertIsNotNone(fresh.derivatives)
+            self.run_command('--batch-size', '2', '--max-attempts', '3')
+        # max-attempts 번 실패하면 오류로 기록되어 더 이상 고르지 않음
+        self.assertEqual(
+            list(BoardImage.objects.filter(pk__in=stuck).values_list('derivatives', flat=True)),
+            [{'error': '3회 실패'}] * 2,
+        )
+        self.assertFalse(BoardImage.objects.filter(derivatives__isnull=True).exists())
+
+
+####################
+# 댓글/이미지 수 카운터 (user-018)
+####################
+class ActivityCounterTests(TestCase):
+    def setUp(self):
+        reset_caches()
+        self.user = make_user()
+        self.board = Board.objects.create(author=self.user, title='제목', content='본문')
+
+    def reply(self, **kwargs):
+        from .models import Reply
+        return Reply.objects.create(board=self.board, author=self.user, comment='댓글', **kwargs)
+
+    def test_reply_and_image_counts_follow_changes(self):
+        from .models import BoardImage
+        first = self.reply()
+        self.reply(parent=first)
+        image = BoardImage.objects.create(board=self.board, image='https://example.com/a.png')
+        self.board.refresh_from_db()
+        self.assertEqual((self.board.reply_count, self.board.image_count), (2, 1))
+        self.assertGreaterEqual(self.board.last_activity_at, first.created_at)
+        # 부모 댓글 삭제 시 자식까지 CASCADE
+        first.delete()
+        image.delete()
+        self.board.refresh_from_db()
+        self.assertEqual((self.board.reply_count, self.board.image_count), (0, 0))
+
+    def test_deleting_board_skips_counter_updates(self):
+        self.reply()
+        self.board.delete()
+        self.assertFalse(Board.objects.exists())
+
+    def test_repair_fixes_drift_and_invalidates_caches(self):
+        from io import StringIO
+        from django.core.management import call_command
+        self.reply()
+        Board.objects.filter(pk=self.board.pk).update(reply_count=7)  # 어긋난 카운터
+        client = client_for(self.user)
+        # 어긋난 값이 목록 조각 캐시와 ETag 에 들어감
+        listed = client.get('/api/boards/')
+        self.assertEqual(listed.data['results'][0]['reply_count'], 7)
+        before = Board.objects.values('version', 'updated_at').get(pk=self.board.pk)
+
+        call_command('repair_activity_counters', stdout=StringIO())
+        after = Board.objects.values('reply_count', 'version', 'updated_at').get(pk=self.board.pk)
+        self.assertEqual(after['reply_count'], 1)
+        self.assertGreater(after['version'], before['version'])
+        self.assertGreater(after['updated_at'], before['updated_at'])
+        relisted = client.get('/api/boards/', HTTP_IF_NONE_MATCH=listed['ETag'])
+        self.assertEqual(relisted.status_code, 200)
+        self.assertEqual(relisted.data['results'][0]['reply_count'], 1)
+
+    def test_recompute_activity(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from django.utils import timezone
+        Board.objects.filter(pk=self.board.pk).update(last_activity_at=timezone.now() + timezone.timedelta(days=1))
+        call_command('repair_activity_counters', '--recompute-activity', stdout=StringIO())
+        self.board.refresh_from_db()
+        self.assertEqual(self.board.last_activity_at, self.board.post_date)
+
+
+####################
+# 목록 필드 선택 ?fields= / ?expand= (user-019)
+####################
+class FieldSelectionTests(TestCase):
+    def setUp(self):
+        from .models import BoardImage, Reply
+        reset_caches()
+        self.user = make_user()
+        self.client = client_for(self.user)
+        self.board = Board.objects.create(author=self.user, title='제목', content='본문 ' * 80)
+        for name in ('a.png', 'b.png'):
+            BoardImage.objects.create(board=self.board, image=f'https://example.com/{name}')
+        root = Reply.objects.create(board=self.board, author=self.user, comment='댓글')
+        Reply.objects.create(board=self.board, author=self.user, comment='대댓글', parent=root)
+
+    def first_row(self, query=''):
+        response = self.client.get(f'/api/boards/{query}')
+        self.assertEqual(response.status_code, 200)
+        return response.data['results'][0]
+
+    def test_compact_list_shape(self):
+        row = self.first_row()
+        self.assertNotIn('content', row)
+        self.assertNotIn('replies', row)
+        self.assertEqual([image['image'] for image in row['images']], ['https://example.com/a.png'])
+        self.assertEqual(row['thumbnail_url'], 'https://example.com/a.png')
+        self.assertLessEqual(len(row['excerpt']), 100)
+        self.assertEqual(row['reply_count'], 2)
+
+    def test_expand_restores_nested_data(self):
+        row = self.first_row('?expand=replies,images')
+        detail = self.client.get(f'/api/boards/{self.board.pk}/').data
+        self.assertEqual(len(row['images']), 2)
+        self.assertEqual(row['images'], detail['images'])
+        self.assertEqual(row['replies'], detail['replies'])
+        self.assertEqual(row['replies'][0]['children'][0]['comment'], '대댓글')
+        # 한쪽만 펼치면 다른 쪽은 요약 그대로
+        row = self.first_row('?expand=replies')
+        self.assertEqual(len(row['images']), 1)
+        self.assertIn('replies', row)
+
+    def test_fields_on_list_and_detail(self):
+        self.assertEqual(set(self.first_row('?fields=id,title')), {'id', 'title'})
+        detail = self.client.get(f'/api/boards/{self.board.pk}/?fields=id,content')
+        self.assertEqual(set(detail.data), {'id', 'content'})
+        # ?fields= 와 ?expand= 를 같이 쓰면 펼친 필드도 포함
+        self.assertEqual(set(self.first_row('?fields=id&expand=images')), {'id', 'images'})
+
+    def test_unknown_names_are_ignored(self):
+        # 모르는 이름은 ?fields= / ?expand= 모두 조용히 무시 (400 없음)
+        self.assertEqual(set(self.first_row('?fields=id,bogus')), {'id'})
+        self.assertEqual(self.first_row('?fields=bogus'), {})
+        self.assertEqual(self.first_row('?expand=bogus'), self.first_row())
+        detail = self.client.get(f'/api/boards/{self.board.pk}/?fields=id,bogus')
+        self.assertEqual(set(detail.data), {'id'})
+
+    def test_write_response_is_not_trimmed(self):
+        response = self.client.post('/api/boards/?fields=id', {'title': '새 글', 'content': '본문'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('content', response.data)
+        self.assertIn('replies', response.data)
+
+
+####################
+# 게시글 목록 조각 캐시 (user-020)
+####################
+class BoardFragmentCacheTests(TestCase):
+    def setUp(self):
+        reset_caches()
+        self.user = make_user()
+        self.other = make_user('other')
+        self.board = Board.objects.create(author=self.user, title='처음 제목', content='본문')
+
+    def first_row(self, user):
+        response = client_for(user).get('/api/boards/')
+        self.assertEqual(response.status_code, 200)
+        return response.data['results'][0]
+
+    def test_cached_cards_skip_prefetch(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as cold:
+            self.first_row(self.user)
+        with CaptureQueriesContext(connection) as warm:
+            self.first_row(self.user)
+        # 두 번째는 이미지/작성자 prefetch 없이 캐시된 조각 사용
+        self.assertLess(len(warm), len(cold))
+        self.assertFalse(any('community_boardimage' in query['sql'] for query in warm.captured_queries))
+
+    def test_edit_invalidates_fragment(self):
+        self.assertEqual(self.first_row(self.user)['title'], '처음 제목')
+        self.board.title = '바뀐 제목'
+        self.board.save()
+        self.assertEqual(self.first_row(self.user)['title'], '바뀐 제목')
+
+    def test_per_user_overlay(self):
+        client_for(self.other).post(f'/api/boards/{self.board.pk}/like/')
+        mine = self.first_row(self.user)
+        theirs = self.first_row(self.other)
+        self.assertFalse(mine['recommended_by_me'])
+        self.assertTrue(theirs['recommended_by_me'])
+        self.assertEqual(mine['recommend_count'], 1)
+
+    def test_reconcile_invalidates_fragment(self):
+        from io import StringIO
+        from django.core.management import call_command
+        Board.objects.filter(pk=self.board.pk).update(recommend_count=5)  # 어긋난 추천수
+        self.assertEqual(self.first_row(self.user)['recommend_count'], 5)
+        call_command('reconcile_recommend_counts', stdout=StringIO())
+        self.assertEqual(self.first_row(self.user)['recommend_count'], 0)
+
+
+####################
+# 조건부 GET - ETag / Last-Modified (user-021)
+####################
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        reset_caches()
+        self.user = make_user()
+        self.client = client_for(self.user)
+        self.board = Board.objects.create(author=self.user, title='제목', content='본문')
+        self.url = f'/api/boards/{self.board.pk}/'
+
+    def revalidate(self, url, etag):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_detail_and_list_return_304_when_unchanged(self):
+        for url in (self.url, '/api/boards/'):
+            first = self.client.get(url)
+            self.assertEqual(first.status_code, 200)
+            self.assertIn('private', first['Cache-Control'])
+            response = self.revalidate(url, first['ETag'])
+            self.assertEqual(response.status_code, 304, url)
+            self.assertEqual(response['ETag'], first['ETag'])
+
+    def test_feedback_and_notice_detail(self):
+        from .models import Feedback, Notice
+        feedback = Feedback.objects.create(user=self.user, title='피드백', content='본문')
+        notice = Notice.objects.create(user=self.user, title='공지', content='본문')
+        for url in (f'/api/feedbacks/{feedback.pk}/', f'/api/notices/{notice.pk}/'):
+            first = self.client.get(url)
+            self.assertEqual(first.status_code, 200, url)
+            self.assertEqual(self.revalidate(url, first['ETag']).status_code, 304, url)
+
+    def test_changes_produce_new_etag(self):
+        from .models import Reply
+        etag = self.client.get(self.url)['ETag']
+        Reply.objects.create(board=self.board, author=self.user, comment='댓글')
+        response = self.revalidate(self.url, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['reply_count'], 1)
+
+    def test_my_like_changes_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        self.client.post(f'/api/boards/{self.board.pk}/like/')
+        response = self.revalidate(self.url, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['recommended_by_me'])
+
+    def test_reconcile_changes_etag(self):
+        from io import StringIO
+        from django.core.management import call_command
+        Board.objects.filter(pk=self.board.pk).update(recommend_count=3)
+        etag = self.client.get(self.url)['ETag']
+        call_command('reconcile_recommend_counts', stdout=StringIO())
+        response = self.revalidate(self.url, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['recommend_count'], 0)
+
+
+    def test_non_numeric_pk_is_404(self):
+        for url in ('/api/boards/abc/', '/api/feedbacks/abc/', '/api/notices/abc/', '/api/bestboards/abc/'):
+            self.assertEqual(self.client.get(url).status_code, 404, url)
+
+    def test_built_derivatives_change_etag(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from .models import BoardImage, Feedback, FeedbackImage, Notice, NoticeImage
+        feedback = Feedback.objects.create(user=self.user, title='피드백', content='본문')
+        notice = Notice.objects.create(user=self.user, title='공지', content='본문')
+        BoardImage.objects.create(board=self.board, image=s3_url('user_uploads/1/a.png'))
+        FeedbackImage.objects.create(feedback=feedback, image=s3_url('user_uploads/1/b.png'))
+        NoticeImage.objects.create(notice=notice, image=s3_url('user_uploads/1/c.png'))
+        urls = [self.url, f'/api/feedbacks/{feedback.pk}/', f'/api/notices/{notice.pk}/']
+        etags = [self.client.get(url)['ETag'] for url in urls]
+        info = {'width': 10, 'height': 10, 'variants': [{'width': 10, 'height': 10, 'url': s3_url('x.w10.webp')}]}
+        with mock.patch('community.derivatives.build', side_effect=lambda urls: [info] * len(urls)):
+            call_command('build_image_derivatives', stdout=StringIO())
+        for url, etag in zip(urls, etags):
+            response = self.revalidate(url, etag)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertEqual(response.data['images'][0]['srcset'], f"{s3_url('x.w10.webp')} 10w")
+
+
+####################
+# last_login 모아서 기록 (user-023)
+####################
+class LastLoginTests(TestCase):
+    def setUp(self):
+        from django.utils import timezone
+        from .last_login import LastLoginBuffer
+        self.buffer = LastLoginBuffer()
+        # 테스트에서는 flush 를 직접 호출
+        self.buffer._ensure_flusher = lambda: None
+        self.users = [make_user('kim'), make_user('lee')]
+        self.now = timezone.now()
+
+    def last_logins(self):
+        return dict(User.objects.values_list('username', 'last_login'))
+
+    def test_flush_keeps_latest_per_user(self):
+        from django.utils import timezone
+        kim, lee = self.users
+        earlier = self.now - timezone.timedelta(minutes=1)
+        self.buffer.record(kim, self.now)
+        self.buffer.record(kim, earlier)
+        self.buffer.record(lee, earlier)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.buffer.flush(), 2)
+        self.assertEqual(self.last_logins(), {'kim': self.now, 'lee': earlier})
+        self.assertEqual(self.buffer.flush(), 0)
+
+    def test_older_time_does_not_overwrite(self):
+        # 다른 워커가 이미 더 최근 시각을 기록한 경우
+        from django.utils import timezone
+        from .last_login import write_last_logins
+        kim, lee = self.users
+        User.objects.filter(pk=kim.pk).update(last_login=self.now)
+        earlier = self.now - timezone.timedelta(minutes=1)
+        self.assertEqual(write_last_logins({kim.pk: earlier, lee.pk: earlier}), 1)
+        self.assertEqual(self.last_logins(), {'kim': self.now, 'lee': earlier})
+
+    def test_failed_flush_is_retried(self):
+        from django.db import OperationalError
+        kim = self.users[0]
+        self.buffer.record(kim, self.now)
+        with mock.patch('community.last_login.write_last_logins', side_effect=OperationalError('down')):
+            with self.assertRaises(OperationalError):
+                self.buffer.flush()
+        self.assertEqual(self.buffer.flush(), 1)
+        self.assertEqual(self.last_logins()['kim'], self.now)
+
+    def test_login_defers_last_login(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from . import password_pool
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        with mock.patch.object(password_pool, 'get_pool', return_value=executor), \
+                mock.patch('community.views_auth.last_logins', self.buffer):
+            response = self.client.post(
+                '/api/token/', {'username': 'kim', 'password': 'pass1234!'}, content_type='application/json'
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(self.last_logins()['kim'])
+        self.buffer.flush()
+        self.assertIsNotNone(self.last_logins()['kim'])
+
+
+####################
+# 비밀번호 해시 프로세스 풀 (user-024)
+####################
+class BrokenPool:
+    def __init__(self):
+        self.shut_down = False
+
+    def submit(self, fn, *args):
+        from concurrent.futures import Future
+        from concurrent.futures.process import BrokenProcessPool
+        future = Future()
+        future.set_exception(BrokenProcessPool('worker died'))
+        return future
+
+    def shutdown(self, wait=True):
+        self.shut_down = True
+
+
+class PasswordPoolTests(TestCase):
+    def setUp(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from . import password_pool
+        # 테스트에서는 spawn 대신 스레드 풀 (같은 함수를 실행)
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        patcher = mock.patch.object(password_pool, 'get_pool', return_value=self.executor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.executor.shutdown)
+        self.user = make_user()
+
+    def login(self, password='pass1234!'):
+        return self.client.post(
+            '/api/token/', {'username': 'tester', 'password': password}, content_type='application/json'
+        )
+
+    def test_login_issues_tokens(self):
+        response = self.login()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()), {'access', 'refresh'})
+        self.assertEqual(self.login('wrong').status_code, 401)
+
+    def test_saturated_pool_returns_429(self):
+        with self.settings(AUTH_HASH_WORKERS=0, AUTH_HASH_MAX_QUEUE=0, AUTH_HASH_RETRY_AFTER=3):
+            response = self.login()
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '3')
+
+    def test_broken_pool_is_rebuilt(self):
+        from asgiref.sync import async_to_sync
+        from . import password_pool
+        broken = BrokenPool()
+        password_pool._pool = broken
+        with mock.patch.object(password_pool, 'get_pool', side_effect=[broken, self.executor]):
+            valid, _ = async_to_sync(password_pool.verify_password)('pass1234!', self.user.password)
+        self.assertTrue(valid)
+        self.assertTrue(broken.shut_down)
+        self.assertIsNone(password_pool._pool)
+
+    def test_register_hashes_in_pool(self):
+        response = self.client.post('/api/register/', {
+            'username': 'newbie', 'email': 'newbie@example.com', 'password': 'pass1234!',
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertTrue(User.objects.get(username='newbie').check_password('pass1234!'))
+
+
+####################
+# S3 클라이언트/presigned 업로드 URL (user-010)
+####################
+@override_settings(**S3_SETTINGS)
+class PresignedUploadTests(TestCase):
+    def setUp(self):
+        from . import storage
+        # 설정이 바뀌었으므로 프로세스 클라이언트를 새로 만들게 함
+        storage._client = None
+        self.addCleanup(setattr, storage, '_client', None)
+        self.user = make_user()
+        self.client = client_for(self.user)
+
+    def test_single_presign_records_pending_upload(self):
+        from .models import PendingUpload
+        response = self.client.post('/api/s3-presigned-upload/', {'file_name': 'a.png', 'file_type': 'image/png'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['s3_url'].startswith(s3_url(f'user_uploads/{self.user.id}/')))
+        self.assertNotIn('x-amz-acl', response.data['url'])
+        self.assertEqual(PendingUpload.objects.get().user, self.user)
+
+    def test_client_is_shared_per_process(self):
+        from . import storage
+        self.assertIs(storage.get_client(), storage.get_client())
+
+
+####################
+# presigned 업로드 URL 일괄 발급 (user-011)
+####################
+@override_settings(**S3_SETTINGS, S3_PRESIGN_MAX_FILES=5, S3_UPLOAD_MAX_BYTES=1000)
+class BatchPresignTests(TestCase):
+    url = '/api/s3-presigned-upload/batch/'
+
+    def setUp(self):
+        from . import storage
+        storage._client = None
+        self.addCleanup(setattr, storage, '_client', None)
+        self.user = make_user()
+        self.client = client_for(self.user)
+
+    def files(self, count, **extra):
+        return [{'file_name': f'{i}.png', 'file_type': 'image/png', **extra} for i in range(count)]
+
+    def test_put_urls_for_every_file(self):
+        from .models import PendingUpload
+        response = self.client.post(self.url, {'files': self.files(3, size=100)}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['method'], 'put')
+        uploads = response.data['uploads']
+        self.assertEqual([upload['file_name'] for upload in uploads], ['0.png', '1.png', '2.png'])
+        self.assertEqual(len({upload['s3_url'] for upload in uploads}), 3)
+        for upload in uploads:
+            self.assertTrue(upload['s3_url'].startswith(s3_url(f'user_uploads/{self.user.id}/')))
+            self.assertIn('X-Amz-Signature=', upload['url'])
+        self.assertEqual(
+            set(PendingUpload.objects.filter(user=self.user).values_list('key', flat=True)),
+            {upload['s3_url'].split('.amazonaws.com/')[1] for upload in uploads},
+        )
+
+    def test_post_policies_carry_size_limit(self):
+        response = self.client.post(
+            self.url, {'files': [*self.files(1, size=100), *self.files(1)], 'method': 'post'}, format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        limits = []
+        for upload in response.data['uploads']:
+            self.assertEqual(upload['fields']['Content-Type'], 'image/png')
+            policy = json.loads(base64.b64decode(upload['fields']['policy']))
+            limits.extend(c for c in policy['conditions'] if isinstance(c, list) and c[0] == 'content-length-range')
+        # size 가 없으면 S3_UPLOAD_MAX_BYTES 까지
+        self.assertEqual(limits, [['content-length-range', 1, 100], ['content-length-range', 1, 1000]])
+
+    def test_signed_with_one_client(self):
+        from . import storage
+        with mock.patch.object(storage, '_create_client', wraps=storage._create_client) as new_client:
+            self.client.post(self.url, {'files': self.files(5)}, format='json')
+            self.client.post(self.url, {'files': self.files(5)}, format='json')
+        self.assertEqual(new_client.call_count, 1)
+
+    def test_validation(self):
+        from .models import PendingUpload
+        for body in ({'files': []}, {'files': 'a.png'}, {'files': [{'file_name': 'a.png'}]},
+                     {'files': self.files(6)},
+                     {'files': self.files(1, size=0)}, {'files': self.files(1, size=1001)},
+                     {'files': self.files(1, size='100')}, {'files': self.files(1, size=True)},
+                     {'files': self.files(1), 'method': 'get'}):
+            response = self.client.post(self.url, body, format='json')
+            self.assertEqual(response.status_code, 400, body)
+        self.assertFalse(PendingUpload.objects.exists())
+
+    def test_requires_login(self):
+        response = APIClient().post(self.url, {'files': self.files(1)}, format='json')
+        self.assertIn(response.status_code, (401, 403))
+
+
+####################
+# presigned GET URL 캐시 (user-017)
+####################
+@override_settings(**{**S3_SETTINGS, 'AWS_S3_PRESIGNED_GET': True},
+                   AWS_S3_PRESIGNED_GET_EXPIRES=3600, AWS_S3_PRESIGNED_GET_REFRESH=900)
+class PresignedGetUrlTests(TestCase):
+    def setUp(self):
+        from . import storage
+        storage._client = None
+        self.addCleanup(setattr, storage, '_client', None)
+        storage.presigned_get_cache.clear()
+        self.addCleanup(storage.presigned_get_cache.clear)
+        self.now = 1_000_000.0
+        patcher = mock.patch('time.time', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def sign(self, key='user_uploads/1/a.png'):
+        from . import storage
+        return storage.signed_url(s3_url(key))
+
+    def test_cache_hit_reuses_url(self):
+        from . import storage
+        client = storage.get_client()
+        with mock.patch.object(client, 'generate_presigned_url', wraps=client.generate_presigned_url) as presign:
+            first = self.sign()
+            self.assertEqual(self.sign(), first)
+            self.sign('user_uploads/1/b.png')
+        self.assertEqual(presign.call_count, 2)
+        self.assertIn('X-Amz-Signature=', first)
+        self.assertTrue(first.startswith(s3_url('user_uploads/1/a.png') + '?'))
+
+    def test_resigned_before_url_expires(self):
+        from . import storage
+        with mock.patch.object(storage.get_client(), 'generate_presigned_url', side_effect=['url-1', 'url-2']):
+            first = self.sign()
+            # EXPIRES(3600) - REFRESH(900) 초까지는 같은 URL, 그 뒤로는 만료 전에 새로 서명
+            self.now += 2699
+            self.assertEqual(self.sign(), first)
+            self.now += 2
+            self.assertEqual(self.sign(), 'url-2')
+
+    def test_disabled_and_foreign_urls_pass_through(self):
+        from . import storage
+        self.assertEqual(storage.signed_url('https://example.com/a.png'), 'https://example.com/a.png')
+        with self.settings(AWS_S3_PRESIGNED_GET=False):
+            self.assertEqual(self.sign(), s3_url('user_uploads/1/a.png'))
+
+    def test_cache_evicts_stale_then_least_recently_used(self):
+        from .storage import PresignedUrlCache
+        cache = PresignedUrlCache(2)
+        cache.put('stale', 'u0', refresh_at=10, now=0)
+        cache.put('a', 'u1', refresh_at=100, now=0)
+        cache.put('b', 'u2', refresh_at=100, now=20)  # stale 가 먼저 빠짐
+        self.assertEqual((cache.get('stale', 20), cache.get('a', 20)), (None, 'u1'))
+        cache.put('c', 'u3', refresh_at=100, now=20)  # 가장 오래 안 쓴 b 가 빠짐
+        self.assertEqual((cache.get('a', 20), cache.get('b', 20), cache.get('c', 20)), ('u1', None, 'u3'))
+
+    def test_presign_epoch_changes_etag_each_refresh_period(self):
+        from .conditional import presign_epoch
+        epoch = presign_epoch()
+        self.assertNotEqual(epoch, '')
+        self.now += 900
+        self.assertNotEqual(presign_epoch(), epoch)
+        with self.settings(AWS_S3_PRESIGNED_GET=False):
+            self.assertEqual(presign_epoch(), '')
+
+    def test_detail_etag_changes_after_refresh_period(self):
+        reset_caches()
+        user = make_user()
+        board = Board.objects.create(author=user, title='제목', content='본문')
+        client = client_for(user)
+        url = f'/api/boards/{board.pk}/'
+        etag = client.get(url)['ETag']
+        self.assertEqual(client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.now += 900
+        self.assertEqual(client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+####################
+# 아이디/이메일 중복 확인 (user-025)
+####################
+class AvailabilityTests(TestCase):
+    def setUp(self):
+        from .availability import recent_answers, taken_index
+        reset_caches()
+        recent_answers.clear()
+        taken_index.rebuild()
+        make_user('tester', email='Tester@Example.com')
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        from .availability import BloomFilter
+        bloom = BloomFilter(100)
+        values = [f'user{i}' for i in range(100)]
+        for value in values:
+            bloom.add(value)
+        self.assertTrue(all(value in bloom for value in values))
+        false_positives = sum(f'other{i}' in bloom for i in range(1000))
+        self.assertLess(false_positives, 50)
+
+    def test_check_ignores_case(self):
+        for url, value in (('/api/user/check-username/?username=', 'TESTER'),
+                           ('/api/user/check-email/?email=', ' tester@example.COM ')):
+            self.assertTrue(self.client.get(url + value).json()['exists'], url)
+        self.assertFalse(self.client.get('/api/user/check-username/?username=nobody').json()['exists'])
+
+    def test_new_user_is_taken_immediately(self):
+        from .availability import is_taken
+        self.assertFalse(is_taken('username', 'newbie'))
+        make_user('newbie')
+        self.assertTrue(is_taken('username', 'NewBie'))
+
+    def test_register_rejects_case_variants(self):
+        from .serializers import RegisterSerializer
+        serializer = RegisterSerializer(data={'username': 'TESTER', 'email': 'TESTER@example.com', 'password': 'pass1234!'})
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(set(serializer.errors), {'username', 'email'})
+        serializer = RegisterSerializer(data={'username': 'newbie', 'email': '', 'password': 'pass1234!'})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
@@ -4,10 +4,11 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     BoardViewSet, RecommendViewSet, BoardLikeView, FeedbackViewSet, FeedbackImageUploadView, FeedbackReplyViewSet,
     BestBoardViewSet, NoticeViewSet, ReplyViewSet, ScoreViewSet, ErrorLogViewSet, BoardImageUploadView, UserViewSet, 
-    RegisterView, current_user, user_list, UserViewSet, NotificationViewSet, NoticeReplyViewSet, NoticeImageUploadView
+    current_user, user_list, UserViewSet, NotificationViewSet, NoticeReplyViewSet, NoticeImageUploadView
 )
 from . import views
-from .views_presigned import s3_presigned_upload
+from .views_auth import auth_hash_metrics, register_view, set_password_view
+from .views_presigned import s3_presigned_upload, s3_presigned_upload_batch
 
 
 router = DefaultRouter()
@@ -26,11 +27,15 @@ router.register(r'errors', ErrorLogViewSet)
 
 urlpatterns = [
     path('s3-presigned-upload/', s3_presigned_upload, name='s3-presigned-upload'),
+    path('s3-presigned-upload/batch/', s3_presigned_upload_batch, name='s3-presigned-upload-batch'),
+    path('storage-metrics/', views.storage_metrics, name='storage-metrics'),
+    path('auth-metrics/', auth_hash_metrics, name='auth-metrics'),
     path('boards/upload/', BoardImageUploadView.as_view(), name='board-image-upload'),
     path('boards/<int:pk>/like/', BoardLikeView.as_view(), name='board-like'),
     path('feedbacks/upload/', FeedbackImageUploadView.as_view(), name='feedback-image-upload'),
     path('notices/upload/', NoticeImageUploadView.as_view(), name='notice-image-upload'),    
-    path('register/', RegisterView.as_view(), name='register'),
+    path('register/', register_view, name='register'),
+    path('users/<int:pk>/set_password/', set_password_view, name='user-set-password'),  # router 보다 위
     path('users/list/', user_list, name='user-list'),
     path('user/check-username/', views.check_username, name='check-username'),
     path('user/check-email/', views.check_email),    
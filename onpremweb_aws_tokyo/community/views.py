@@ -1,32 +1,40 @@
 # onpremweb_aws/community/views.py
-from rest_framework import serializers
-from rest_framework import viewsets, generics, status, filters
+from rest_framework import viewsets, status, filters
 from rest_framework.permissions import IsAdminUser, IsAuthenticated, BasePermission
 from rest_framework.decorators import api_view, permission_classes, action
+from rest_framework.exceptions import NotFound
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Prefetch
 from django.http import HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt, ensure_csrf_cookie
-from rest_framework_simplejwt.views import TokenObtainPairView
 from .models import (
     Board, BoardImage, BestBoard, Notice, Feedback, FeedbackReply, FeedbackImage, Analysis,
-    Recommend, Reply, Score, ErrorLog, Notification, NoticeReply, NoticeImage
+    Recommend, Reply, Score, ErrorLog, Notification, NotificationOutbox, NoticeReply, NoticeImage
 )
 from .serializers import (
     BoardSerializer, BoardImageSerializer, BestBoardSerializer, NoticeSerializer, FeedbackSerializer,
     FeedbackReplySerializer, FeedbackImageSerializer, AnalysisSerializer, RecommendSerializer, ReplySerializer,
-    ScoreSerializer, ErrorLogSerializer, RegisterSerializer, UserSimpleSerializer, UserDetailSerializer,
+    ScoreSerializer, ErrorLogSerializer, UserSimpleSerializer, UserDetailSerializer,
     NotificationSerializer, NoticeReplySerializer, NoticeImageSerializer
 )
+from .attachments import AttachmentError, attach_images
+from .availability import is_taken
+from .conditional import ConditionalGetMixin
+from .likes import BoardNotFound, like_board, unlike_board
+from .notification_stream import issue_stream_ticket, stream_ticket_ttl
+from .outbox import enqueue_reply_event
+from .pagination import KeysetPagination
 from .permissions import IsAdminOrReadWriteBoard, IsAdminOrReadOnly
-import boto3
-import uuid
-
-### JWT Token View
-token_obtain_pair_view = TokenObtainPairView.as_view()
+from .ranking import update_best_board
+from .search import KoreanSearchFilter
+from . import fieldsets, fragments, storage
 
 ### CSRF 테스트용
 @ensure_csrf_cookie
@@ -34,69 +42,32 @@ def test_csrf_view(request):
     return JsonResponse({"result": "ok"})
 
 ####################
-# S3 Presigned URL (프론트가 직접 업로드)
+# S3 클라이언트 통계 (presigned 업로드 URL 발급은 views_presigned.py)
 ####################
-@api_view(['POST'])
-@permission_classes([IsAuthenticated])
-def s3_presigned_upload(request):
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def storage_metrics(request):
     """
-    파일명/타입을 받아 S3 presigned 업로드 URL 반환 (프론트가 직접 S3에 업로드)
+    이 워커 프로세스의 S3 클라이언트 생성/호출 통계
     """
-    file_name = request.data['file_name']
-    file_type = request.data['file_type']
-    s3_key = f"user_uploads/{request.user.id}/{uuid.uuid4()}_{file_name}"
-    s3 = boto3.client(
-        's3',
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        region_name=settings.AWS_REGION
-    )
-    url = s3.generate_presigned_url(
-        ClientMethod='put_object',
-        Params={
-            'Bucket': settings.AWS_S3_BUCKET,
-            'Key': s3_key,
-            'ContentType': file_type,
-            'ACL': 'public-read'
-        },
-        ExpiresIn=300,
-        HttpMethod='PUT'
-    )
-    return Response({
-        'url': url,
-        's3_url': f"https://{settings.AWS_S3_BUCKET}.s3.{settings.AWS_REGION}.amazonaws.com/{s3_key}"
-    })
-
-####################
-# S3 이미지 삭제
-####################
-def delete_s3_file(s3_key):
-    s3 = boto3.client(
-        's3',
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        region_name=settings.AWS_REGION
-    )
-    s3.delete_object(Bucket=settings.AWS_S3_BUCKET, Key=s3_key)
+    return Response(storage.metrics.snapshot())
 
 ####################
 # 유저 관련 기능
 ####################
 @api_view(['GET'])
 def check_username(request):
-    username = request.GET.get('username', '')
-    exists = User.objects.filter(username=username).exists()
-    return Response({'exists': exists})
+    # 대소문자 무시, 대부분은 Bloom filter 만으로 응답 (availability.py)
+    return Response({'exists': is_taken('username', request.GET.get('username', ''))})
 
 @api_view(['GET'])
 def check_email(request):
-    email = request.GET.get('email', '')
-    exists = User.objects.filter(email=email).exists()
-    return Response({'exists': exists})
+    return Response({'exists': is_taken('email', request.GET.get('email', ''))})
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def current_user(request):
+    # request.user 는 CachedJWTAuthentication 의 캐시에서 온 것이라 추가 쿼리 없음
     serializer = UserDetailSerializer(request.user)
     return Response(serializer.data)
 
@@ -114,78 +85,154 @@ class NotificationViewSet(viewsets.ModelViewSet):
     queryset = Notification.objects.all()
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         return Notification.objects.filter(to_user=self.request.user).order_by('-created_at')
 
     @action(detail=True, methods=['post'])
     def mark_read(self, request, pk=None):
-        notif = self.get_object()
-        notif.is_read = True
-        notif.save()
+        # 조회 + save() 대신 UPDATE 1번 (내 알림이 아니거나 숫자가 아닌 pk 면 404)
+        if not str(pk).isdigit():
+            raise NotFound()
+        updated = Notification.objects.filter(pk=pk, to_user=request.user).update(is_read=True)
+        if not updated:
+            raise NotFound()
         return Response({'status': '읽음'})
 
+    @action(detail=False, methods=['post'], url_path='mark_read')
+    def mark_many_read(self, request):
+        """
+        {"ids": [1, 2, 3]} 로 받은 알림들을 UPDATE 1번으로 읽음 처리
+        """
+        ids = request.data.get('ids')
+        if not isinstance(ids, list) or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+            return Response({'error': 'ids는 정수 리스트여야 합니다.'}, status=400)
+        updated = Notification.objects.filter(
+            to_user=request.user, pk__in=ids, is_read=False
+        ).update(is_read=True)
+        return Response({'updated': updated})
+
+    @action(detail=False, methods=['post'])
+    def mark_all_read(self, request):
+        updated = Notification.objects.filter(to_user=request.user, is_read=False).update(is_read=True)
+        return Response({'updated': updated})
+
+    @action(detail=False, methods=['post'])
+    def stream_ticket(self, request):
+        """
+        SSE(/api/notifications/stream/?ticket=) 연결용 일회용 ticket - 실시간 수신은 SSE 또는 long-poll
+        (/api/notifications/poll/?since=), 둘 다 ASGI 서비스에서 처리 (sse.py)
+        """
+        return Response({'ticket': issue_stream_ticket(request.user.pk), 'expires_in': stream_ticket_ttl()})
+
+    @action(detail=False, methods=['get'])
+    def unread_count(self, request):
+        # 배지 폴링용 - (to_user) WHERE is_read = false 부분 인덱스만 읽음
+        count = Notification.objects.filter(to_user=request.user, is_read=False).count()
+        return Response({'unread_count': count})
+
 ####################
 # Board/Feedback/Notice Image 업로드 - S3 URL을 DB에 저장
 ####################
-class BoardImageUploadView(APIView):
+class ImageAttachmentUploadView(APIView):
+    """
+    {"<owner>_id": ..., "s3_urls": [...]} - 검증/중복제거 후 이미지 행을 한 번에 저장
+    """
     permission_classes = [IsAuthenticated]
-    def post(self, request, *args, **kwargs):
-        board_id = request.data.get('board_id')
-        board = Board.objects.get(id=board_id)
-        # getlist → get
-        s3_urls = request.data.get('s3_urls', [])
-        if not isinstance(s3_urls, list):
-            return Response({'error': 's3_urls는 리스트여야 합니다.'}, status=400)
-        image_objs = [BoardImage.objects.create(board=board, image=url) for url in s3_urls]
-        serializer = BoardImageSerializer(image_objs, many=True)
-        return Response(serializer.data)
+    owner_model = None
+    image_model = None
+    owner_field = None
+    serializer_class = None
 
-class FeedbackImageUploadView(APIView):
-    permission_classes = [IsAuthenticated]
     def post(self, request, *args, **kwargs):
-        feedback_id = request.data.get('feedback_id')
-        feedback = Feedback.objects.get(id=feedback_id)
-        s3_urls = request.data.get('s3_urls', [])
-        if not isinstance(s3_urls, list):
-            return Response({'error': 's3_urls는 리스트여야 합니다.'}, status=400)
-        image_objs = [FeedbackImage.objects.create(feedback=feedback, image=url) for url in s3_urls]
-        serializer = FeedbackImageSerializer(image_objs, many=True)
+        owner = get_object_or_404(self.owner_model, pk=request.data.get(f'{self.owner_field}_id'))
+        try:
+            image_objs = attach_images(
+                request.user, owner, self.image_model, self.owner_field, request.data.get('s3_urls', [])
+            )
+        except AttachmentError as e:
+            return Response({'error': str(e)}, status=400)
+        serializer = self.serializer_class(image_objs, many=True)
         return Response(serializer.data)
 
-class NoticeImageUploadView(APIView):
-    permission_classes = [IsAuthenticated]
-    def post(self, request, *args, **kwargs):
-        notice_id = request.data.get('notice_id')
-        notice = Notice.objects.get(pk=notice_id)
-        s3_urls = request.data.get('s3_urls', [])
-        if not isinstance(s3_urls, list):
-            return Response({'error': 's3_urls는 리스트여야 합니다.'}, status=400)
-        image_objs = [NoticeImage.objects.create(notice=notice, image=url) for url in s3_urls]
-        serializer = NoticeImageSerializer(image_objs, many=True)
-        return Response(serializer.data)
+class BoardImageUploadView(ImageAttachmentUploadView):
+    owner_model = Board
+    image_model = BoardImage
+    owner_field = 'board'
+    serializer_class = BoardImageSerializer
+
+class FeedbackImageUploadView(ImageAttachmentUploadView):
+    owner_model = Feedback
+    image_model = FeedbackImage
+    owner_field = 'feedback'
+    serializer_class = FeedbackImageSerializer
+
+class NoticeImageUploadView(ImageAttachmentUploadView):
+    owner_model = Notice
+    image_model = NoticeImage
+    owner_field = 'notice'
+    serializer_class = NoticeImageSerializer
 
 class BoardImageViewSet(viewsets.ModelViewSet):
     queryset = BoardImage.objects.all()
     serializer_class = BoardImageSerializer
     permission_classes = [IsAuthenticated]
-    def perform_destroy(self, instance):
-        # S3 URL에서 key 추출 후 S3에서 삭제
-        s3_key = instance.image.replace(
-            f"https://{settings.AWS_S3_BUCKET}.s3.{settings.AWS_REGION}.amazonaws.com/", ""
-        )
-        delete_s3_file(s3_key)
-        instance.delete()
+    # S3 파일은 post_delete 시그널(signals.py)이 삭제 대기열에 넣고 drain_storage_deletions 가 지움
 
 ####################
 # 게시글/피드백/공지사항/댓글 CRUD (댓글 생성 시 알림까지)
 ####################
-class BoardViewSet(viewsets.ModelViewSet):
+def post_prefetches(reply_model, view=None):
+    """
+    게시글/피드백/공지 직렬화에 필요한 prefetch 목록
+    view 를 넘기면 응답에 없는 관계(목록의 댓글 트리, ?fields= 로 뺀 이미지)는 읽지 않음
+    """
+    def needed(name):
+        if view is None:
+            return True
+        summary_fields = view.get_serializer_class().summary_fields
+        return fieldsets.includes(view.request, view.action, summary_fields, name)
+
+    prefetches = []
+    if needed('images') or needed('thumbnail_url'):
+        prefetches.append('images')
+    if needed('replies'):
+        prefetches.append(Prefetch('replies', queryset=reply_model.objects.select_related('author')))
+    return prefetches
+
+def with_post_relations(queryset, author_field, reply_model, view=None):
+    """
+    게시글/피드백/공지 목록·상세 직렬화에 필요한 작성자/이미지/전체 댓글을 고정된 쿼리 수로 로딩
+    """
+    return queryset.select_related(author_field).prefetch_related(*post_prefetches(reply_model, view))
+
+class BoardFragmentCacheMixin:
+    """
+    게시글 목록 - 이미지/댓글 prefetch 는 조각 캐시(fragments.py)에 없는 게시글만 BoardListSerializer 에서 수행
+    """
+    def uses_fragment_cache(self):
+        return fragments.enabled() and self.action == 'list'
+
+    def board_queryset(self, queryset):
+        if self.uses_fragment_cache():
+            return queryset.select_related('author')
+        return with_post_relations(queryset, 'author', Reply, self)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.uses_fragment_cache():
+            context['fragment_prefetches'] = post_prefetches(Reply, self)
+        return context
+
+class BoardViewSet(ConditionalGetMixin, BoardFragmentCacheMixin, viewsets.ModelViewSet):
     queryset = Board.objects.all()
     serializer_class = BoardSerializer
     permission_classes = [IsAdminOrReadWriteBoard]
-    filter_backends = [filters.OrderingFilter, filters.SearchFilter]
-    ordering_fields = ['id', 'post_date', 'recommend_count']
+    liked_validator = True
+    pagination_class = KeysetPagination
+    filter_backends = [filters.OrderingFilter, KoreanSearchFilter]
+    ordering_fields = ['id', 'post_date', 'recommend_count', 'last_activity_at', 'reply_count']
     ordering = ['-post_date']
     search_fields = ['title', 'content', 'author__username']
 
@@ -195,7 +242,7 @@ class BoardViewSet(viewsets.ModelViewSet):
         return context
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = self.board_queryset(super().get_queryset())
         my = self.request.query_params.get('my')
         if my and self.request.user.is_authenticated:
             queryset = queryset.filter(author=self.request.user)
@@ -204,34 +251,62 @@ class BoardViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         return serializer.save(author=self.request.user)
 
-class BestBoardViewSet(viewsets.ReadOnlyModelViewSet):
+class BestBoardViewSet(ConditionalGetMixin, BoardFragmentCacheMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    목록은 미리 계산된 BestBoard 랭킹(N개)만 조인해서 순위순으로 반환 (?ranking=best|trending)
+    """
     queryset = Board.objects.all()
     serializer_class = BoardSerializer
     permission_classes = [IsAdminOrReadWriteBoard]
-    filter_backends = [filters.OrderingFilter, filters.SearchFilter]
-    ordering_fields = ['id', 'post_date', 'recommend_count', 'title', 'author__username']
-    ordering = ['-recommend_count']
+    liked_validator = True
+    # 랭킹은 최대 BEST_BOARD_SIZE 행이라 page 번호 방식 (?cursor= 키셋은 쓰지 않음)
+    pagination_class = PageNumberPagination
+    filter_backends = [filters.OrderingFilter, KoreanSearchFilter]
+    ordering_fields = ['id', 'post_date', 'recommend_count', 'last_activity_at', 'reply_count', 'title', 'author__username']
+    ordering = None  # 기본 정렬은 랭킹 순위 (get_queryset)
     search_fields = ['title', 'content', 'author__username']
 
+    def get_queryset(self):
+        queryset = self.board_queryset(super().get_queryset())
+        if self.action == 'list':
+            ranking = self.request.query_params.get('ranking', BestBoard.RANKING_BEST)
+            queryset = queryset.filter(bestboard__ranking=ranking).order_by('bestboard__rank')
+        return queryset
+
 class BoardLikeView(APIView):
+    """
+    POST: 좋아요 / DELETE: 좋아요 취소 - 동시 클릭에도 추천수가 어긋나지 않도록 원자적으로 처리
+    """
     permission_classes = [IsAuthenticated]
+
     def post(self, request, pk):
-        board = Board.objects.get(pk=pk)
-        user = request.user
-        if Recommend.objects.filter(board=board, user=user).exists():
+        try:
+            liked, count = like_board(pk, request.user)
+        except BoardNotFound:
+            raise NotFound('게시글을 찾을 수 없습니다.')
+        if not liked:
             return Response({"detail": "이미 좋아요를 눌렀습니다."}, status=400)
-        Recommend.objects.create(board=board, user=user)
-        board.recommend_count = Recommend.objects.filter(board=board).count()
-        board.save(update_fields=['recommend_count'])
-        return Response({"detail": "좋아요!"})
-
-class FeedbackViewSet(viewsets.ModelViewSet):
+        update_best_board(pk, count)
+        return Response({"detail": "좋아요!", "recommend_count": count, "recommended_by_me": True})
+
+    def delete(self, request, pk):
+        try:
+            unliked, count = unlike_board(pk, request.user)
+        except BoardNotFound:
+            raise NotFound('게시글을 찾을 수 없습니다.')
+        if not unliked:
+            return Response({"detail": "좋아요를 누르지 않은 게시글입니다."}, status=400)
+        update_best_board(pk, count)
+        return Response({"detail": "좋아요 취소", "recommend_count": count, "recommended_by_me": False})
+
+class FeedbackViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Feedback.objects.all()
     serializer_class = FeedbackSerializer
     permission_classes = [IsAdminOrReadWriteBoard]
     parser_classes = [MultiPartParser, FormParser, JSONParser]
-    filter_backends = [filters.OrderingFilter, filters.SearchFilter]
-    ordering_fields = ['id', 'created_at', 'title', 'user__username']
+    pagination_class = KeysetPagination
+    filter_backends = [filters.OrderingFilter, KoreanSearchFilter]
+    ordering_fields = ['id', 'created_at', 'last_activity_at', 'reply_count', 'title', 'user__username']
     ordering = ['-created_at']
     search_fields = ['title', 'content', 'user__username']
 
@@ -241,7 +316,7 @@ class FeedbackViewSet(viewsets.ModelViewSet):
         return context
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = with_post_relations(super().get_queryset(), 'user', FeedbackReply, self)
         my = self.request.query_params.get('my')
         if my and self.request.user.is_authenticated:
             queryset = queryset.filter(user=self.request.user)
@@ -250,15 +325,19 @@ class FeedbackViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         return serializer.save(user=self.request.user)
 
-class NoticeViewSet(viewsets.ModelViewSet):
+class NoticeViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Notice.objects.all()
     serializer_class = NoticeSerializer
     permission_classes = [IsAdminOrReadOnly]
-    filter_backends = [filters.OrderingFilter, filters.SearchFilter]
-    ordering_fields = ['id', 'created_at', 'title', 'user__username']
+    pagination_class = KeysetPagination
+    filter_backends = [filters.OrderingFilter, KoreanSearchFilter]
+    ordering_fields = ['id', 'created_at', 'last_activity_at', 'reply_count', 'title', 'user__username']
     ordering = ['-created_at']
     search_fields = ['title', 'content', 'user__username']
 
+    def get_queryset(self):
+        return with_post_relations(super().get_queryset(), 'user', NoticeReply, self)
+
     def perform_create(self, serializer):
         return serializer.save(user=self.request.user)
 
@@ -268,7 +347,7 @@ class ReplyViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        queryset = Reply.objects.all()
+        queryset = Reply.objects.select_related('author')
         board_id = self.request.query_params.get('board')
         if board_id:
             queryset = queryset.filter(board_id=board_id)
@@ -280,30 +359,14 @@ class ReplyViewSet(viewsets.ModelViewSet):
         return context
 
     def perform_create(self, serializer):
-        reply = serializer.save(author=self.request.user)
-        board = reply.board
-        # 1. 게시글 작성자에게 알림 (내가 아니면)
-        if board.author != self.request.user:
-            Notification.objects.create(
-                to_user=board.author,
-                board=board,
-                reply=reply,
-                notif_type='comment',
-                message=f"{self.request.user.username}님이 회원님의 게시글에 댓글을 남겼습니다."
-            )
-        # 2. 부모 댓글 작성자(있고, 내가 아니고, 게시글 작성자와도 다르면)에게도 알림
-        if reply.parent and reply.parent.author != self.request.user and reply.parent.author != board.author:
-            Notification.objects.create(
-                to_user=reply.parent.author,
-                board=board,
-                reply=reply,
-                notif_type='comment',
-                message=f"{self.request.user.username}님이 회원님의 댓글에 답글을 남겼습니다."
-            )
+        # 알림은 outbox 이벤트만 같은 트랜잭션에 남기고 워커(drain_notification_outbox)가 생성
+        with transaction.atomic():
+            reply = serializer.save(author=self.request.user)
+            enqueue_reply_event(NotificationOutbox.EVENT_REPLY, reply)
         return reply
 
 class FeedbackReplyViewSet(viewsets.ModelViewSet):
-    queryset = FeedbackReply.objects.all()
+    queryset = FeedbackReply.objects.select_related('author')
     serializer_class = FeedbackReplySerializer
     permission_classes = [IsAdminOrReadWriteBoard]
     def get_serializer_context(self):
@@ -311,20 +374,13 @@ class FeedbackReplyViewSet(viewsets.ModelViewSet):
         context['request'] = self.request
         return context
     def perform_create(self, serializer):
-        reply = serializer.save(author=self.request.user)
-        feedback = reply.feedback
-        if feedback.user != self.request.user:
-            Notification.objects.create(
-                to_user=feedback.user,
-                feedback=feedback,
-                feedback_reply=reply,
-                notif_type='feedback_reply',
-                message=f"{self.request.user.username}님이 회원님의 피드백에 댓글을 남겼습니다."
-            )
+        with transaction.atomic():
+            reply = serializer.save(author=self.request.user)
+            enqueue_reply_event(NotificationOutbox.EVENT_FEEDBACK_REPLY, reply)
         return reply
 
 class NoticeReplyViewSet(viewsets.ModelViewSet):
-    queryset = NoticeReply.objects.all()
+    queryset = NoticeReply.objects.select_related('author')
     serializer_class = NoticeReplySerializer
     permission_classes = [IsAuthenticated]
     def get_serializer_context(self):
@@ -332,16 +388,9 @@ class NoticeReplyViewSet(viewsets.ModelViewSet):
         context['request'] = self.request
         return context
     def perform_create(self, serializer):
-        reply = serializer.save(author=self.request.user)
-        notice = reply.notice
-        if notice.user != self.request.user:
-            Notification.objects.create(
-                to_user=notice.user,
-                notice=notice,
-                notice_reply=reply,
-                notif_type='notice_reply',
-                message=f"{self.request.user.username}님이 회원님의 공지사항에 댓글을 남겼습니다."
-            )
+        with transaction.atomic():
+            reply = serializer.save(author=self.request.user)
+            enqueue_reply_event(NotificationOutbox.EVENT_NOTICE_REPLY, reply)
         return reply
 
 ####################
@@ -368,19 +417,8 @@ class ErrorLogViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAdminUser]
 
 ####################
-# 회원가입/Register
+# 유저 뷰셋 (자기 자신/관리자만 상세/삭제, 회원가입/비번변경은 views_auth.py)
 ####################
-class RegisterView(generics.CreateAPIView):
-    queryset = User.objects.all()
-    serializer_class = RegisterSerializer
-
-####################
-# 유저 뷰셋 (자기 자신/관리자만 상세/삭제/비번변경)
-####################
-class SetPasswordSerializer(serializers.Serializer):
-    old_password = serializers.CharField()
-    new_password = serializers.CharField()
-
 class IsAdminOrSelf(BasePermission):
     def has_object_permission(self, request, view, obj):
         return request.user.is_staff or obj == request.user
@@ -400,14 +438,3 @@ class UserViewSet(viewsets.ModelViewSet):
         if user.is_staff:
             return Response({'detail': '관리자는 삭제할 수 없습니다.'}, status=status.HTTP_400_BAD_REQUEST)
         return super().destroy(request, *args, **kwargs)
-
-    @action(detail=True, methods=['post'], url_path='set_password')
-    def set_password(self, request, pk=None):
-        user = self.get_object()
-        serializer = SetPasswordSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        if not user.check_password(serializer.validated_data['old_password']):
-            return Response({'detail': '현재 비밀번호가 올바르지 않습니다.'}, status=400)
-        user.set_password(serializer.validated_data['new_password'])
-        user.save()
-        return Response({'detail': '비밀번호가 변경되었습니다.'})
@@ -4,4 +4,15 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'onprem_project_config.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# django.setup() 이후에 import
+from community.sse import POLL_PATH, STREAM_PATH, notification_poll, notification_stream  # noqa: E402
+
+# 알림 SSE/long-poll 은 연결을 오래 붙잡으므로 Django 요청 처리(스레드)를 거치지 않고 직접 처리
+LONG_LIVED = {STREAM_PATH: notification_stream, POLL_PATH: notification_poll}
+
+
+async def application(scope, receive, send):
+    handler = LONG_LIVED.get(scope['path']) if scope['type'] == 'http' else None
+    await (handler or django_application)(scope, receive, send)